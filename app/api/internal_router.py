@@ -0,0 +1,43 @@
+# app/api/internal_router.py
+from fastapi import APIRouter
+from app.infrastructure.cache import get_cache
+from app.infrastructure.database import connection
+from app.infrastructure.events import get_event_broker
+from app.application.services.task_write_buffer import get_task_write_buffer
+from app.infrastructure.database.pool import pool_stats
+from app.infrastructure.database.replicas import get_replica_router
+
+router = APIRouter(
+    tags=["Internal"] # Endpoints operativos (no forman parte de la API pública)
+)
+
+# Endpoint con los contadores de la caché de lecturas (hits, misses, evictions)
+@router.get("/cache")
+async def read_cache_stats():
+    return get_cache().stats()
+
+# Endpoint con el estado del broker de eventos en vivo (canales, suscriptores, eventos publicados)
+@router.get("/events")
+async def read_event_stats():
+    return get_event_broker().stats()
+
+# Endpoint con el estado del buffer write-behind (pendientes, fusiones, vaciados, contrapresión)
+@router.get("/write-buffer")
+async def read_write_buffer_stats():
+    write_buffer = get_task_write_buffer()
+    return write_buffer.stats() if write_buffer is not None else {"enabled": False}
+
+# Endpoint con el estado de los pools de conexiones de este proceso:
+# conexiones en uso, overflow, timeouts y tiempo de espera para obtener una conexión
+@router.get("/db-pool")
+async def read_db_pool_stats():
+    stats = {"sync": pool_stats(connection.engine.pool)}
+    if connection.async_engine is not None:
+        stats["async"] = pool_stats(connection.async_engine.pool)
+    stats["replicas"] = [pool_stats(replica.pool) for replica in connection.replica_engines]
+    return stats
+
+# Endpoint con el reparto de lecturas entre réplicas y primario
+@router.get("/db-replicas")
+async def read_db_replica_stats():
+    return get_replica_router().stats()
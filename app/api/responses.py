@@ -0,0 +1,56 @@
+# app/api/responses.py
+import asyncio
+from functools import lru_cache
+from typing import Any, AsyncIterator, List, Sequence, Type
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from app.application.fields import sparse_model
+from app.infrastructure.events import Event, Subscription
+from app.infrastructure.serialization import json_dumps
+
+@lru_cache(maxsize=256)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+# Respuesta JSON con el schema reducido a los campos pedidos (?fields=).
+# Se serializa aquí porque el response_model del endpoint exige todos los campos;
+# conserva las cabeceras ya fijadas en `response` (ETag, X-Next-Cursor)
+def sparse_response(model: Type[BaseModel], fields: Sequence[str], data: Any, response: Response) -> Response:
+    sparse = sparse_model(model, tuple(fields))
+    if isinstance(data, list):
+        content = _list_adapter(sparse).dump_json([sparse.model_validate(item) for item in data])
+    else:
+        content = (data if isinstance(data, sparse) else sparse.model_validate(data)).model_dump_json()
+    return Response(content=content, media_type="application/json", headers=dict(response.headers))
+
+# Respuesta JSON de la ruta rápida (FAST_JSON_RESPONSES): serializa tipos nativos (dicts de filas Core)
+# con el codificador rápido, sin pasar por el response_model; conserva las cabeceras de `response`
+def fast_json_response(data: Any, response: Response) -> Response:
+    return Response(content=json_dumps(data), media_type="application/json", headers=dict(response.headers))
+
+# Un evento en formato Server-Sent Events; el id permite reanudar con Last-Event-ID
+def sse_event(event: Event) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event.id, event.type.encode(), json_dumps(event.data))
+
+# Cuerpo de una respuesta SSE con los eventos de una suscripción. Envía un comentario cada
+# keepalive_seconds sin eventos (los proxies no cierran la conexión) y termina a los
+# max_seconds o con el evento end_event; el cliente se reconecta con Last-Event-ID.
+# La suscripción se cierra también si el cliente se desconecta (StreamingResponse cancela el cuerpo)
+async def sse_stream(subscription: Subscription, keepalive_seconds: float, max_seconds: float, end_event: str) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(timeout=min(keepalive_seconds, remaining))
+            if event is None:
+                yield b": keepalive\n\n"
+                continue
+            yield sse_event(event)
+            if event.type == end_event:
+                break
+    finally:
+        subscription.close()
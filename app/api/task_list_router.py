@@ -1,65 +1,244 @@
 # app/api/task_list_router.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional, Tuple, Union
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.infrastructure.database.connection import get_db
-from app.schemas import task_list_schemas
-from app.application.services.task_list_service import TaskListService
+from app.infrastructure.database.connection import get_read_session, get_session
+from app.schemas import task_list_schemas, task_schemas
+from app.application.services.async_services import AsyncTaskListService, AsyncTaskService
+from app.application.services.task_export_service import EXPORT_MEDIA_TYPES, TaskExportService
+from app.application.services.task_import_service import ImportLineTooLongError, TaskImportService
+from app.application.services.task_list_service import TASKS_PAGE_SIZE, TaskListDeletionInProgressError, task_list_channel
+from app.application.services.task_list_purge_service import purge_session_factory, run_purge_job
+from app.application.pagination import NEXT_CURSOR_HEADER, InvalidCursorError, decode_id_cursor, encode_id_cursor
+from app.application.etags import PreconditionFailedError, etag_matches
+from app.application.fields import InvalidFieldsError, parse_fields
+from app.api.responses import fast_json_response, sparse_response, sse_stream
+from app.infrastructure.config import get_settings
+from app.infrastructure.events import get_event_broker
 
 router = APIRouter(
     tags=["Task Lists"] # Etiqueta para la documentación de Swagger
 )
 
 # Dependencia para obtener una instancia del servicio de TaskList
-def get_task_list_service(db: Session = Depends(get_db)) -> TaskListService:
-    return TaskListService(db)
+def get_task_list_service(db: Union[Session, AsyncSession] = Depends(get_session)) -> AsyncTaskListService:
+    return AsyncTaskListService(db)
+
+# Servicio de TaskList para los GET: sesión de solo lectura (réplica o primario)
+def get_read_task_list_service(db: Union[Session, AsyncSession] = Depends(get_read_session)) -> AsyncTaskListService:
+    return AsyncTaskListService(db)
+
+# Interpreta ?fields= de las lecturas de listas (400 si hay campos desconocidos).
+# En el detalle se admite además "tasks"; sin él no se leen las tareas
+def get_task_list_fields(fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields, task_list_schemas.TaskListResponse)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+def get_task_list_detail_fields(fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields, task_list_schemas.TaskListResponseWithTasks)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+# Dependencia para obtener una instancia del servicio de Task (importación)
+def get_task_service(db: Union[Session, AsyncSession] = Depends(get_session)) -> AsyncTaskService:
+    return AsyncTaskService(db)
 
 # Endpoint para crear una nueva lista de tareas
 @router.post("/", response_model=task_list_schemas.TaskListResponse, status_code=status.HTTP_201_CREATED)
-def create_task_list(
+async def create_task_list(
     task_list: task_list_schemas.TaskListCreate,
-    service: TaskListService = Depends(get_task_list_service)
+    service: AsyncTaskListService = Depends(get_task_list_service)
+    ):
+    return await service.create_task_list(task_list)
+
+# Endpoint para consultar el estado de la purga de una lista borrada
+@router.get("/purge-jobs/{job_id}", response_model=task_list_schemas.TaskListPurgeJobResponse)
+async def read_purge_job(
+    job_id: int,
+    service: AsyncTaskListService = Depends(get_task_list_service)
     ):
-    return service.create_task_list(task_list)
+    job = await service.get_purge_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trabajo de purga no encontrado")
+    return job
 
 # Endpoint para obtener una lista de tareas por ID
+# Las tareas embebidas son una página: tasks_limit tareas tras tasks_cursor, con los filtros
+# completed/priority de /tasks/by-list; tasks_total y tasks_next_cursor permiten recorrer el resto
+# Emite ETag (versión de la lista y de todas sus tareas, calculada con una consulta mínima);
+# con If-None-Match vigente responde 304 sin cargar tareas
+# ?fields=id,title,task_count lee y devuelve solo esos campos; las tareas solo si se incluye "tasks"
+# Con FAST_JSON_RESPONSES la lista y sus tareas se leen con Core y se serializan sin validar con Pydantic
 @router.get("/{task_list_id}", response_model=task_list_schemas.TaskListResponseWithTasks)
-def read_task_list(
+async def read_task_list(
     task_list_id: int,
-    service: TaskListService = Depends(get_task_list_service)
+    response: Response,
+    tasks_limit: int = Query(TASKS_PAGE_SIZE, ge=1, le=1000),
+    tasks_cursor: Optional[str] = None,
+    completed: Optional[bool] = None,
+    priority: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_list_detail_fields),
+    service: AsyncTaskListService = Depends(get_read_task_list_service)
     ):
-    db_task_list = service.get_task_list(task_list_id)
+    try:
+        tasks_after_id = decode_id_cursor(tasks_cursor) if tasks_cursor is not None else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    etag = await service.get_task_list_etag(task_list_id)
+    if etag is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    if etag_matches(if_none_match, etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    window = {"tasks_limit": tasks_limit, "tasks_after_id": tasks_after_id, "completed": completed, "priority": priority}
+    if fields is None and get_settings().fast_json_responses:
+        data = await service.get_task_list_data(task_list_id, **window)
+        if data is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+        return fast_json_response(data, response)
+    db_task_list = await service.get_task_list(task_list_id, fields=fields, **window)
     if db_task_list is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    if fields is not None:
+        return sparse_response(task_list_schemas.TaskListResponseWithTasks, fields, db_task_list, response)
     return db_task_list
 
+# Endpoint para exportar las tareas de una lista (NDJSON o CSV) en streaming
+@router.get("/{task_list_id}/export")
+async def export_task_list(
+    task_list_id: int,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: Union[Session, AsyncSession] = Depends(get_read_session),
+    service: AsyncTaskListService = Depends(get_read_task_list_service)
+    ):
+    if not await service.task_list_exists(task_list_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    exporter = TaskExportService(db, fast_json=get_settings().fast_json_responses)
+    return StreamingResponse(
+        exporter.stream_tasks(task_list_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="task_list_{task_list_id}.{export_format}"'},
+    )
+
+# Endpoint de eventos en vivo de una lista (Server-Sent Events), en lugar de consultar
+# /tasks/by-list/{id} periódicamente: task.created, task.updated, task.toggled y task.deleted (con la
+# tarea), tasks.created/updated/toggled/deleted de las operaciones masivas, task_list.updated y
+# task_list.deleted (que cierra el stream). Al reconectar, Last-Event-ID (o ?last_event_id=) entrega los
+# eventos perdidos; si ya no se conservan llega un evento "reset" y el cliente relee la lista
+@router.get("/{task_list_id}/events", response_class=StreamingResponse)
+async def stream_task_list_events(
+    task_list_id: int,
+    last_event_id: Optional[str] = Header(None),
+    resume_from: Optional[str] = Query(None, alias="last_event_id"),
+    service: AsyncTaskListService = Depends(get_read_task_list_service)
+    ):
+    resume_token = last_event_id if last_event_id is not None else resume_from
+    try:
+        resume_id = int(resume_token) if resume_token is not None else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Last-Event-ID no válido")
+    if not await service.task_list_exists(task_list_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    settings = get_settings()
+    subscription = get_event_broker().subscribe(task_list_channel(task_list_id), resume_id)
+    return StreamingResponse(
+        sse_stream(subscription, settings.events_keepalive_seconds, settings.events_max_stream_seconds, end_event="task_list.deleted"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Endpoint para importar tareas en una lista desde un cuerpo NDJSON o CSV (con cabecera)
+# Lee el cuerpo en streaming e inserta por bloques de chunk_size, confirmando cada bloque.
+# Una línea de más de IMPORT_MAX_LINE_LENGTH caracteres detiene la importación (413); los bloques
+# ya confirmados se conservan
+@router.post("/{task_list_id}/import", response_model=task_schemas.TaskImportResponse)
+async def import_task_list(
+    task_list_id: int,
+    request: Request,
+    import_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    chunk_size: int = Query(task_schemas.IMPORT_CHUNK_SIZE, ge=1, le=task_schemas.BULK_CREATE_MAX_ITEMS),
+    task_list_service: AsyncTaskListService = Depends(get_task_list_service),
+    task_service: AsyncTaskService = Depends(get_task_service)
+    ):
+    if not await task_list_service.task_list_exists(task_list_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    importer = TaskImportService(task_service, chunk_size=chunk_size)
+    try:
+        return await importer.import_tasks(task_list_id, request.stream(), import_format)
+    except ImportLineTooLongError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"{e}; se importaron {e.created} tareas antes de detenerse",
+        )
+
 # Endpoint para obtener todas las listas de tareas
+# Con ?after=<cursor> pagina por keyset; el cursor siguiente viaja en la cabecera X-Next-Cursor
 @router.get("/", response_model=List[task_list_schemas.TaskListResponse])
-def read_all_task_lists(
+async def read_all_task_lists(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    service: TaskListService = Depends(get_task_list_service)
+    after: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_list_fields),
+    service: AsyncTaskListService = Depends(get_read_task_list_service)
     ):
-    return service.get_all_task_lists(skip=skip, limit=limit)
+    try:
+        after_id = decode_id_cursor(after) if after is not None else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    task_lists = await service.get_all_task_lists(skip=skip, limit=limit, after_id=after_id, fields=fields)
+    if fields is not None:
+        if task_lists and len(task_lists) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_id_cursor(task_lists[-1]["id"])
+        return sparse_response(task_list_schemas.TaskListResponse, fields, task_lists, response)
+    if task_lists and len(task_lists) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_id_cursor(task_lists[-1].id)
+    return task_lists
 
 # Endpoint para actualizar una lista de tareas
+# Con If-Match solo actualiza si la lista no cambió desde esa versión (si no, 412)
 @router.put("/{task_list_id}", response_model=task_list_schemas.TaskListResponse)
-def update_task_list(
+async def update_task_list(
     task_list_id: int,
     task_list_update: task_list_schemas.TaskListUpdate,
-    service: TaskListService = Depends(get_task_list_service)
+    if_match: Optional[str] = Header(None),
+    service: AsyncTaskListService = Depends(get_task_list_service)
     ):
-    db_task_list = service.update_task_list(task_list_id, task_list_update)
+    try:
+        db_task_list = await service.update_task_list(task_list_id, task_list_update, if_match=if_match)
+    except PreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     if db_task_list is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
     return db_task_list
 
 # Endpoint para eliminar una lista de tareas
-@router.delete("/{task_list_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task_list(
+# La lista se marca como borrada (deja de verse al instante) y responde 202 con el trabajo de purga;
+# sus tareas se eliminan en segundo plano por bloques de PURGE_CHUNK_SIZE. El estado se consulta en
+# la cabecera Location (/task-lists/purge-jobs/{id}). Repetir el DELETE reanuda una purga fallida;
+# mientras la purga está pendiente o en curso responde 409
+@router.delete("/{task_list_id}", response_model=task_list_schemas.TaskListPurgeJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def delete_task_list(
     task_list_id: int,
-    service: TaskListService = Depends(get_task_list_service)
+    request: Request,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Union[Session, AsyncSession] = Depends(get_session),
+    service: AsyncTaskListService = Depends(get_task_list_service)
     ):
-    if not service.delete_task_list(task_list_id):
+    try:
+        job = await service.delete_task_list(task_list_id)
+    except TaskListDeletionInProgressError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if job is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
-    return {"message": "Lista de tareas eliminada exitosamente"}
\ No newline at end of file
+    background_tasks.add_task(run_purge_job, job.id, purge_session_factory(db), get_settings().purge_chunk_size)
+    response.headers["Location"] = str(request.url_for("read_purge_job", job_id=job.id))
+    return job
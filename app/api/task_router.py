@@ -1,100 +1,264 @@
 # app/api/task_router.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.infrastructure.database.connection import get_db
+from app.infrastructure.database.connection import get_read_session, get_session
 from app.schemas import task_schemas # Importamos los schemas de tarea
-from app.application.services.task_service import TaskService # Importamos el servicio de tarea
-from app.application.services.task_list_service import TaskListService # También necesitamos el servicio de lista para validar existencia
+# Servicio de tarea y servicio de lista (validar existencia), expuestos como corrutinas
+from app.application.services.async_services import AsyncTaskService, AsyncTaskListService
+from app.application.pagination import NEXT_CURSOR_HEADER, InvalidCursorError, decode_cursor, decode_id_cursor, encode_cursor, encode_id_cursor
+from app.application.etags import PreconditionFailedError, etag_matches, task_etag, tasks_page_etag
+from app.application.fields import InvalidFieldsError, parse_fields
+from app.api.responses import fast_json_response, sparse_response
+from app.infrastructure.config import get_settings
 
 router = APIRouter(
     tags=["Tasks"] # Etiqueta para la documentación de Swagger
 )
 
+# Interpreta ?fields= de los endpoints de lectura de tareas (400 si hay campos desconocidos)
+def get_task_fields(fields: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields, task_schemas.TaskResponse)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 # Dependencia para obtener una instancia del servicio de Task
-def get_task_service(db: Session = Depends(get_db)) -> TaskService:
-    return TaskService(db)
+def get_task_service(db: Union[Session, AsyncSession] = Depends(get_session)) -> AsyncTaskService:
+    return AsyncTaskService(db)
 
 # Dependencia para obtener una instancia del servicio de TaskList (validaciones)
-def get_task_list_service(db: Session = Depends(get_db)) -> TaskListService:
-    return TaskListService(db)
+def get_task_list_service(db: Union[Session, AsyncSession] = Depends(get_session)) -> AsyncTaskListService:
+    return AsyncTaskListService(db)
+
+# Servicios para los GET: sesión de solo lectura (réplica o primario)
+def get_read_task_service(db: Union[Session, AsyncSession] = Depends(get_read_session)) -> AsyncTaskService:
+    return AsyncTaskService(db)
+
+def get_read_task_list_service(db: Union[Session, AsyncSession] = Depends(get_read_session)) -> AsyncTaskListService:
+    return AsyncTaskListService(db)
 
 # Endpoint para crear una nueva tarea dentro de una lista de tareas específica
 @router.post("/", response_model=task_schemas.TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task: task_schemas.TaskCreate,
-    task_service: TaskService = Depends(get_task_service),
-    task_list_service: TaskListService = Depends(get_task_list_service)
+    task_service: AsyncTaskService = Depends(get_task_service),
+    task_list_service: AsyncTaskListService = Depends(get_task_list_service)
     ):
-    # Es necesaria la validación de la lista 
-    if not task_list_service.get_task_list(task.task_list_id):
+    # Es necesaria la validación de la lista (solo su existencia, sin cargar sus tareas)
+    if not await task_list_service.task_list_exists(task.task_list_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
     # Esquema completo al servicio
-    return task_service.create_task(task)
+    return await task_service.create_task(task)
+
+# Endpoint para crear muchas tareas en una sola petición
+# Valida cada item por separado, consulta una sola vez las listas referenciadas e inserta
+# los items válidos en una transacción; los inválidos se reportan por posición
+@router.post("/bulk", response_model=task_schemas.TaskBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_tasks_bulk(
+    payload: task_schemas.TaskBulkCreate,
+    task_service: AsyncTaskService = Depends(get_task_service),
+    task_list_service: AsyncTaskListService = Depends(get_task_list_service)
+    ):
+    errors = []
+    valid_items = []
+    for index, item in enumerate(payload.items):
+        try:
+            valid_items.append((index, task_schemas.TaskCreate.model_validate(item)))
+        except ValidationError as e:
+            errors.append(task_schemas.TaskBulkItemError(index=index, detail=str(e)))
+
+    existing_ids = await task_list_service.get_existing_ids({task.task_list_id for _, task in valid_items})
+    tasks = []
+    for index, task in valid_items:
+        if task.task_list_id in existing_ids:
+            tasks.append(task)
+        else:
+            errors.append(task_schemas.TaskBulkItemError(index=index, detail="Lista de tareas no encontrada"))
+
+    created_ids = await task_service.create_tasks(tasks)
+    errors.sort(key=lambda error: error.index)
+    return task_schemas.TaskBulkCreateResponse(created_ids=created_ids, errors=errors)
+
+# Endpoints masivos por ids o filtro: una sola sentencia UPDATE/DELETE
+# (declarados antes de las rutas /{task_id} para que "bulk" no se interprete como id)
+@router.patch("/bulk", response_model=task_schemas.TaskBulkResult)
+async def update_tasks_bulk(
+    payload: task_schemas.TaskBulkUpdate,
+    service: AsyncTaskService = Depends(get_task_service)
+    ):
+    affected = await service.update_tasks(payload, payload.changes)
+    return task_schemas.TaskBulkResult(affected=affected)
+
+@router.patch("/bulk/toggle-completion", response_model=task_schemas.TaskBulkResult)
+async def toggle_tasks_completion_bulk(
+    selection: task_schemas.TaskSelection,
+    service: AsyncTaskService = Depends(get_task_service)
+    ):
+    affected = await service.toggle_tasks_completion(selection)
+    return task_schemas.TaskBulkResult(affected=affected)
 
+@router.delete("/bulk", response_model=task_schemas.TaskBulkResult)
+async def delete_tasks_bulk(
+    selection: task_schemas.TaskSelection,
+    service: AsyncTaskService = Depends(get_task_service)
+    ):
+    affected = await service.delete_tasks(selection)
+    return task_schemas.TaskBulkResult(affected=affected)
+
+# Cursor de la búsqueda: (score, id) del último resultado
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    values = decode_cursor(cursor)
+    score, last_id = values.get("score"), values.get("id")
+    if not isinstance(score, (int, float)) or isinstance(score, bool) or not isinstance(last_id, int):
+        raise InvalidCursorError("Cursor inválido")
+    return float(score), last_id
+
+# Búsqueda de texto completo en título y descripción, ordenada por relevancia
+# Pagina por keyset con ?after=<cursor> (cabecera X-Next-Cursor), igual que los listados
+@router.get("/search", response_model=List[task_schemas.TaskResponse])
+async def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    task_list_id: Optional[int] = None,
+    completed: Optional[bool] = None,
+    priority: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = None,
+    service: AsyncTaskService = Depends(get_read_task_service)
+    ):
+    try:
+        after_key = decode_search_cursor(after) if after is not None else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    results = await service.search_tasks(q, task_list_id=task_list_id, completed=completed, priority=priority, limit=limit, after=after_key)
+    if len(results) == limit:
+        last_task, last_score = results[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(score=last_score, id=last_task.id)
+    return [task for task, _ in results]
+
+# Emite ETag; con If-None-Match vigente responde 304 leyendo solo updated_at
+# ?fields=id,title,completed lee y devuelve solo esos campos (el id siempre se incluye)
 @router.get("/{task_id}", response_model=task_schemas.TaskResponse)
-def read_task(
+async def read_task(
     task_id: int,
-    service: TaskService = Depends(get_task_service)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_fields),
+    service: AsyncTaskService = Depends(get_read_task_service)
     ):
-    db_task = service.get_task(task_id)
+    if if_none_match is not None:
+        etag = await service.get_task_etag(task_id)
+        if etag is not None and etag_matches(if_none_match, etag, weak=True):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    db_task = await service.get_task(task_id, fields=fields)
     if db_task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+    response.headers["ETag"] = task_etag(db_task.id, db_task.updated_at)
+    if fields is not None:
+        return sparse_response(task_schemas.TaskResponse, fields, db_task, response)
     return db_task
 
 # Endpoint para obtener todas las tareas de una lista específica (filtros)
+# Con ?after=<cursor> pagina por keyset; el cursor siguiente viaja en la cabecera X-Next-Cursor
+# Emite el ETag de la página; con If-None-Match vigente responde 304 leyendo solo (id, updated_at)
+# Con FAST_JSON_RESPONSES las filas Core se serializan directamente (sin validar con Pydantic)
 @router.get("/by-list/{task_list_id}", response_model=List[task_schemas.TaskResponse])
-def read_tasks_by_list(
+async def read_tasks_by_list(
     task_list_id: int,
+    response: Response,
     completed: Optional[bool] = None,
     priority: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    task_service: TaskService = Depends(get_task_service),
-    task_list_service: TaskListService = Depends(get_task_list_service)
+    after: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[Tuple[str, ...]] = Depends(get_task_fields),
+    task_service: AsyncTaskService = Depends(get_read_task_service),
+    task_list_service: AsyncTaskListService = Depends(get_read_task_list_service)
     ):
-    # Valida que la task_list_id exista
-    if not task_list_service.get_task_list(task_list_id):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    try:
+        after_id = decode_id_cursor(after) if after is not None else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    tasks = task_service.get_tasks_by_list_id(
+    if if_none_match is not None:
+        etag = await task_service.get_tasks_by_list_etag(
+            task_list_id=task_list_id, completed=completed, priority=priority, skip=skip, limit=limit, after_id=after_id
+        )
+        # Como abajo, una página vacía no prueba que la lista exista: sin ella no hay 304 sino 404
+        empty = etag == tasks_page_etag(())
+        if etag_matches(if_none_match, etag, weak=True) and (not empty or await task_list_service.task_list_exists(task_list_id)):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    fast = fields is None and get_settings().fast_json_responses
+    tasks = await task_service.get_tasks_by_list_id(
         task_list_id=task_list_id,
         completed=completed,
         priority=priority,
         skip=skip,
-        limit=limit
+        limit=limit,
+        after_id=after_id,
+        fields=tuple(task_schemas.TaskResponse.model_fields) if fast else fields
     )
+    # Una página con tareas ya prueba que la lista existe; solo una página vacía requiere
+    # comprobarlo (404 si la lista no existe)
+    if not tasks and not await task_list_service.task_list_exists(task_list_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lista de tareas no encontrada")
+    if tasks and len(tasks) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_id_cursor(tasks[-1].id)
+    response.headers["ETag"] = tasks_page_etag((task.id, task.updated_at) for task in tasks)
+    if fast:
+        return fast_json_response([task._asdict() for task in tasks], response)
+    if fields is not None:
+        return sparse_response(task_schemas.TaskResponse, fields, tasks, response)
     return tasks
 
 # Endpoint para actualizar una tarea
+# Con If-Match solo actualiza si la tarea no cambió desde esa versión (si no, 412)
 @router.put("/{task_id}", response_model=task_schemas.TaskResponse)
-def update_task(
+async def update_task(
     task_id: int,
     task_update: task_schemas.TaskUpdate,
-    service: TaskService = Depends(get_task_service)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: AsyncTaskService = Depends(get_task_service)
     ):
-    db_task = service.update_task(task_id, task_update)
+    try:
+        db_task = await service.update_task(task_id, task_update, if_match=if_match)
+    except PreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     if db_task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+    response.headers["ETag"] = task_etag(db_task.id, db_task.updated_at)
     return db_task
 
 # Endpoint para eliminar una tarea
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    service: TaskService = Depends(get_task_service)
+    service: AsyncTaskService = Depends(get_task_service)
     ):
-    if not service.delete_task(task_id):
+    if not await service.delete_task(task_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
     return {"message": "Tarea eliminada exitosamente"}
 
 # Endpoint para cambiar el estado de una tarea
+# Con If-Match solo cambia el estado si la tarea no cambió desde esa versión (si no, 412)
 @router.patch("/{task_id}/toggle-completion", response_model=task_schemas.TaskResponse)
-def toggle_task_completion(
+async def toggle_task_completion(
     task_id: int,
-    service: TaskService = Depends(get_task_service)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: AsyncTaskService = Depends(get_task_service)
     ):
-    db_task = service.toggle_task_completion(task_id)
+    try:
+        db_task = await service.toggle_task_completion(task_id, if_match=if_match)
+    except PreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     if db_task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarea no encontrada")
+    response.headers["ETag"] = task_etag(db_task.id, db_task.updated_at)
     return db_task
\ No newline at end of file
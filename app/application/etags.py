@@ -0,0 +1,44 @@
+# app/application/etags.py
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+# La versión de un recurso se deriva de updated_at (y de los contadores en las listas), que se
+# guarda con microsegundos: dos escrituras seguidas no comparten versión
+
+class PreconditionFailedError(Exception):
+    pass
+
+def _etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def task_etag(task_id: int, updated_at: datetime) -> str:
+    return _etag("task", task_id, updated_at)
+
+def task_list_etag(task_list_id: int, updated_at: datetime, task_count: int, completed_count: int, tasks_updated_at: Optional[datetime]) -> str:
+    return _etag("task_list", task_list_id, updated_at, task_count, completed_count, tasks_updated_at)
+
+# Página de tareas: cambia si cambia alguna fila de la página o qué filas la forman
+def tasks_page_etag(rows: Iterable[Tuple[int, datetime]]) -> str:
+    return _etag("tasks_page", tuple((task_id, updated_at) for task_id, updated_at in rows))
+
+# Compara una cabecera If-Match / If-None-Match (lista separada por comas o "*") con un ETag.
+# If-None-Match usa comparación débil (ignora el prefijo W/); If-Match, fuerte
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+# Verifica la precondición If-Match (None = sin precondición)
+def check_if_match(if_match: Optional[str], etag: str) -> None:
+    if if_match is not None and not etag_matches(if_match, etag):
+        raise PreconditionFailedError("La versión del recurso no coincide con If-Match")
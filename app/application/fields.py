@@ -0,0 +1,32 @@
+# app/application/fields.py
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple, Type
+from pydantic import BaseModel, ConfigDict, create_model
+
+# Error de un parámetro ?fields= con campos que el recurso no tiene
+class InvalidFieldsError(ValueError):
+    pass
+
+# Interpreta ?fields=a,b,c contra los campos de un schema de respuesta.
+# Devuelve None si no se pidió un subconjunto; el resultado sigue el orden del schema e incluye
+# siempre los campos de `always` (p. ej. el id, necesario para paginar)
+def parse_fields(fields: Optional[str], model: Type[BaseModel], always: Iterable[str] = ("id",)) -> Optional[Tuple[str, ...]]:
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise InvalidFieldsError(
+            f"Campos desconocidos: {', '.join(sorted(unknown))}. Campos válidos: {', '.join(model.model_fields)}"
+        )
+    requested.update(always)
+    return tuple(name for name in model.model_fields if name in requested)
+
+# Schema de respuesta reducido a los campos pedidos (mismos tipos y validaciones que el original)
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    return create_model(
+        f"{model.__name__}Sparse",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+    )
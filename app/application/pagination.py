@@ -0,0 +1,36 @@
+# app/application/pagination.py
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+# Cabecera con el cursor de la siguiente página (paginación por keyset)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class InvalidCursorError(ValueError):
+    pass
+
+# Codifica la clave de orden del último elemento como un cursor opaco
+def encode_cursor(**values: Any) -> str:
+    payload = json.dumps(values, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursorError("Cursor inválido")
+    if not isinstance(values, dict):
+        raise InvalidCursorError("Cursor inválido")
+    return values
+
+# Cursor por id: el orden de las páginas es siempre por clave primaria
+def encode_id_cursor(last_id: int) -> str:
+    return encode_cursor(id=last_id)
+
+def decode_id_cursor(cursor: str) -> int:
+    last_id = decode_cursor(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise InvalidCursorError("Cursor inválido")
+    return last_id
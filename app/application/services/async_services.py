@@ -0,0 +1,142 @@
+# app/application/services/async_services.py
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Set, Tuple, Type, Union
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.domain import models
+from app.schemas import task_list_schemas, task_schemas
+from app.application.services.task_service import TaskService
+from app.application.services.task_list_service import TASKS_PAGE_SIZE, TaskListService
+from app.application.services.task_write_buffer import get_task_write_buffer
+
+# Ejecuta los métodos de un servicio síncrono desde corrutinas.
+# Con una AsyncSession el servicio corre mediante run_sync sobre el driver asíncrono,
+# sin bloquear el event loop; con una Session síncrona corre en el threadpool como antes.
+class AsyncServiceAdapter:
+    service_class: Type = None
+
+    def __init__(self, db: Union[Session, AsyncSession]):
+        self.db = db
+
+    # Cada llamada es una unidad de trabajo: al terminar se cierra la transacción para
+    # no retener la conexión del pool mientras la petición espera en otro await
+    def _unit_of_work(self, session: Session, call: Callable[[Any], Any]) -> Any:
+        try:
+            result = call(self.service_class(session))
+        except Exception:
+            session.rollback()
+            raise
+        session.commit()
+        return result
+
+    async def run(self, call: Callable[[Any], Any]) -> Any:
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(self._unit_of_work, call)
+        return await run_in_threadpool(self._unit_of_work, self.db, call)
+
+# Versión asíncrona de TaskService (mismos métodos y argumentos, como corrutinas)
+class AsyncTaskService(AsyncServiceAdapter):
+    service_class = TaskService
+
+    # Las escrituras que no pasan por el buffer write-behind (masivas, borrados, con If-Match)
+    # escriben antes los cambios pendientes, para no pisarlos ni quedar detrás de ellos.
+    # El vaciado es E/S síncrona que puede esperar a otro en curso: corre en el threadpool,
+    # fuera del event loop también en modo asíncrono
+    async def _flush_write_buffer(self) -> None:
+        write_buffer = get_task_write_buffer()
+        if write_buffer is not None:
+            await run_in_threadpool(write_buffer.flush, True)
+
+    async def create_task(self, task_create_schema: task_schemas.TaskCreate) -> models.Task:
+        return await self.run(lambda service: service.create_task(task_create_schema))
+
+    async def create_tasks(self, tasks: List[task_schemas.TaskCreate]) -> List[int]:
+        return await self.run(lambda service: service.create_tasks(tasks))
+
+    async def update_tasks(self, selection: task_schemas.TaskSelection, task_update: task_schemas.TaskUpdate) -> int:
+        await self._flush_write_buffer()
+        return await self.run(lambda service: service.update_tasks(selection, task_update))
+
+    async def toggle_tasks_completion(self, selection: task_schemas.TaskSelection) -> int:
+        await self._flush_write_buffer()
+        return await self.run(lambda service: service.toggle_tasks_completion(selection))
+
+    async def delete_tasks(self, selection: task_schemas.TaskSelection) -> int:
+        await self._flush_write_buffer()
+        return await self.run(lambda service: service.delete_tasks(selection))
+
+    async def get_task(self, task_id: int, fields: Optional[Sequence[str]] = None) -> Any:
+        return await self.run(lambda service: service.get_task(task_id, fields))
+
+    async def get_task_etag(self, task_id: int) -> Optional[str]:
+        return await self.run(lambda service: service.get_task_etag(task_id))
+
+    async def get_tasks_by_list_id(self, task_list_id: int, completed: Optional[bool] = None, priority: Optional[int] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> list:
+        return await self.run(lambda service: service.get_tasks_by_list_id(task_list_id, completed, priority, skip, limit, after_id, fields))
+
+    async def get_tasks_by_list_etag(self, task_list_id: int, completed: Optional[bool] = None, priority: Optional[int] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> str:
+        return await self.run(lambda service: service.get_tasks_by_list_etag(task_list_id, completed, priority, skip, limit, after_id))
+
+    async def search_tasks(self, text: str, task_list_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None, limit: int = 20, after: Optional[Tuple[float, int]] = None) -> List[Tuple[models.Task, float]]:
+        return await self.run(lambda service: service.search_tasks(text, task_list_id, completed, priority, limit, after))
+
+    async def update_task(self, task_id: int, task_update: task_schemas.TaskUpdate, if_match: Optional[str] = None) -> Optional[models.Task]:
+        if if_match is not None or not task_update.model_fields_set:
+            await self._flush_write_buffer()
+        return await self.run(lambda service: service.update_task(task_id, task_update, if_match))
+
+    async def delete_task(self, task_id: int) -> bool:
+        await self._flush_write_buffer()
+        return await self.run(lambda service: service.delete_task(task_id))
+
+    async def toggle_task_completion(self, task_id: int, if_match: Optional[str] = None) -> Optional[models.Task]:
+        if if_match is not None:
+            await self._flush_write_buffer()
+        return await self.run(lambda service: service.toggle_task_completion(task_id, if_match))
+
+# Versión asíncrona de TaskListService (mismos métodos y argumentos, como corrutinas)
+class AsyncTaskListService(AsyncServiceAdapter):
+    service_class = TaskListService
+
+    async def recompute_counters(self, task_list_ids: Optional[Iterable[int]] = None, chunk_size: int = 1000) -> int:
+        return await self.run(lambda service: service.recompute_counters(task_list_ids, chunk_size))
+
+    async def create_task_list(self, task_list: task_list_schemas.TaskListCreate) -> models.TaskList:
+        return await self.run(lambda service: service.create_task_list(task_list))
+
+    async def get_task_list(self, task_list_id: int, fields: Optional[Sequence[str]] = None, tasks_limit: int = TASKS_PAGE_SIZE, tasks_after_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None) -> Optional[BaseModel]:
+        return await self.run(lambda service: service.get_task_list(task_list_id, fields, tasks_limit, tasks_after_id, completed, priority))
+
+    async def get_task_list_data(self, task_list_id: int, tasks_limit: int = TASKS_PAGE_SIZE, tasks_after_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None) -> Optional[dict]:
+        return await self.run(lambda service: service.get_task_list_data(task_list_id, tasks_limit, tasks_after_id, completed, priority))
+
+    async def task_list_exists(self, task_list_id: int) -> bool:
+        return await self.run(lambda service: service.task_list_exists(task_list_id))
+
+    async def get_existing_ids(self, task_list_ids: Iterable[int]) -> Set[int]:
+        return await self.run(lambda service: service.get_existing_ids(task_list_ids))
+
+    async def get_task_list_etag(self, task_list_id: int) -> Optional[str]:
+        return await self.run(lambda service: service.get_task_list_etag(task_list_id))
+
+    async def get_all_task_lists(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> list:
+        return await self.run(lambda service: service.get_all_task_lists(skip, limit, after_id, fields))
+
+    async def update_task_list(self, task_list_id: int, task_list_update: task_list_schemas.TaskListUpdate, if_match: Optional[str] = None) -> Optional[models.TaskList]:
+        return await self.run(lambda service: service.update_task_list(task_list_id, task_list_update, if_match))
+
+    async def delete_task_list(self, task_list_id: int) -> Optional[models.TaskListPurgeJob]:
+        return await self.run(lambda service: service.delete_task_list(task_list_id))
+
+    async def get_purge_job(self, job_id: int) -> Optional[models.TaskListPurgeJob]:
+        return await self.run(lambda service: service.get_purge_job(job_id))
+
+    async def get_unfinished_purge_job_ids(self) -> List[int]:
+        return await self.run(lambda service: service.get_unfinished_purge_job_ids())
+
+    async def purge_task_list_chunk(self, job_id: int, chunk_size: int = 1000) -> bool:
+        return await self.run(lambda service: service.purge_task_list_chunk(job_id, chunk_size))
+
+    async def fail_purge_job(self, job_id: int, error: str) -> None:
+        return await self.run(lambda service: service.fail_purge_job(job_id, error))
@@ -0,0 +1,92 @@
+# app/application/services/task_export_service.py
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Sequence, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from app.domain import models
+from app.infrastructure.serialization import _json_default, json_dumps
+
+# Filas leídas del cursor del servidor por cada bloque serializado
+EXPORT_BATCH_SIZE = 1000
+
+# Formatos soportados: tipo de contenido de cada uno
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Columnas exportadas, en el orden del CSV
+EXPORT_COLUMNS = ("id", "task_list_id", "title", "description", "completed", "status", "priority", "created_at", "updated_at")
+
+# Serializa un bloque de filas Core (sin hidratar objetos ORM ni validar con Pydantic),
+# con las fechas en ISO 8601 como el codificador de serialization
+def _ndjson_chunk(rows: Sequence) -> bytes:
+    return "".join(json.dumps(dict(row._mapping), default=_json_default, ensure_ascii=False) + "\n" for row in rows).encode()
+
+# Variante rápida (FAST_JSON_RESPONSES): codificador compacto de serialization (orjson si está instalado)
+def _fast_ndjson_chunk(rows: Sequence) -> bytes:
+    return b"".join(json_dumps(row._asdict()) + b"\n" for row in rows)
+
+def _csv_chunk(rows: Sequence) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(value.isoformat() if isinstance(value, datetime) else value for value in row)
+    return buffer.getvalue().encode()
+
+def _csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue().encode()
+
+# Exporta las tareas de una lista en streaming.
+# Usa una conexión propia (no la de la sesión de la petición, que se cierra antes de enviar el cuerpo)
+# y un cursor del servidor (yield_per/stream_results): la memoria no depende del tamaño de la lista
+class TaskExportService:
+    def __init__(self, db: Union[Session, AsyncSession], batch_size: int = EXPORT_BATCH_SIZE, fast_json: bool = False):
+        self.bind = db.bind if isinstance(db, AsyncSession) else db.get_bind()
+        self.batch_size = batch_size
+        self.fast_json = fast_json
+
+    def _statement(self, task_list_id: int):
+        tasks = models.Task.__table__
+        return (
+            select(*(tasks.c[column] for column in EXPORT_COLUMNS))
+            .where(tasks.c.task_list_id == task_list_id)
+            .order_by(tasks.c.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+
+    def _serializer(self, export_format: str):
+        if export_format == "csv":
+            return _csv_chunk
+        return _fast_ndjson_chunk if self.fast_json else _ndjson_chunk
+
+    # Versión síncrona: StreamingResponse la recorre en el threadpool
+    def iter_tasks(self, task_list_id: int, export_format: str) -> Iterator[bytes]:
+        serialize = self._serializer(export_format)
+        if export_format == "csv":
+            yield _csv_header()
+        with self.bind.connect() as connection:
+            result = connection.execute(self._statement(task_list_id))
+            for rows in result.partitions():
+                yield serialize(rows)
+
+    # Versión asíncrona (modo DB_ASYNC): cursor del servidor sobre el driver asíncrono
+    async def aiter_tasks(self, task_list_id: int, export_format: str) -> AsyncIterator[bytes]:
+        serialize = self._serializer(export_format)
+        if export_format == "csv":
+            yield _csv_header()
+        async with self.bind.connect() as connection:
+            result = await connection.stream(self._statement(task_list_id))
+            async for rows in result.partitions():
+                yield serialize(rows)
+
+    def stream_tasks(self, task_list_id: int, export_format: str) -> Union[Iterator[bytes], AsyncIterator[bytes]]:
+        if isinstance(self.bind, AsyncEngine):
+            return self.aiter_tasks(task_list_id, export_format)
+        return self.iter_tasks(task_list_id, export_format)
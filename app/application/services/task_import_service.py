@@ -0,0 +1,121 @@
+# app/application/services/task_import_service.py
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Tuple
+from pydantic import ValidationError
+from app.application.services.async_services import AsyncTaskService
+from app.schemas import task_schemas
+
+# Una línea (o un registro CSV) supera max_length caracteres: la importación se detiene.
+# created: tareas ya confirmadas por los bloques anteriores
+class ImportLineTooLongError(Exception):
+    def __init__(self, line_number: int, max_length: int):
+        super().__init__(f"La línea {line_number} supera los {max_length} caracteres")
+        self.line_number = line_number
+        self.created = 0
+
+# Decodifica un cuerpo recibido por partes y produce sus líneas no vacías (número de línea, texto).
+# Solo retiene la línea en curso, de hasta max_length caracteres (ImportLineTooLongError):
+# la memoria no depende del tamaño del archivo
+async def iter_lines(chunks: AsyncIterator[bytes], max_length: int = task_schemas.IMPORT_MAX_LINE_LENGTH) -> AsyncIterator[Tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    line_number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > max_length:
+                raise ImportLineTooLongError(line_number, max_length)
+            if line.strip():
+                yield line_number, line.rstrip("\r")
+        if len(pending) > max_length:
+            raise ImportLineTooLongError(line_number + 1, max_length)
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield line_number + 1, pending.rstrip("\r")
+
+# Agrupa líneas en registros CSV: un campo entre comillas puede contener saltos de línea,
+# el registro termina cuando las comillas están balanceadas (y no supera max_length caracteres)
+async def iter_csv_records(lines: AsyncIterator[Tuple[int, str]], max_length: int = task_schemas.IMPORT_MAX_LINE_LENGTH) -> AsyncIterator[Tuple[int, List[str]]]:
+    record, start = None, 0
+    async for line_number, line in lines:
+        if record is None:
+            record, start = line, line_number
+        else:
+            record += "\n" + line
+        if len(record) > max_length:
+            raise ImportLineTooLongError(start, max_length)
+        if record.count('"') % 2 == 0:
+            yield start, next(csv.reader([record]))
+            record = None
+    if record is not None:
+        yield start, next(csv.reader([record]))
+
+# Importa tareas en una lista a partir de un cuerpo NDJSON o CSV recibido en streaming.
+# Valida cada registro contra TaskCreate e inserta por bloques de chunk_size; cada bloque es
+# su propia transacción, así que lo ya confirmado se conserva si la importación se interrumpe
+class TaskImportService:
+    def __init__(self, task_service: AsyncTaskService, chunk_size: int = task_schemas.IMPORT_CHUNK_SIZE):
+        self.task_service = task_service
+        self.chunk_size = chunk_size
+
+    async def _records(self, chunks: AsyncIterator[bytes], import_format: str) -> AsyncIterator[Tuple[int, object]]:
+        lines = iter_lines(chunks)
+        if import_format == "csv":
+            header = None
+            async for line_number, values in iter_csv_records(lines):
+                if header is None:
+                    header = [name.strip() for name in values]
+                    continue
+                if len(values) != len(header):
+                    yield line_number, ValueError(f"Se esperaban {len(header)} columnas y hay {len(values)}")
+                    continue
+                # Las celdas vacías toman el valor por defecto del schema
+                yield line_number, {name: value for name, value in zip(header, values) if value != ""}
+        else:
+            async for line_number, line in lines:
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as e:
+                    yield line_number, ValueError(f"JSON inválido: {e}")
+
+    def _validate(self, data: object, task_list_id: int) -> task_schemas.TaskCreate:
+        if isinstance(data, Exception):
+            raise data
+        if not isinstance(data, dict):
+            raise ValueError("Cada registro debe ser un objeto")
+        # La lista de destino es la de la ruta; la del archivo (p. ej. de una exportación) se ignora
+        return task_schemas.TaskCreate.model_validate({**data, "task_list_id": task_list_id})
+
+    async def import_tasks(self, task_list_id: int, chunks: AsyncIterator[bytes], import_format: str) -> task_schemas.TaskImportResponse:
+        result = task_schemas.TaskImportResponse()
+        batch: List[task_schemas.TaskCreate] = []
+
+        async def flush():
+            result.created += len(await self.task_service.create_tasks(batch))
+            result.chunks_committed += 1
+            batch.clear()
+
+        try:
+            async for line_number, data in self._records(chunks, import_format):
+                result.processed += 1
+                try:
+                    batch.append(self._validate(data, task_list_id))
+                except (ValidationError, ValueError) as e:
+                    result.failed += 1
+                    if len(result.errors) < task_schemas.IMPORT_MAX_REPORTED_ERRORS:
+                        result.errors.append(task_schemas.TaskImportLineError(line=line_number, detail=str(e)))
+                    else:
+                        result.errors_truncated = True
+                    continue
+                if len(batch) >= self.chunk_size:
+                    await flush()
+        except ImportLineTooLongError as e:
+            e.created = result.created
+            raise
+        if batch:
+            await flush()
+        return result
@@ -0,0 +1,50 @@
+# app/application/services/task_list_purge_service.py
+import asyncio
+from typing import Any, Callable, List, Union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from app.application.services.async_services import AsyncTaskListService
+
+# Fábrica de sesiones sobre el mismo motor que la sesión de la petición (síncrona o asíncrona).
+# La purga corre después de responder, cuando la sesión de la petición ya se cerró
+def purge_session_factory(db: Union[Session, AsyncSession]) -> Callable[[], Any]:
+    if isinstance(db, AsyncSession):
+        return async_sessionmaker(db.bind, autoflush=False, expire_on_commit=False)
+    return sessionmaker(bind=db.get_bind(), autoflush=False, expire_on_commit=False)
+
+async def _close(db: Union[Session, AsyncSession]) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        db.close()
+
+# Ejecuta un trabajo de purga hasta terminarlo: un bloque de chunk_size tareas por transacción,
+# cada uno con su propia sesión (no retiene una conexión entre bloques) y cediendo el event loop
+# entre bloques para no demorar las peticiones. Si un bloque falla, el trabajo queda "failed"
+async def run_purge_job(job_id: int, session_factory: Callable[[], Any], chunk_size: int = 1000) -> None:
+    try:
+        finished = False
+        while not finished:
+            db = session_factory()
+            try:
+                finished = await AsyncTaskListService(db).purge_task_list_chunk(job_id, chunk_size)
+            finally:
+                await _close(db)
+            await asyncio.sleep(0)
+    except Exception as e:
+        db = session_factory()
+        try:
+            await AsyncTaskListService(db).fail_purge_job(job_id, str(e))
+        finally:
+            await _close(db)
+
+# Reanuda en segundo plano los trabajos de purga sin terminar (p. ej. interrumpidos por un reinicio);
+# se llama al arrancar la aplicación. Devuelve las tareas asyncio: al apagar se cancelan, el bloque
+# en curso se revierte y el trabajo se reanuda en el siguiente arranque
+async def resume_purge_jobs(session_factory: Callable[[], Any], chunk_size: int = 1000) -> List[asyncio.Task]:
+    db = session_factory()
+    try:
+        job_ids = await AsyncTaskListService(db).get_unfinished_purge_job_ids()
+    finally:
+        await _close(db)
+    return [asyncio.create_task(run_purge_job(job_id, session_factory, chunk_size)) for job_id in job_ids]
@@ -1,22 +1,84 @@
 # app/application/services/task_list_service.py
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.domain import models
 from app.schemas import task_list_schemas
-from typing import List, Optional
+from app.infrastructure.cache import CacheBackend, session_cache
+from app.infrastructure.events import EventBroker, get_event_broker
+from app.application.etags import check_if_match, task_list_etag
+from app.application.fields import sparse_model
+from app.application.pagination import encode_id_cursor
+from app.application.services.task_write_buffer import get_task_write_buffer
+from typing import Iterable, List, Optional, Sequence, Set
+from pydantic import BaseModel
+
+# Tareas embebidas por defecto en GET /task-lists/{id} y campos de esa ventana de tareas
+TASKS_PAGE_SIZE = 100
+TASK_WINDOW_FIELDS = frozenset({"tasks", "tasks_total", "tasks_next_cursor"})
+
+# Clave de caché de la respuesta de una lista (con la primera página de sus tareas)
+def task_list_cache_key(task_list_id: int) -> str:
+    return f"task_list:{task_list_id}"
+
+# Canal de eventos de una lista (cambios de la lista y de sus tareas; GET /task-lists/{id}/events)
+def task_list_channel(task_list_id: int) -> str:
+    return f"task_list:{task_list_id}"
+
+# La lista ya se está eliminando (purga pendiente o en curso): un nuevo DELETE no la reanuda
+class TaskListDeletionInProgressError(Exception):
+    pass
 
 class TaskListService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[CacheBackend] = None, events: Optional[EventBroker] = None):
         self.db = db
+        self.cache = session_cache(db, cache)
+        self.events = events if events is not None else get_event_broker()
 
-    # Calcula el porcentaje de completitud
-    def completion_percentage_calculate(self, task_list: models.TaskList) -> float:
-        total_tasks = len(task_list.tasks)
-        if total_tasks == 0:
+    # Calcula el porcentaje de completitud a partir de los conteos
+    @staticmethod
+    def completion_percentage_calculate(total_tasks: int, completed_tasks: int) -> float:
+        if not total_tasks:
             return 0.0
-        completed_tasks = sum(1 for task in task_list.tasks if task.completed)
         return (completed_tasks / total_tasks) * 100.0
 
+    # Asigna completion_percentage a cada lista a partir de sus contadores (sin consultas)
+    def _set_completion_percentages(self, task_lists: List[models.TaskList]) -> None:
+        for task_list in task_lists:
+            task_list.completion_percentage = self.completion_percentage_calculate(task_list.task_count, task_list.completed_count)
+
+    # Recalcula task_count y completed_count desde la tabla de tareas (reparación de desvíos).
+    # Procesa las listas por bloques de ids con transacciones cortas; devuelve las listas revisadas
+    def recompute_counters(self, task_list_ids: Optional[Iterable[int]] = None, chunk_size: int = 1000) -> int:
+        table = models.TaskList.__table__
+        tasks = models.Task.__table__
+        task_count = select(func.count(tasks.c.id)).where(tasks.c.task_list_id == table.c.id).scalar_subquery()
+        completed_count = (
+            select(func.count(tasks.c.id))
+            .where(tasks.c.task_list_id == table.c.id, tasks.c.completed.is_(True))
+            .scalar_subquery()
+        )
+        if task_list_ids is None:
+            ids = [row.id for row in self.db.query(models.TaskList.id).order_by(models.TaskList.id).all()]
+        else:
+            ids = sorted(set(task_list_ids))
+        try:
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                self.db.execute(
+                    update(table)
+                    .where(table.c.id.in_(chunk))
+                    .values(task_count=task_count, completed_count=completed_count, updated_at=table.c.updated_at)
+                )
+                self.db.commit()
+                self.cache.delete(*(task_list_cache_key(task_list_id) for task_list_id in chunk))
+            # Las listas cargadas en la sesión tenían los contadores anteriores
+            self.db.expire_all()
+            return len(ids)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al recalcular los contadores: {e}")
+
     def create_task_list(self, task_list: task_list_schemas.TaskListCreate) -> models.TaskList:
         db_task_list = models.TaskList(**task_list.model_dump())
         try:
@@ -29,24 +91,153 @@ class TaskListService:
             self.db.rollback()
             raise Exception(f"Error al crear la lista de tareas: {e}")
 
-    def get_task_list(self, task_list_id: int) -> Optional[models.TaskList]:
-        # Carga las tareas relacionadas en la misma consulta
-        db_task_list = self.db.query(models.TaskList).options(joinedload(models.TaskList.tasks)).filter(models.TaskList.id == task_list_id).first()
-        if db_task_list:
-            db_task_list.completion_percentage = self.completion_percentage_calculate(db_task_list)
-        return db_task_list
+    # Lectura con caché (read-through): devuelve la respuesta ya serializable
+    # fields: subconjunto de campos (?fields=); las tareas solo se leen si se piden
+    # Las tareas embebidas son una ventana acotada (tasks_limit tras tasks_after_id, con los filtros
+    # de get_tasks_by_list_id); solo la ventana por defecto (primera página sin filtros) va a la caché
+    def get_task_list(self, task_list_id: int, fields: Optional[Sequence[str]] = None, tasks_limit: int = TASKS_PAGE_SIZE, tasks_after_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None) -> Optional[BaseModel]:
+        window = (tasks_limit, tasks_after_id, completed, priority)
+        cacheable = window == (TASKS_PAGE_SIZE, None, None, None)
+        key = task_list_cache_key(task_list_id)
+        cached = self.cache.get(key) if cacheable else None
+        model = task_list_schemas.TaskListResponseWithTasks
+        if fields is not None:
+            model = sparse_model(model, tuple(fields))
+        if cached is not None:
+            return model.model_validate(cached)
+        data = self._task_list_data(task_list_id, fields or tuple(model.model_fields), *window)
+        if data is None:
+            return None
+        task_list = model.model_validate(data)
+        if fields is None and cacheable:
+            self.cache.set(key, task_list.model_dump(mode="json"))
+        return task_list
 
-    def get_all_task_lists(self, skip: int = 0, limit: int = 100) -> List[models.TaskList]:
-        # Carga las tareas de todas las listas
-        task_lists = self.db.query(models.TaskList).options(joinedload(models.TaskList.tasks)).offset(skip).limit(limit).all()
-        for task_list in task_lists:
-            task_list.completion_percentage = self.completion_percentage_calculate(task_list)
+    # Datos de una lista leídos con Core: columnas de `fields` y, si se piden, la ventana de tareas
+    # (una consulta acotada con una fila extra para saber si hay más) con su total y el cursor siguiente
+    def _task_list_data(self, task_list_id: int, fields: Sequence[str], tasks_limit: int = TASKS_PAGE_SIZE, tasks_after_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None) -> Optional[dict]:
+        with_tasks = bool(TASK_WINDOW_FIELDS & set(fields))
+        columns = tuple(fields) + (("task_count", "completed_count") if with_tasks else ())
+        rows = self._task_list_rows(columns, models.TaskList.id == task_list_id, models.TaskList.deleted_at.is_(None)).all()
+        if not rows:
+            return None
+        data = self._sparse_task_list_data(rows[0], columns)
+        if not with_tasks:
+            return data
+        tasks = models.Task.__table__
+        criteria = [tasks.c.task_list_id == task_list_id]
+        if completed is not None:
+            criteria.append(tasks.c.completed == completed)
+        if priority is not None:
+            criteria.append(tasks.c.priority == priority)
+        window = self.db.execute(
+            select(*(tasks.c[name] for name in task_list_schemas.TaskResponseForList.model_fields))
+            .where(*criteria, *([tasks.c.id > tasks_after_id] if tasks_after_id is not None else []))
+            .order_by(tasks.c.id)
+            .limit(tasks_limit + 1)
+        ).all()
+        data["tasks"] = window[:tasks_limit]
+        data["tasks_next_cursor"] = encode_id_cursor(window[tasks_limit - 1].id) if len(window) > tasks_limit else None
+        # El total sale de los contadores; solo el filtro por prioridad requiere contar (por índice)
+        if priority is not None:
+            data["tasks_total"] = self.db.execute(select(func.count()).select_from(tasks).where(*criteria)).scalar()
+        elif completed is None:
+            data["tasks_total"] = data["task_count"]
+        else:
+            data["tasks_total"] = data["completed_count"] if completed else data["task_count"] - data["completed_count"]
+        return data
+
+    # Ruta rápida (FAST_JSON_RESPONSES): la lista con sus tareas como diccionarios de tipos nativos,
+    # leídos con Core y sin validar con Pydantic (los datos salen de nuestra propia base de datos).
+    # Aprovecha la caché si tiene la entrada, pero no la llena: la ruta normal guarda la versión validada
+    def get_task_list_data(self, task_list_id: int, tasks_limit: int = TASKS_PAGE_SIZE, tasks_after_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None) -> Optional[dict]:
+        window = (tasks_limit, tasks_after_id, completed, priority)
+        if window == (TASKS_PAGE_SIZE, None, None, None):
+            cached = self.cache.get(task_list_cache_key(task_list_id))
+            if cached is not None:
+                return task_list_schemas.TaskListResponseWithTasks.model_validate(cached).model_dump()
+        data = self._task_list_data(task_list_id, tuple(task_list_schemas.TaskListResponseWithTasks.model_fields), *window)
+        if data is not None:
+            data["tasks"] = [row._asdict() for row in data["tasks"]]
+        return data
+
+    # Comprueba si la lista existe con una consulta por clave primaria (sin cargar sus tareas ni
+    # calcular el porcentaje): para las validaciones que solo necesitan saber si existe.
+    # Las listas borradas (pendientes de purga) no existen para la API
+    def task_list_exists(self, task_list_id: int) -> bool:
+        statement = select(models.TaskList.id).where(models.TaskList.id == task_list_id, models.TaskList.deleted_at.is_(None))
+        return self.db.query(statement.exists()).scalar()
+
+    # Devuelve cuáles de los ids existen con una sola consulta (sin cargar las listas)
+    def get_existing_ids(self, task_list_ids: Iterable[int]) -> Set[int]:
+        task_list_ids = set(task_list_ids)
+        if not task_list_ids:
+            return set()
+        rows = self.db.query(models.TaskList.id).filter(models.TaskList.id.in_(task_list_ids), models.TaskList.deleted_at.is_(None)).all()
+        return {row.id for row in rows}
+
+    # Versión (ETag) de una lista con sus tareas: fila de la lista, contadores y MAX(updated_at)
+    # de sus tareas (por índice), sin cargar las tareas
+    def get_task_list_etag(self, task_list_id: int) -> Optional[str]:
+        tasks_updated_at = (
+            select(func.max(models.Task.updated_at))
+            .where(models.Task.task_list_id == models.TaskList.id)
+            .scalar_subquery()
+        )
+        row = (
+            self.db.query(models.TaskList.updated_at, models.TaskList.task_count, models.TaskList.completed_count, tasks_updated_at)
+            .filter(models.TaskList.id == task_list_id, models.TaskList.deleted_at.is_(None))
+            .first()
+        )
+        if row is None:
+            return None
+        return task_list_etag(task_list_id, *row)
+
+    # Consulta de las columnas de task_lists necesarias para los campos pedidos
+    # (completion_percentage se deriva de los contadores; la ventana de tareas no son columnas)
+    def _task_list_rows(self, fields: Sequence[str], *criteria):
+        names = [name for name in fields if name != "completion_percentage" and name not in TASK_WINDOW_FIELDS]
+        if "completion_percentage" in fields:
+            names += ["task_count", "completed_count"]
+        columns = [getattr(models.TaskList, name) for name in dict.fromkeys(names)]
+        return self.db.query(*columns).filter(*criteria)
+
+    def _sparse_task_list_data(self, row, fields: Sequence[str]) -> dict:
+        data = dict(row._mapping)
+        if "completion_percentage" in fields:
+            data["completion_percentage"] = self.completion_percentage_calculate(data["task_count"], data["completed_count"])
+        return data
+
+    # fields: lee solo las columnas necesarias y devuelve diccionarios en lugar de objetos ORM
+    def get_all_task_lists(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> list:
+        if fields is not None:
+            query = self._task_list_rows(fields)
+        else:
+            # Sin JOIN a tareas: offset/limit se aplican sobre listas y no sobre filas unidas
+            query = self.db.query(models.TaskList)
+        query = query.filter(models.TaskList.deleted_at.is_(None)).order_by(models.TaskList.id)
+        if after_id is not None:
+            # Paginación por keyset: el costo no depende de la profundidad de la página
+            query = query.filter(models.TaskList.id > after_id)
+        else:
+            query = query.offset(skip)
+        if fields is not None:
+            return [self._sparse_task_list_data(row, fields) for row in query.limit(limit)]
+        task_lists = query.limit(limit).all()
+        self._set_completion_percentages(task_lists)
         return task_lists
 
-    def update_task_list(self, task_list_id: int, task_list_update: task_list_schemas.TaskListUpdate) -> Optional[models.TaskList]:
-        # Para actualizar, se cargan las tareas para recalcular el porcentaje después de la actualización
-        db_task_list = self.db.query(models.TaskList).options(joinedload(models.TaskList.tasks)).filter(models.TaskList.id == task_list_id).first()
+    # if_match: cabecera If-Match; se verifica con la fila de la lista bloqueada (PreconditionFailedError)
+    def update_task_list(self, task_list_id: int, task_list_update: task_list_schemas.TaskListUpdate, if_match: Optional[str] = None) -> Optional[models.TaskList]:
+        db_task_list = (
+            self.db.query(models.TaskList)
+            .filter(models.TaskList.id == task_list_id, models.TaskList.deleted_at.is_(None))
+            .with_for_update()
+            .first()
+        )
         if db_task_list:
+            if if_match is not None:
+                check_if_match(if_match, self.get_task_list_etag(task_list_id))
             update_data = task_list_update.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(db_task_list, key, value)
@@ -54,22 +245,128 @@ class TaskListService:
                 self.db.add(db_task_list)
                 self.db.commit()
                 self.db.refresh(db_task_list)
+                self.cache.delete(task_list_cache_key(task_list_id))
                 # Recalcular el porcentaje después de la actualización
-                db_task_list.completion_percentage = self.completion_percentage_calculate(db_task_list)
+                self._set_completion_percentages([db_task_list])
+                if self.events.enabled:
+                    data = task_list_schemas.TaskListResponse.model_validate(db_task_list).model_dump(mode="json")
+                    self.events.publish(task_list_channel(task_list_id), "task_list.updated", data)
                 return db_task_list
             except SQLAlchemyError as e:
                 self.db.rollback()
                 raise Exception(f"Error al actualizar la lista de tareas: {e}")
         return None
 
-    def delete_task_list(self, task_list_id: int) -> bool:
-        db_task_list = self.db.query(models.TaskList).filter(models.TaskList.id == task_list_id).first()
-        if db_task_list:
-            try:
-                self.db.delete(db_task_list)
-                self.db.commit()
-                return True
-            except SQLAlchemyError as e:
-                self.db.rollback()
-                raise Exception(f"Error al eliminar la lista de tareas: {e}")
-        return False
\ No newline at end of file
+    # Borrado lógico: marca la lista como borrada (deja de verse al instante) y registra un trabajo
+    # de purga que elimina sus tareas en segundo plano (purge_task_list_chunk).
+    # Si la lista ya estaba borrada con una purga fallida, la reanuda; si la purga sigue pendiente o
+    # en curso, TaskListDeletionInProgressError (las interrumpidas se reanudan al arrancar).
+    # Sus tareas dejan de leerse desde la caché y se descartan sus cambios pendientes (write-behind).
+    # Devuelve el trabajo, o None si la lista no existe
+    def delete_task_list(self, task_list_id: int) -> Optional[models.TaskListPurgeJob]:
+        # Import diferido: task_service importa este módulo
+        from app.application.services.task_service import task_cache_key
+        statement = (
+            update(models.TaskList)
+            .where(models.TaskList.id == task_list_id, models.TaskList.deleted_at.is_(None))
+            .values(deleted_at=models.utc_now())
+        )
+        try:
+            marked = self.db.execute(statement.execution_options(synchronize_session=False)).rowcount
+            if marked:
+                job = models.TaskListPurgeJob(task_list_id=task_list_id, status="pending")
+                self.db.add(job)
+            else:
+                job = (
+                    self.db.query(models.TaskListPurgeJob)
+                    .filter(models.TaskListPurgeJob.task_list_id == task_list_id, models.TaskListPurgeJob.status != "done")
+                    .order_by(models.TaskListPurgeJob.id.desc())
+                    .with_for_update()
+                    .first()
+                )
+                if job is None:
+                    self.db.rollback()
+                    return None
+                if job.status != "failed":
+                    self.db.rollback()
+                    raise TaskListDeletionInProgressError("La lista de tareas ya se está eliminando")
+                job.status = "pending"
+            # Solo con caché activa hace falta conocer las tareas para invalidarlas
+            task_ids = self.db.execute(select(models.Task.id).where(models.Task.task_list_id == task_list_id)).scalars().all() if self.cache.enabled else []
+            self.db.commit()
+            self.db.refresh(job)
+            self.cache.delete(task_list_cache_key(task_list_id), *(task_cache_key(task_id) for task_id in task_ids))
+            write_buffer = get_task_write_buffer()
+            if write_buffer is not None:
+                write_buffer.discard_list(task_list_id)
+            self.events.publish(task_list_channel(task_list_id), "task_list.deleted", {"id": task_list_id})
+            return job
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al eliminar la lista de tareas: {e}")
+
+    def get_purge_job(self, job_id: int) -> Optional[models.TaskListPurgeJob]:
+        return self.db.get(models.TaskListPurgeJob, job_id)
+
+    # Ids de los trabajos de purga sin terminar (p. ej. interrumpidos por un reinicio)
+    def get_unfinished_purge_job_ids(self) -> List[int]:
+        rows = (
+            self.db.query(models.TaskListPurgeJob.id)
+            .filter(models.TaskListPurgeJob.status.in_(("pending", "running")))
+            .order_by(models.TaskListPurgeJob.id)
+            .all()
+        )
+        return [row.id for row in rows]
+
+    # Un paso de la purga en una transacción corta: elimina hasta chunk_size tareas de la lista
+    # (primero sus ids y luego DELETE por id, válido también en MySQL, que no admite LIMIT en
+    # subconsultas IN) y actualiza el progreso del trabajo. Cuando ya no quedan tareas elimina la
+    # fila de la lista y marca el trabajo como terminado. Devuelve True si la purga terminó
+    def purge_task_list_chunk(self, job_id: int, chunk_size: int = 1000) -> bool:
+        # Import diferido: task_service importa este módulo
+        from app.application.services.task_service import task_cache_key
+        job = self.db.get(models.TaskListPurgeJob, job_id, with_for_update=True)
+        if job is None or job.status == "done":
+            self.db.rollback()
+            return True
+        try:
+            task_ids = self.db.execute(
+                select(models.Task.id)
+                .where(models.Task.task_list_id == job.task_list_id)
+                .order_by(models.Task.id)
+                .limit(chunk_size)
+            ).scalars().all()
+            if task_ids:
+                self.db.execute(
+                    delete(models.Task).where(models.Task.id.in_(task_ids)).execution_options(synchronize_session=False)
+                )
+            job.tasks_deleted += len(task_ids)
+            job.status = "running"
+            job.error = None
+            finished = len(task_ids) < chunk_size
+            if finished:
+                self.db.execute(
+                    delete(models.TaskList)
+                    .where(models.TaskList.id == job.task_list_id, models.TaskList.deleted_at.is_not(None))
+                    .execution_options(synchronize_session=False)
+                )
+                job.status = "done"
+                job.finished_at = models.utc_now()
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al purgar la lista de tareas: {e}")
+        self.cache.delete(*(task_cache_key(task_id) for task_id in task_ids))
+        return finished
+
+    # Registra el error de un trabajo de purga; se reintenta repitiendo el DELETE de la lista
+    def fail_purge_job(self, job_id: int, error: str) -> None:
+        try:
+            self.db.execute(
+                update(models.TaskListPurgeJob)
+                .where(models.TaskListPurgeJob.id == job_id)
+                .values(status="failed", error=error[:500])
+            )
+            self.db.commit()
+        except SQLAlchemyError:
+            self.db.rollback()
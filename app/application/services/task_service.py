@@ -1,74 +1,512 @@
 # app/application/services/task_service.py
-from typing import List, Optional
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, bindparam, case, column, delete, func, insert, literal, literal_column, not_, or_, select, table, update
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from app.domain import models
 from app.schemas import task_schemas
+from app.infrastructure.cache import CacheBackend, session_cache
+from app.infrastructure.events import EventBroker, get_event_broker
+from app.application.services.task_list_service import task_list_cache_key, task_list_channel
+from app.application.services.task_write_buffer import PendingTask, TaskWriteBuffer, WriteBufferFullError, get_task_write_buffer
+from app.application.etags import check_if_match, task_etag, tasks_page_etag
+from app.infrastructure.database.full_text import FTS_TABLE, fts5_query
 
+# Filas por sentencia INSERT en las inserciones masivas
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Clave de caché de la respuesta de una tarea
+def task_cache_key(task_id: int) -> str:
+    return f"task:{task_id}"
+
+# Condición de las tareas cuya lista no está borrada: las de una lista pendiente de purga no se
+# leen ni se modifican. EXISTS correlacionado con la fila de la tarea (por clave primaria)
+def list_visible():
+    return select(models.TaskList.id).where(models.TaskList.id == models.Task.task_list_id, models.TaskList.deleted_at.is_(None)).exists()
+
+# Escritor del buffer write-behind: cada vaciado usa su propia sesión (corre fuera de las peticiones)
+def task_write_buffer_writer(session_factory: Callable[[], Session]) -> Callable[[Dict[int, PendingTask]], int]:
+    def write(entries: Dict[int, PendingTask]) -> int:
+        with session_factory() as db:
+            return TaskService(db).write_pending(entries)
+    return write
+
+# Con el buffer write-behind activo, quien llama lo vacía antes de las escrituras que no pasan
+# por él (AsyncTaskService lo hace fuera del event loop)
 class TaskService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: Optional[CacheBackend] = None, events: Optional[EventBroker] = None, write_buffer: Optional[TaskWriteBuffer] = None):
         self.db = db
+        self.cache = session_cache(db, cache)
+        self.events = events if events is not None else get_event_broker()
+        self.write_buffer = write_buffer if write_buffer is not None else get_task_write_buffer()
+
+    # Invalida las entradas de caché afectadas por una escritura (después del commit).
+    # Las listas se invalidan porque embeben sus tareas y sus contadores
+    def _invalidate(self, task_ids: Iterable[int] = (), task_list_ids: Iterable[int] = ()) -> None:
+        keys = [task_cache_key(task_id) for task_id in task_ids]
+        keys += [task_list_cache_key(task_list_id) for task_list_id in task_list_ids]
+        if keys:
+            self.cache.delete(*keys)
+
+    # Estado de una tarea (campos de TaskResponse) leído con una consulta por clave primaria
+    def _task_state(self, task_id: int) -> Optional[Dict[str, Any]]:
+        table = models.Task.__table__
+        row = self.db.execute(
+            select(*(table.c[name] for name in task_schemas.TaskResponse.model_fields)).where(table.c.id == task_id, list_visible())
+        ).first()
+        return row._asdict() if row is not None else None
+
+    # Aplica un cambio en el buffer write-behind (sin escribir en la base de datos) y publica el evento.
+    # WriteBufferFullError si el buffer está lleno: el cambio se escribe directamente
+    def _buffer_task_change(self, task_id: int, change: Callable[[Dict[str, Any]], Dict[str, Any]], event_type: str, toggle: bool = False) -> Optional[task_schemas.TaskResponse]:
+        state = self.write_buffer.apply(task_id, lambda: self._task_state(task_id), change, toggle=toggle)
+        if state is None:
+            return None
+        task = task_schemas.TaskResponse.model_validate(state)
+        if self.events.enabled:
+            self.events.publish(task_list_channel(task.task_list_id), event_type, task.model_dump(mode="json"))
+        return task
+
+    # Estado con los cambios aún no escritos del buffer write-behind, o None si no tiene
+    def _pending_task(self, task_id: int) -> Optional[task_schemas.TaskResponse]:
+        if self.write_buffer is None:
+            return None
+        state = self.write_buffer.pending(task_id)
+        return task_schemas.TaskResponse.model_validate(state) if state is not None else None
+
+    # Escribe un lote del buffer write-behind en una transacción: un UPDATE por lotes (executemany)
+    # por cada combinación de columnas modificadas (los toggles, como SET completed = NOT completed),
+    # y el ajuste de contadores según el estado anterior de las tareas cuyo `completed` cambia
+    # (leído con las filas bloqueadas).
+    # Las tareas eliminadas mientras tanto (o de listas borradas) no afectan filas. Devuelve las filas actualizadas
+    def write_pending(self, entries: Dict[int, PendingTask]) -> int:
+        table = models.Task.__table__
+        try:
+            previous = {}
+            toggled = [task_id for task_id, entry in entries.items() if "completed" in entry.dirty or entry.flip]
+            if toggled:
+                rows = self.db.execute(
+                    select(table.c.id, table.c.task_list_id, table.c.completed).where(table.c.id.in_(toggled), list_visible()).with_for_update()
+                ).all()
+                previous = {row.id: row for row in rows}
+            batches: Dict[Tuple[Tuple[str, ...], bool], List[dict]] = {}
+            for task_id, entry in entries.items():
+                columns = tuple(sorted(entry.dirty)) + ("updated_at",)
+                batches.setdefault((columns, entry.flip), []).append({"task_id": task_id, **{f"v_{name}": entry.task[name] for name in columns}})
+            written = 0
+            for (columns, flip), params in batches.items():
+                values = {name: bindparam(f"v_{name}") for name in columns}
+                if flip:
+                    values["completed"] = not_(func.coalesce(table.c.completed, False))
+                statement = update(table).where(table.c.id == bindparam("task_id"), list_visible()).values(values)
+                written += self.db.execute(statement, params).rowcount
+            deltas: Dict[int, Tuple[int, int]] = {}
+            for task_id, row in previous.items():
+                entry = entries[task_id]
+                completed = not row.completed if entry.flip else bool(entry.task["completed"])
+                if completed != bool(row.completed):
+                    deltas[row.task_list_id] = (0, deltas.get(row.task_list_id, (0, 0))[1] + (1 if completed else -1))
+            self._adjust_counters(deltas)
+            self.db.commit()
+            self._invalidate(task_ids=entries, task_list_ids={entry.task["task_list_id"] for entry in entries.values()})
+            return written
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al escribir los cambios pendientes de las tareas: {e}")
+
+    # Publica el cambio de una tarea en el canal de su lista (después del commit)
+    def _publish_task(self, event_type: str, db_task: models.Task) -> None:
+        if self.events.enabled:
+            data = task_schemas.TaskResponse.model_validate(db_task).model_dump(mode="json")
+            self.events.publish(task_list_channel(db_task.task_list_id), event_type, data)
+
+    # Ajusta los contadores de las listas con incrementos atómicos en SQL (sin commit)
+    # deltas: {task_list_id: (delta de tareas, delta de completadas)}
+    def _adjust_counters(self, deltas: Dict[int, Tuple[int, int]]) -> None:
+        rows = [
+            {"list_id": task_list_id, "tasks_delta": tasks_delta, "completed_delta": completed_delta}
+            for task_list_id, (tasks_delta, completed_delta) in deltas.items()
+            if tasks_delta or completed_delta
+        ]
+        if not rows:
+            return
+        table = models.TaskList.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("list_id"))
+            .values(
+                task_count=table.c.task_count + bindparam("tasks_delta"),
+                completed_count=table.c.completed_count + bindparam("completed_delta"),
+                # Los contadores son derivados: no cuentan como modificación de la lista
+                updated_at=table.c.updated_at,
+            )
+        )
+        self.db.execute(statement, rows)
+        # Los contadores cambian en SQL: se expiran en las listas ya cargadas en la sesión
+        for obj in list(self.db.identity_map.values()):
+            if isinstance(obj, models.TaskList) and obj.id in deltas:
+                self.db.expire(obj, ["task_count", "completed_count"])
+
+    # (total, completadas) por lista de las tareas seleccionadas, bloqueándolas hasta el commit
+    def _selection_stats(self, filters: list) -> Dict[int, Tuple[int, int]]:
+        rows = (
+            self.db.query(
+                models.Task.task_list_id,
+                func.count(models.Task.id),
+                func.sum(case((models.Task.completed.is_(True), 1), else_=0)),
+            )
+            .filter(*filters)
+            .group_by(models.Task.task_list_id)
+            .with_for_update()
+            .all()
+        )
+        return {task_list_id: (total, int(completed or 0)) for task_list_id, total, completed in rows}
+
+    # Inserta las filas con INSERT multi-fila por bloques y devuelve los ids en orden (sin commit)
+    def _insert_rows(self, rows: List[dict]) -> List[int]:
+        table = models.Task.__table__
+        dialect = self.db.get_bind().dialect
+        ids: List[int] = []
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+            if dialect.insert_executemany_returning:
+                # executemany con RETURNING (SQLite, MariaDB): una sentencia por bloque.
+                # Los ids de un mismo INSERT se asignan en el orden de las filas, por eso basta
+                # ordenarlos (sort_by_parameter_order degradaría a una sentencia por fila)
+                result = self.db.execute(insert(table).returning(table.c.id), chunk)
+                ids.extend(sorted(result.scalars().all()))
+            else:
+                # MySQL: un INSERT multi-fila; InnoDB asigna ids consecutivos a un "simple insert"
+                result = self.db.execute(insert(table).values(chunk))
+                ids.extend(range(result.lastrowid, result.lastrowid + len(chunk)))
+        return ids
+
+    # Crea muchas tareas en una sola transacción (las listas deben existir)
+    def create_tasks(self, tasks: List[task_schemas.TaskCreate]) -> List[int]:
+        if not tasks:
+            return []
+        try:
+            ids = self._insert_rows([task.model_dump() for task in tasks])
+            tasks_per_list = Counter(task.task_list_id for task in tasks)
+            completed_per_list = Counter(task.task_list_id for task in tasks if task.completed)
+            self._adjust_counters({
+                task_list_id: (total, completed_per_list[task_list_id])
+                for task_list_id, total in tasks_per_list.items()
+            })
+            self.db.commit()
+            self._invalidate(task_list_ids=tasks_per_list)
+            # Un evento por lista con los ids creados (el cliente los lee si los necesita)
+            if self.events.enabled:
+                ids_per_list: Dict[int, List[int]] = {}
+                for task, task_id in zip(tasks, ids):
+                    ids_per_list.setdefault(task.task_list_id, []).append(task_id)
+                for task_list_id, task_ids in ids_per_list.items():
+                    self.events.publish(task_list_channel(task_list_id), "tasks.created", {"ids": task_ids})
+            return ids
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al crear las tareas: {e}")
 
     def create_task(self, task_create_schema: task_schemas.TaskCreate):
         db_task = models.Task(**task_create_schema.model_dump())
         try:
             self.db.add(db_task)
+            self._adjust_counters({db_task.task_list_id: (1, int(bool(db_task.completed)))})
             self.db.commit()
+            self._invalidate(task_list_ids=[db_task.task_list_id])
             self.db.refresh(db_task)
+            self._publish_task("task.created", db_task)
             return db_task
         except SQLAlchemyError as e:
             self.db.rollback()
             raise Exception(f"Error al crear la tarea: {e}")
 
-    def get_task(self, task_id: int) -> Optional[models.Task]:
-        return self.db.query(models.Task).filter(models.Task.id == task_id).first()
+    # Condiciones WHERE de una selección masiva (ids y/o filtros)
+    def _selection_filters(self, selection: task_schemas.TaskSelection) -> list:
+        filters = [list_visible()]
+        if selection.ids is not None:
+            filters.append(models.Task.id.in_(selection.ids))
+        if selection.task_list_id is not None:
+            filters.append(models.Task.task_list_id == selection.task_list_id)
+        if selection.completed is not None:
+            filters.append(models.Task.completed == selection.completed)
+        if selection.priority is not None:
+            filters.append(models.Task.priority == selection.priority)
+        return filters
+
+    # Ejecuta una sentencia UPDATE/DELETE masiva y devuelve el número de filas afectadas.
+    # counter_deltas calcula los ajustes de contadores a partir de (total, completadas) por lista
+    # event_type: evento publicado en cada lista afectada, con el número de tareas afectadas en ella
+    def _execute_bulk(self, filters: list, statement, counter_deltas, error_message: str, event_type: str) -> int:
+        try:
+            stats = self._selection_stats(filters)
+            # Solo con caché activa hace falta conocer las tareas afectadas para invalidarlas
+            task_ids = [row.id for row in self.db.query(models.Task.id).filter(*filters)] if self.cache.enabled else []
+            result = self.db.execute(statement.execution_options(synchronize_session=False))
+            self._adjust_counters({
+                task_list_id: counter_deltas(total, completed)
+                for task_list_id, (total, completed) in stats.items()
+            })
+            self.db.commit()
+            self._invalidate(task_ids=task_ids, task_list_ids=stats)
+            if self.events.enabled:
+                for task_list_id, (total, _) in stats.items():
+                    self.events.publish(task_list_channel(task_list_id), event_type, {"count": total})
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"{error_message}: {e}")
+
+    # Actualiza todas las tareas seleccionadas con una sola sentencia UPDATE
+    def update_tasks(self, selection: task_schemas.TaskSelection, task_update: task_schemas.TaskUpdate) -> int:
+        filters = self._selection_filters(selection)
+        update_data = task_update.model_dump(exclude_unset=True)
+        statement = update(models.Task).where(*filters).values(**update_data)
+        if "completed" in update_data:
+            # Todas pasan a completadas (total - completadas) o dejan de estarlo (-completadas)
+            completed_value = update_data["completed"]
+            counter_deltas = lambda total, completed: (0, total - completed if completed_value else -completed)
+        else:
+            counter_deltas = lambda total, completed: (0, 0)
+        return self._execute_bulk(filters, statement, counter_deltas, "Error al actualizar las tareas", "tasks.updated")
+
+    # Invierte el estado de todas las tareas seleccionadas (SET completed = NOT completed)
+    def toggle_tasks_completion(self, selection: task_schemas.TaskSelection) -> int:
+        filters = self._selection_filters(selection)
+        statement = update(models.Task).where(*filters).values(completed=not_(models.Task.completed))
+        # Las pendientes pasan a completadas y viceversa
+        counter_deltas = lambda total, completed: (0, (total - completed) - completed)
+        return self._execute_bulk(filters, statement, counter_deltas, "Error al cambiar estado de las tareas", "tasks.toggled")
+
+    # Elimina todas las tareas seleccionadas con una sola sentencia DELETE
+    def delete_tasks(self, selection: task_schemas.TaskSelection) -> int:
+        filters = self._selection_filters(selection)
+        statement = delete(models.Task).where(*filters)
+        counter_deltas = lambda total, completed: (-total, -completed)
+        return self._execute_bulk(filters, statement, counter_deltas, "Error al eliminar las tareas", "tasks.deleted")
+
+    # Lectura con caché (read-through): devuelve la respuesta ya serializable
+    # fields: si no está en caché lee solo esas columnas (más id y updated_at, para el ETag)
+    # y devuelve la fila sin guardarla en caché
+    def get_task(self, task_id: int, fields: Optional[Sequence[str]] = None):
+        pending = self._pending_task(task_id)
+        if pending is not None:
+            return pending
+        key = task_cache_key(task_id)
+        cached = self.cache.get(key)
+        if fields is not None and cached is None:
+            columns = self._task_columns(dict.fromkeys(("id", "updated_at", *fields)))
+            return self.db.query(*columns).filter(models.Task.id == task_id, list_visible()).first()
+        if cached is not None:
+            return task_schemas.TaskResponse.model_validate(cached)
+        db_task = self.db.query(models.Task).filter(models.Task.id == task_id, list_visible()).first()
+        if db_task is None:
+            return None
+        task = task_schemas.TaskResponse.model_validate(db_task)
+        self.cache.set(key, task.model_dump(mode="json"))
+        return task
 
-    def get_tasks_by_list_id(self, task_list_id: int, completed: Optional[bool] = None, priority: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[models.Task]:
-        query = self.db.query(models.Task).filter(models.Task.task_list_id == task_list_id)
+    # Versión (ETag) de una tarea leyendo solo su updated_at
+    def get_task_etag(self, task_id: int) -> Optional[str]:
+        pending = self._pending_task(task_id)
+        if pending is not None:
+            return task_etag(task_id, pending.updated_at)
+        updated_at = self.db.query(models.Task.updated_at).filter(models.Task.id == task_id, list_visible()).scalar()
+        return task_etag(task_id, updated_at) if updated_at is not None else None
+
+    # Aplica los filtros y la paginación de get_tasks_by_list_id a una consulta
+    def _filter_tasks_by_list(self, query, task_list_id: int, completed: Optional[bool], priority: Optional[int], skip: int, limit: int, after_id: Optional[int]):
+        # Las tareas de una lista borrada (pendientes de purga) ya no se ven
+        query = query.filter(models.Task.task_list_id == task_list_id, list_visible())
         if completed is not None:
             query = query.filter(models.Task.completed == completed)
         if priority is not None:
             query = query.filter(models.Task.priority == priority)
-        return query.offset(skip).limit(limit).all()
-
-    def update_task(self, task_id: int, task_update: task_schemas.TaskUpdate) -> Optional[models.Task]:
-        db_task = self.get_task(task_id)
-        if db_task:
-            update_data = task_update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(db_task, key, value)
+        # Orden determinista por id para que las páginas sean estables
+        query = query.order_by(models.Task.id)
+        if after_id is not None:
+            query = query.filter(models.Task.id > after_id)
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    # Columnas de la tabla de tareas para una selección parcial (?fields=)
+    @staticmethod
+    def _task_columns(fields: Iterable[str]) -> list:
+        return [getattr(models.Task, name) for name in fields]
+
+    # fields: lee solo esas columnas (más id y updated_at, usados para el cursor y el ETag)
+    # y devuelve filas en lugar de objetos ORM, con las columnas en el orden de `fields`
+    def get_tasks_by_list_id(self, task_list_id: int, completed: Optional[bool] = None, priority: Optional[int] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None, fields: Optional[Sequence[str]] = None) -> list:
+        if fields is not None:
+            query = self.db.query(*self._task_columns(dict.fromkeys(("id", *fields, "updated_at"))))
+        else:
+            query = self.db.query(models.Task)
+        return self._filter_tasks_by_list(query, task_list_id, completed, priority, skip, limit, after_id).all()
+
+    # Versión (ETag) de una página de get_tasks_by_list_id leyendo solo (id, updated_at)
+    def get_tasks_by_list_etag(self, task_list_id: int, completed: Optional[bool] = None, priority: Optional[int] = None, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> str:
+        query = self.db.query(models.Task.id, models.Task.updated_at)
+        return tasks_page_etag(self._filter_tasks_by_list(query, task_list_id, completed, priority, skip, limit, after_id).all())
+
+    # Subconsulta (task_id, score) con las tareas que coinciden con el texto; menor score = más relevante.
+    # SQLite: tabla FTS5 con bm25; MySQL: MATCH ... AGAINST sobre el índice FULLTEXT (negado, para
+    # ordenar igual en ambos); otros motores: LIKE sin ranking. None si el texto no tiene palabras
+    def _search_matches(self, text: str):
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            fts_query = fts5_query(text)
+            if fts_query is None:
+                return None
+            fts = table(FTS_TABLE, column("rowid"))
+            statement = select(
+                fts.c.rowid.label("task_id"),
+                func.bm25(literal_column(FTS_TABLE)).label("score"),
+            ).where(literal_column(FTS_TABLE).op("MATCH")(fts_query))
+        elif dialect == "mysql":
+            relevance = match(models.Task.title, models.Task.description, against=text).in_natural_language_mode()
+            statement = select(models.Task.id.label("task_id"), (-relevance).label("score")).where(relevance > 0)
+        else:
+            pattern = f"%{text.strip()}%"
+            statement = select(models.Task.id.label("task_id"), literal(0.0).label("score")).where(
+                or_(models.Task.title.ilike(pattern), models.Task.description.ilike(pattern))
+            )
+        return statement.subquery("matches")
+
+    # Búsqueda de texto completo ordenada por relevancia (y por id para desempatar).
+    # after: (score, id) del último resultado de la página anterior (paginación por keyset).
+    # Devuelve pares (tarea, score)
+    def search_tasks(self, text: str, task_list_id: Optional[int] = None, completed: Optional[bool] = None, priority: Optional[int] = None, limit: int = 20, after: Optional[Tuple[float, int]] = None) -> List[Tuple[models.Task, float]]:
+        matches = self._search_matches(text)
+        if matches is None:
+            return []
+        query = (
+            self.db.query(models.Task, matches.c.score)
+            .join(matches, matches.c.task_id == models.Task.id)
+            # Sin las tareas de listas borradas (pendientes de purga)
+            .join(models.TaskList, models.TaskList.id == models.Task.task_list_id)
+            .filter(models.TaskList.deleted_at.is_(None))
+        )
+        if task_list_id is not None:
+            query = query.filter(models.Task.task_list_id == task_list_id)
+        if completed is not None:
+            query = query.filter(models.Task.completed == completed)
+        if priority is not None:
+            query = query.filter(models.Task.priority == priority)
+        if after is not None:
+            score, last_id = after
+            query = query.filter(or_(matches.c.score > score, and_(matches.c.score == score, models.Task.id > last_id)))
+        return [tuple(row) for row in query.order_by(matches.c.score, models.Task.id).limit(limit).all()]
+
+    # Verifica If-Match leyendo solo updated_at con la fila bloqueada hasta el commit.
+    # Devuelve False si la tarea no existe (PreconditionFailedError si cambió de versión)
+    def _check_task_precondition(self, task_id: int, if_match: Optional[str]) -> bool:
+        if if_match is None:
+            return True
+        updated_at = self.db.query(models.Task.updated_at).filter(models.Task.id == task_id, list_visible()).with_for_update().scalar()
+        if updated_at is None:
+            return False
+        check_if_match(if_match, task_etag(task_id, updated_at))
+        return True
+
+    # UPDATE de una sola tarea de una lista no borrada (criteria: condiciones adicionales del WHERE).
+    # Devuelve la tarea actualizada, o None si ninguna fila cumplió las condiciones.
+    # Con RETURNING (SQLite, PostgreSQL) es una única sentencia; sin él (MySQL) se relee la fila,
+    # que el UPDATE deja bloqueada hasta el commit
+    def _update_task_returning(self, task_id: int, *criteria, **values) -> Optional[models.Task]:
+        statement = update(models.Task).where(models.Task.id == task_id, list_visible(), *criteria).values(**values)
+        if self.db.get_bind().dialect.update_returning:
+            statement = statement.returning(models.Task).execution_options(synchronize_session=False, populate_existing=True)
+            return self.db.execute(statement).scalars().first()
+        if self.db.execute(statement.execution_options(synchronize_session=False)).rowcount == 0:
+            return None
+        return self.db.query(models.Task).populate_existing().filter(models.Task.id == task_id).first()
+
+    # if_match: cabecera If-Match; se verifica con la fila bloqueada (PreconditionFailedError)
+    # Sin SELECT previo: si cambia `completed`, un UPDATE condicionado al estado anterior indica
+    # si la tarea cambió de estado (y por tanto el contador), sin carreras entre peticiones
+    # Con el buffer write-behind (y sin If-Match) el cambio se fusiona en memoria y se escribe después
+    def update_task(self, task_id: int, task_update: task_schemas.TaskUpdate, if_match: Optional[str] = None) -> Optional[models.Task]:
+        update_data = task_update.model_dump(exclude_unset=True)
+        if self.write_buffer is not None and if_match is None and update_data:
             try:
-                self.db.add(db_task)
-                self.db.commit()
-                self.db.refresh(db_task)
-                return db_task
-            except SQLAlchemyError as e:
+                return self._buffer_task_change(task_id, lambda task: update_data, "task.updated")
+            except WriteBufferFullError:
+                pass
+        try:
+            if not self._check_task_precondition(task_id, if_match):
+                self.db.rollback()
+                return None
+            if not update_data:
+                return self.db.query(models.Task).filter(models.Task.id == task_id, list_visible()).first()
+            completed_delta = 0
+            db_task = None
+            if "completed" in update_data:
+                completed = bool(update_data["completed"])
+                db_task = self._update_task_returning(task_id, func.coalesce(models.Task.completed, False) != completed, **update_data)
+                if db_task is not None:
+                    completed_delta = 1 if completed else -1
+            if db_task is None:
+                db_task = self._update_task_returning(task_id, **update_data)
+            if db_task is None:
                 self.db.rollback()
-                raise Exception(f"Error al actualizar la tarea: {e}")
-        return None
+                return None
+            self._adjust_counters({db_task.task_list_id: (0, completed_delta)})
+            self.db.commit()
+            self._invalidate(task_ids=[task_id], task_list_ids=[db_task.task_list_id])
+            self._publish_task("task.updated", db_task)
+            return db_task
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al actualizar la tarea: {e}")
 
+    # Un solo DELETE (con RETURNING de la lista y el estado, para los contadores); la tarea
+    # inexistente se detecta porque no devuelve filas. Sin DELETE ... RETURNING se bloquea la fila antes
     def delete_task(self, task_id: int) -> bool:
-        db_task = self.get_task(task_id)
-        if db_task:
-            try:
-                self.db.delete(db_task)
-                self.db.commit()
-                return True
-            except SQLAlchemyError as e:
+        statement = delete(models.Task).where(models.Task.id == task_id, list_visible()).execution_options(synchronize_session=False)
+        try:
+            if self.db.get_bind().dialect.delete_returning:
+                row = self.db.execute(statement.returning(models.Task.task_list_id, models.Task.completed)).first()
+            else:
+                row = self.db.query(models.Task.task_list_id, models.Task.completed).filter(models.Task.id == task_id, list_visible()).with_for_update().first()
+                if row is not None:
+                    self.db.execute(statement)
+            if row is None:
                 self.db.rollback()
-                raise Exception(f"Error al eliminar la tarea: {e}")
-        return False
+                return False
+            self._adjust_counters({row.task_list_id: (-1, -int(bool(row.completed)))})
+            self.db.commit()
+            self._invalidate(task_ids=[task_id], task_list_ids=[row.task_list_id])
+            if self.events.enabled:
+                self.events.publish(task_list_channel(row.task_list_id), "task.deleted", {"id": task_id, "task_list_id": row.task_list_id})
+            return True
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al eliminar la tarea: {e}")
 
-    def toggle_task_completion(self, task_id: int) -> Optional[models.Task]:
-        db_task = self.get_task(task_id)
-        if db_task:
-            db_task.completed = not db_task.completed
+    # SET completed = NOT completed en la base de datos: los toggles concurrentes no se pisan.
+    # Con el buffer write-behind (y sin If-Match) el toggle se fusiona en memoria y se escribe después
+    def toggle_task_completion(self, task_id: int, if_match: Optional[str] = None) -> Optional[models.Task]:
+        if self.write_buffer is not None and if_match is None:
             try:
-                self.db.add(db_task)
-                self.db.commit()
-                self.db.refresh(db_task)
-                return db_task
-            except SQLAlchemyError as e:
+                return self._buffer_task_change(task_id, lambda task: {"completed": not task["completed"]}, "task.toggled", toggle=True)
+            except WriteBufferFullError:
+                pass
+        try:
+            if not self._check_task_precondition(task_id, if_match):
                 self.db.rollback()
-                raise Exception(f"Error al cambiar estado de la tarea: {e}")
-        return None
\ No newline at end of file
+                return None
+            db_task = self._update_task_returning(task_id, completed=not_(func.coalesce(models.Task.completed, False)))
+            if db_task is None:
+                self.db.rollback()
+                return None
+            self._adjust_counters({db_task.task_list_id: (0, 1 if db_task.completed else -1)})
+            self.db.commit()
+            self._invalidate(task_ids=[task_id], task_list_ids=[db_task.task_list_id])
+            self._publish_task("task.toggled", db_task)
+            return db_task
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise Exception(f"Error al cambiar estado de la tarea: {e}")
\ No newline at end of file
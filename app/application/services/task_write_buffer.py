@@ -0,0 +1,191 @@
+# app/application/services/task_write_buffer.py
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set
+from app.domain.models import utc_now
+
+# Cambios pendientes de una tarea: su estado completo tal como lo verán las lecturas y las
+# columnas modificadas que el vaciado debe escribir. Los toggles no fijan `completed`: flip indica
+# un número impar de toggles, que se escribe como SET completed = NOT completed (así no se pierden
+# toggles de otros workers o de escrituras directas). Un PUT con `completed` lo fija (dirty)
+@dataclass
+class PendingTask:
+    task: Dict[str, Any]
+    dirty: Set[str] = field(default_factory=set)
+    flip: bool = False
+
+# El buffer está lleno: la petición escribe su cambio directamente (contrapresión)
+class WriteBufferFullError(Exception):
+    pass
+
+# Buffer write-behind (opcional, WRITE_BEHIND_ENABLED) de los toggles y actualizaciones de tareas.
+# Acepta los cambios en memoria por id de tarea, fusiona los cambios sucesivos de la misma tarea
+# y los escribe por lotes (writer) desde su propio hilo cada flush_interval_seconds, o antes si
+# llega a max_pending tareas pendientes: entonces despierta al hilo y rechaza las tareas nuevas
+# (WriteBufferFullError) hasta vaciarse. Las peticiones nunca escriben el lote.
+# Mientras no se escriben, las lecturas de la tarea los ven con pending()
+class TaskWriteBuffer:
+    def __init__(self, writer: Callable[[Dict[int, PendingTask]], int], flush_interval_seconds: float = 0.05, max_pending: int = 1000):
+        self.writer = writer
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self._pending: Dict[int, PendingTask] = {}
+        # Lote que se está escribiendo: sigue visible para las lecturas hasta el commit
+        self._flushing: Dict[int, PendingTask] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        # Aumenta al terminar cada vaciado: invalida estados leídos de la base de datos antes
+        self._generation = 0
+        self.merged = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.backpressure_writes = 0
+        self.failures = 0
+
+    # Estado pendiente (copia) de la tarea, o None si no tiene cambios sin escribir
+    def pending(self, task_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._pending.get(task_id) or self._flushing.get(task_id)
+            return dict(entry.task) if entry is not None else None
+
+    # Aplica un cambio a la tarea y devuelve su nuevo estado (o None si la tarea no existe).
+    # change(estado) devuelve las columnas a modificar. load() lee el estado de la base de datos y
+    # solo se usa si la tarea no tiene cambios pendientes; si un vaciado termina mientras tanto, se
+    # vuelve a leer (el estado leído podría no incluir lo que se acaba de escribir)
+    # toggle: el cambio invierte `completed` (relativo, salvo que un PUT ya lo haya fijado).
+    # WriteBufferFullError: hay max_pending tareas pendientes y esta no es una de ellas
+    def apply(self, task_id: int, load: Callable[[], Optional[Dict[str, Any]]], change: Callable[[Dict[str, Any]], Dict[str, Any]], toggle: bool = False) -> Optional[Dict[str, Any]]:
+        base, generation = None, None
+        while True:
+            with self._lock:
+                entry = self._pending.get(task_id)
+                if entry is None and len(self._pending) >= self.max_pending:
+                    self.backpressure_writes += 1
+                    self._wakeup.set()
+                    raise WriteBufferFullError("El buffer write-behind está lleno")
+                current = entry or self._flushing.get(task_id)
+                if current is not None or (base is not None and generation == self._generation):
+                    state = current.task if current is not None else base
+                    values = change(state)
+                    if entry is None:
+                        entry = self._pending[task_id] = PendingTask(dict(state))
+                    else:
+                        self.merged += 1
+                    entry.task.update(values, updated_at=utc_now())
+                    if toggle and "completed" not in entry.dirty:
+                        entry.flip = not entry.flip
+                    else:
+                        entry.dirty.update(values)
+                        if "completed" in values:
+                            entry.flip = False
+                    result = dict(entry.task)
+                    full = len(self._pending) >= self.max_pending
+                    break
+                generation = self._generation
+            base = load()
+            if base is None:
+                return None
+        self._start_flusher()
+        if full:
+            self._wakeup.set()
+        return result
+
+    # Descarta los cambios pendientes de las tareas de una lista borrada (se purgarán)
+    def discard_list(self, task_list_id: int) -> int:
+        with self._lock:
+            task_ids = [task_id for task_id, entry in self._pending.items() if entry.task["task_list_id"] == task_list_id]
+            for task_id in task_ids:
+                del self._pending[task_id]
+            return len(task_ids)
+
+    # Escribe los cambios pendientes; devuelve las tareas escritas. Si la escritura falla, los
+    # cambios vuelven al buffer (sin pisar los más recientes) y se reintentan en el siguiente vaciado
+    def flush(self, raise_errors: bool = False) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._flushing, self._pending = self._pending, {}
+            try:
+                written = self.writer(self._flushing)
+            except Exception:
+                with self._lock:
+                    for task_id, failed in self._flushing.items():
+                        newer = self._pending.get(task_id)
+                        if newer is None:
+                            self._pending[task_id] = failed
+                            continue
+                        # newer partió del estado de `failed`: sus toggles se suman a los de failed,
+                        # salvo que uno de los dos fije `completed` (entonces newer.task ya lo tiene)
+                        if "completed" in failed.dirty and "completed" not in newer.dirty:
+                            newer.flip = False
+                        elif "completed" not in newer.dirty:
+                            newer.flip ^= failed.flip
+                        newer.dirty |= failed.dirty
+                    self._flushing = {}
+                    self._generation += 1
+                    self.failures += 1
+                if raise_errors:
+                    raise
+                return 0
+            with self._lock:
+                self._flushing = {}
+                self._generation += 1
+                self.flushes += 1
+                self.rows_written += written
+            return written
+
+    # Hilo que vacía el buffer cada flush_interval_seconds; se inicia con el primer cambio
+    def _start_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._closed = False
+            self._wakeup.clear()
+            self._flusher = threading.Thread(target=self._run, name="task-write-buffer", daemon=True)
+            self._flusher.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+    # Detiene el hilo y escribe lo pendiente (al apagar la aplicación)
+    def close(self) -> int:
+        self._closed = True
+        self._wakeup.set()
+        flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+        return self.flush(raise_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": True,
+                "pending": len(self._pending),
+                "flushing": len(self._flushing),
+                "max_pending": self.max_pending,
+                "flush_interval_seconds": self.flush_interval_seconds,
+                "merged": self.merged,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "backpressure_writes": self.backpressure_writes,
+                "failures": self.failures,
+            }
+
+_buffer: Optional[TaskWriteBuffer] = None
+
+# Buffer activo, o None si el modo write-behind está desactivado (por defecto)
+def get_task_write_buffer() -> Optional[TaskWriteBuffer]:
+    return _buffer
+
+def set_task_write_buffer(buffer: Optional[TaskWriteBuffer]) -> None:
+    global _buffer
+    _buffer = buffer
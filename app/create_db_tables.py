@@ -1,12 +1,13 @@
 # app/create_db_tables.py
 
-from app.infrastructure.database.connection import engine, Base
-from domain.models import TaskList, Task
+from app.infrastructure.database.connection import engine
+from app.infrastructure.database.migrations import migrate
 
 print("Intentando crear las tablas de la base de datos...")
 
 try:
-    Base.metadata.create_all(bind=engine)
+    # Crea las tablas y los índices que falten en bases de datos existentes
+    migrate(engine)
     print("¡Tablas de la base de datos creadas exitosamente!")
 except Exception as e:
     print(f"Error al crear las tablas de la base de datos: {e}")
@@ -1,16 +1,33 @@
 # app/domain/models.py
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index, func
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 from sqlalchemy import Column, Integer, String, DateTime, func, Float # Añade func aquí
 from app.infrastructure.database.connection import Base
+from app.infrastructure.database.full_text import attach_full_text_index
+
+# Todas las marcas de tiempo se fijan en Python en UTC con microsegundos. updated_at es la versión
+# de tareas y listas (ETag): func.now() tiene resolución de segundos y dos escrituras en el mismo
+# segundo compartirían ETag; además usa la zona horaria del servidor de base de datos.
+# MySQL necesita DATETIME(6) para conservar los microsegundos
+Timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 class TaskList(Base):
     __tablename__ = "task_lists"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), index=True, nullable=False)
     description = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(Timestamp, default=utc_now, nullable=False)
+    updated_at = Column(Timestamp, default=utc_now, onupdate=utc_now, nullable=False)
+    # Contadores mantenidos por TaskService en cada escritura (completion_percentage en O(1))
+    task_count = Column(Integer, default=0, server_default="0", nullable=False)
+    completed_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Borrado lógico: la lista deja de verse al instante y sus tareas se purgan en segundo plano
+    deleted_at = Column(Timestamp, nullable=True)
     tasks = relationship("Task", back_populates="task_list")
 
 class Task(Base):
@@ -21,7 +38,33 @@ class Task(Base):
     status = Column(String(50), default="pending") # necesario el valor por defecto
     completed = Column(Boolean, default=False)
     priority = Column(Integer, default=0)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = Column(Timestamp, default=utc_now, nullable=False)
+    updated_at = Column(Timestamp, default=utc_now, onupdate=utc_now, nullable=False)
     task_list_id = Column(Integer, ForeignKey("task_lists.id"), nullable=False)
-    task_list = relationship("TaskList", back_populates="tasks")
\ No newline at end of file
+    task_list = relationship("TaskList", back_populates="tasks")
+
+    # Índices compuestos para los filtros de get_tasks_by_list_id (ordenados por id para la paginación)
+    __table_args__ = (
+        Index("ix_tasks_list_id", "task_list_id", "id"),
+        Index("ix_tasks_list_completed_priority", "task_list_id", "completed", "priority", "id"),
+        Index("ix_tasks_list_priority", "task_list_id", "priority", "id"),
+        # MAX(updated_at) por lista para las validaciones ETag sin recorrer sus tareas
+        Index("ix_tasks_list_updated_at", "task_list_id", "updated_at"),
+        # Búsqueda de texto completo (GET /tasks/search); en SQLite la sustituye la tabla FTS5
+        Index("ft_tasks_title_description", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+attach_full_text_index(Task.__table__)
+
+# Purga en segundo plano de las tareas de una lista borrada (por bloques, en transacciones cortas).
+# Sin clave foránea: el trabajo se conserva después de eliminar la fila de la lista
+class TaskListPurgeJob(Base):
+    __tablename__ = "task_list_purge_jobs"
+    id = Column(Integer, primary_key=True, index=True)
+    task_list_id = Column(Integer, nullable=False, index=True)
+    status = Column(String(20), default="pending", nullable=False, index=True) # pending, running, done, failed
+    tasks_deleted = Column(Integer, default=0, server_default="0", nullable=False)
+    error = Column(String(500), nullable=True)
+    created_at = Column(Timestamp, default=utc_now, nullable=False)
+    updated_at = Column(Timestamp, default=utc_now, onupdate=utc_now, nullable=False)
+    finished_at = Column(Timestamp, nullable=True)
@@ -0,0 +1,140 @@
+# app/infrastructure/cache.py
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.replicas import REPLICA_SESSION_INFO
+
+# Interfaz de los backends de caché.
+# Los valores son estructuras compatibles con JSON (dict/list/str/int...), de modo que un
+# backend compartido (Redis, Memcached) puede serializarlos sin conocer los schemas.
+class CacheBackend(ABC):
+    enabled = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+# Caché deshabilitada: nunca guarda nada
+class NullCache(CacheBackend):
+    enabled = False
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "null", "enabled": False}
+
+# LRU en memoria del proceso, acotada en entradas y con expiración por TTL
+class InMemoryLRUCache(CacheBackend):
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 10.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "enabled": True,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+# Configuración por despliegue:
+# CACHE_ENABLED=false la desactiva; CACHE_MAX_ENTRIES y CACHE_TTL_SECONDS la dimensionan.
+# Con varios workers cada proceso tiene su propia caché: las invalidaciones no se propagan
+# entre procesos, así que el TTL acota la desactualización (o se usa un backend compartido).
+def build_cache_from_env() -> CacheBackend:
+    settings = get_settings()
+    if not settings.cache_enabled:
+        return NullCache()
+    return InMemoryLRUCache(max_entries=settings.cache_max_entries, ttl_seconds=settings.cache_ttl_seconds)
+
+_cache: CacheBackend = build_cache_from_env()
+
+def get_cache() -> CacheBackend:
+    return _cache
+
+# Reemplaza el backend (p. ej. por uno compartido entre workers)
+def set_cache(backend: CacheBackend) -> None:
+    global _cache
+    _cache = backend
+
+# Caché de un servicio que trabaja con la sesión `db` (por defecto, la activa). Las sesiones
+# enlazadas a una réplica no la leen ni la llenan: una réplica atrasada dejaría en caché datos
+# anteriores a una escritura, que luego servirían al propio cliente en su ventana read-your-writes
+def session_cache(db: Any, cache: Optional[CacheBackend] = None) -> CacheBackend:
+    if db.info.get(REPLICA_SESSION_INFO):
+        return NullCache()
+    return cache if cache is not None else get_cache()
@@ -0,0 +1,61 @@
+# app/infrastructure/config.py
+from functools import lru_cache
+from typing import List, Literal, Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+# Configuración de la aplicación, leída de variables de entorno (o del archivo .env).
+# Cada campo se corresponde con la variable del mismo nombre en mayúsculas (p. ej. DB_POOL_SIZE)
+class Settings(BaseSettings):
+    # Base de datos
+    database_url: Optional[str] = Field(None, description="URL de la base de datos (driver síncrono).")
+    db_async: bool = Field(False, description="Atiende las peticiones con el motor asíncrono (AsyncSession).")
+    async_database_url: Optional[str] = Field(None, description="URL asíncrona; por defecto se deriva de database_url.")
+
+    # Pool de conexiones (por proceso/worker; el motor asíncrono usa su propio pool con los mismos valores)
+    db_pool_size: int = Field(5, ge=1, description="Conexiones que el pool mantiene abiertas.")
+    db_max_overflow: int = Field(10, ge=0, description="Conexiones adicionales permitidas en picos.")
+    db_pool_timeout: float = Field(30.0, gt=0, description="Segundos de espera por una conexión libre antes de fallar.")
+    db_pool_recycle: int = Field(1800, description="Segundos tras los que se recicla una conexión (-1 = nunca); menor que wait_timeout de MySQL.")
+    db_pool_pre_ping: bool = Field(True, description="Verifica la conexión al sacarla del pool (descarta conexiones caídas).")
+    # Réplicas de lectura: los GET leen de ellas; las escrituras y la ventana read-your-writes, del primario
+    db_replica_urls: Optional[str] = Field(None, description="URLs de las réplicas (síncronas), separadas por comas.")
+    db_replica_strategy: Literal["round_robin", "least_connections"] = Field("round_robin", description="Selección de réplica por lectura.")
+    db_read_your_writes_seconds: float = Field(5.0, ge=0, description="Segundos tras una escritura en que el cliente lee del primario (0 = desactivado).")
+    sql_echo: bool = Field(False, description="Registra cada sentencia SQL (solo depuración).")
+
+    # Respuestas grandes (GET /task-lists/{id}, GET /tasks/by-list/{id}, exportación NDJSON):
+    # filas Core serializadas directamente, sin validar con Pydantic
+    fast_json_responses: bool = Field(False, description="Serializa las respuestas de listados con el codificador rápido (orjson).")
+
+    # Purga de listas borradas: tareas eliminadas por transacción
+    purge_chunk_size: int = Field(1000, ge=1, description="Tareas eliminadas por bloque al purgar una lista borrada.")
+
+    # Eventos en vivo (GET /task-lists/{id}/events)
+    events_enabled: bool = Field(True, description="Publica los cambios de tareas y listas para los suscriptores SSE.")
+    events_buffer_size: int = Field(1000, ge=1, description="Eventos recientes conservados por lista para reanudar con Last-Event-ID.")
+    events_keepalive_seconds: float = Field(15.0, gt=0, description="Segundos sin eventos tras los que se envía un comentario de keep-alive.")
+    events_max_stream_seconds: float = Field(300.0, gt=0, description="Duración máxima de una conexión SSE; el cliente se reconecta con Last-Event-ID.")
+
+    # Buffer write-behind de toggles y actualizaciones de tareas (opcional): los cambios se fusionan
+    # en memoria y se escriben por lotes; un reinicio abrupto pierde lo que no se haya escrito
+    write_behind_enabled: bool = Field(False, description="Acepta toggles y PUT de tareas en memoria y los escribe por lotes.")
+    write_behind_flush_interval_seconds: float = Field(0.05, gt=0, description="Segundos entre vaciados del buffer write-behind.")
+    write_behind_max_pending: int = Field(1000, ge=1, description="Tareas pendientes que fuerzan un vaciado inmediato (contrapresión).")
+
+    # Caché de lecturas
+    cache_enabled: bool = Field(True, description="Activa la caché de lecturas en memoria.")
+    cache_max_entries: int = Field(10000, ge=1, description="Entradas máximas de la caché.")
+    cache_ttl_seconds: float = Field(10.0, gt=0, description="Vigencia de cada entrada en segundos.")
+
+    @property
+    def replica_urls(self) -> List[str]:
+        return [url.strip() for url in (self.db_replica_urls or "").split(",") if url.strip()]
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
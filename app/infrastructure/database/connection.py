@@ -1,28 +1,98 @@
 # app/infrastructure/database/connection.py
-import os
+from typing import Any, Dict
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from dotenv import load_dotenv
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.replicas import ReplicaRouter, get_replica_router, set_replica_router
+from app.infrastructure.database.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from app.infrastructure.metrics import instrument_engine
 
-# Variables de entorno del archivo .env
-load_dotenv()
+# Configuración (variables de entorno o archivo .env)
+settings = get_settings()
 
 # Obtiene la URL de la base de datos de las variables de entorno
 # DATABASE_URL definida .env
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.database_url
 
 if not DATABASE_URL:
     raise ValueError("La variable de entorno DATABASE_URL no está configurada.")
 
+# DB_ASYNC=true atiende las peticiones con el motor asíncrono (AsyncSession)
+DB_ASYNC = settings.db_async
+
+# Drivers asíncronos equivalentes a los síncronos soportados
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+# Deriva la URL asíncrona a partir de la síncrona (mismo servidor, driver asíncrono)
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+# Argumentos del pool según la configuración. SQLite en memoria usa un pool propio
+# (una conexión por hilo) que no admite estos parámetros
+def pool_options(url: str, asynchronous: bool = False) -> Dict[str, Any]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if asynchronous else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
 # Crea el motor de la base de datos de SQLAlchemy
-# echo=True muestra las sentencias SQL en la consola (depuración)
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL_ECHO=true muestra las sentencias SQL en la consola (solo depuración: es síncrono y costoso)
+engine = create_engine(DATABASE_URL, echo=settings.sql_echo, **pool_options(DATABASE_URL))
+# Cuenta las sentencias SQL y el tiempo de base de datos de cada petición (/metrics, Server-Timing)
+instrument_engine(engine)
 
 # Crea una clase SessionLocal para cada sesión de base de datos
 # autocommit=False para rollback
 # autoflush=False para no hacer flush automáticamente
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: cada llamada al servicio cierra su transacción y los objetos
+# devueltos se serializan después sin volver a consultarse
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Motor y sesiones asíncronas (solo se crean en modo asíncrono)
+# ASYNC_DATABASE_URL permite indicar la URL explícitamente
+async_engine = None
+AsyncSessionLocal = None
+if DB_ASYNC:
+    ASYNC_DATABASE_URL = settings.async_database_url or to_async_url(DATABASE_URL)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=settings.sql_echo, **pool_options(ASYNC_DATABASE_URL, asynchronous=True))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    instrument_engine(async_engine.sync_engine)
+
+# Réplicas de lectura (DB_REPLICA_URLS); en modo asíncrono se usan sus URLs asíncronas
+replica_engines = []
+for replica_url in settings.replica_urls:
+    if DB_ASYNC:
+        replica_url = to_async_url(replica_url)
+        replica = create_async_engine(replica_url, echo=settings.sql_echo, **pool_options(replica_url, asynchronous=True))
+        instrument_engine(replica.sync_engine)
+    else:
+        replica = create_engine(replica_url, echo=settings.sql_echo, **pool_options(replica_url))
+        instrument_engine(replica)
+    replica_engines.append(replica)
+set_replica_router(ReplicaRouter(
+    async_engine if DB_ASYNC else engine,
+    replica_engines,
+    strategy=settings.db_replica_strategy,
+    read_your_writes_seconds=settings.db_read_your_writes_seconds,
+))
 
 # Base declarativa para tus modelos ORM
 Base = declarative_base()
@@ -33,4 +103,34 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependencia para obtener una sesión asíncrona de base de datos
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependencias de solo lectura: sesión enlazada a la réplica que elija el router
+# (o al primario si no hay réplicas o el cliente escribió hace poco)
+def get_read_db(request: Request):
+    router = get_replica_router()
+    bind = router.acquire(prefer_primary=router.in_read_your_writes_window(request.cookies))
+    db = SessionLocal(**router.session_options(bind))
+    try:
+        yield db
+    finally:
+        db.close()
+        router.release(bind)
+
+async def get_async_read_db(request: Request):
+    router = get_replica_router()
+    bind = router.acquire(prefer_primary=router.in_read_your_writes_window(request.cookies))
+    try:
+        async with AsyncSessionLocal(**router.session_options(bind)) as db:
+            yield db
+    finally:
+        router.release(bind)
+
+# Dependencias usadas por los routers según el modo configurado
+get_session = get_async_db if DB_ASYNC else get_db
+get_read_session = get_async_read_db if DB_ASYNC else get_read_db
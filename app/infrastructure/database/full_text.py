@@ -0,0 +1,48 @@
+# app/infrastructure/database/full_text.py
+import re
+from typing import Optional
+from sqlalchemy import DDL, Table, event, inspect
+from sqlalchemy.engine import Engine
+
+# Índice de texto completo de las tareas (título y descripción).
+# MySQL: índice FULLTEXT declarado en el modelo (Index(..., mysql_prefix="FULLTEXT")).
+# SQLite: tabla virtual FTS5 de contenido externo sobre `tasks`, mantenida por triggers; así
+# cualquier escritura (ORM, INSERT/UPDATE/DELETE masivos, importaciones) actualiza el índice
+FTS_TABLE = "tasks_fts"
+
+SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+)
+
+# Crea la tabla FTS5 y sus triggers junto con la tabla de tareas (create_all/drop_all)
+def attach_full_text_index(table: Table) -> None:
+    for statement in SQLITE_FTS_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"))
+
+# Bases de datos SQLite existentes: crea el índice y lo llena con las tareas actuales
+# (en MySQL el índice FULLTEXT lo crea ensure_indexes)
+def ensure_full_text_index(engine: Engine) -> None:
+    if engine.dialect.name != "sqlite" or inspect(engine).has_table(FTS_TABLE):
+        return
+    with engine.begin() as conn:
+        for statement in SQLITE_FTS_DDL:
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+# Convierte el texto del usuario en una consulta FTS5 segura: cada palabra entre comillas
+# (sin operadores ni sintaxis de columnas) y la última como prefijo, para buscar mientras se escribe.
+# Devuelve None si el texto no tiene palabras
+def fts5_query(text: str) -> Optional[str]:
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms) + "*"
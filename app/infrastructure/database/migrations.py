@@ -0,0 +1,57 @@
+# app/infrastructure/database/migrations.py
+from typing import Set, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+from app.infrastructure.database.connection import Base
+from app.domain import models # Registra los modelos en Base.metadata
+from app.infrastructure.database.full_text import ensure_full_text_index
+
+# create_all no modifica tablas existentes: las columnas nuevas se agregan con ALTER TABLE.
+# Devuelve las (tabla, columna) agregadas
+def ensure_columns(engine: Engine) -> Set[Tuple[str, str]]:
+    inspector = inspect(engine)
+    added = set()
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                    added.add((table.name, column.name))
+    return added
+
+# MySQL: las marcas de tiempo (models.Timestamp) creadas como DATETIME pasan a DATETIME(6)
+def ensure_timestamp_precision(engine: Engine) -> None:
+    if engine.dialect.name != "mysql":
+        return
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.type is not models.Timestamp or getattr(existing[column.name]["type"], "fsp", None) == 6:
+                    continue
+                nullability = "NULL" if column.nullable else "NOT NULL"
+                conn.exec_driver_sql(f"ALTER TABLE {table.name} MODIFY {column.name} DATETIME(6) {nullability}")
+
+# create_all no modifica tablas existentes: los índices nuevos se crean aparte
+def ensure_indexes(engine: Engine) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+# Lleva el esquema de una base de datos (nueva o existente) a la versión de los modelos
+def migrate(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    added = ensure_columns(engine)
+    ensure_timestamp_precision(engine)
+    ensure_indexes(engine)
+    ensure_full_text_index(engine)
+    # Los contadores recién agregados parten de 0: se calculan desde las tareas existentes
+    if {("task_lists", "task_count"), ("task_lists", "completed_count")} & added:
+        from app.application.services.task_list_service import TaskListService
+        with Session(bind=engine) as db:
+            TaskListService(db).recompute_counters()
@@ -0,0 +1,112 @@
+# app/infrastructure/database/replicas.py
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Cookie con el instante (epoch) hasta el que las lecturas del cliente van al primario
+READ_PRIMARY_COOKIE = "db_read_primary_until"
+
+REPLICA_STRATEGIES = ("round_robin", "least_connections")
+
+# Clave de Session.info que marca las sesiones enlazadas a una réplica
+REPLICA_SESSION_INFO = "read_replica"
+
+# Métodos que no modifican datos: no activan la lectura desde el primario
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Reparte las sesiones de lectura entre las réplicas (round-robin o menos conexiones en uso).
+# Sin réplicas, o durante la ventana de read-your-writes de un cliente, lee del primario.
+# Los motores pueden ser síncronos o asíncronos: el router solo elige a cuál enlazar la sesión
+class ReplicaRouter:
+    def __init__(self, primary: Any, replicas: Sequence[Any] = (), strategy: str = "round_robin", read_your_writes_seconds: float = 5.0):
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Estrategia de réplicas desconocida: {strategy}")
+        self.primary = primary
+        self.replicas: List[Any] = list(replicas)
+        self.strategy = strategy
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+        self._in_use = [0] * len(self.replicas)
+        self._reads = [0] * len(self.replicas)
+        self._primary_reads = 0
+
+    # Elige el motor de una sesión de lectura; cada elección se libera con release()
+    def acquire(self, prefer_primary: bool = False) -> Any:
+        with self._lock:
+            if prefer_primary or not self.replicas:
+                self._primary_reads += 1
+                return self.primary
+            if self.strategy == "least_connections":
+                # En empate gana la siguiente en turno, para no cargar siempre la primera
+                start = next(self._next)
+                count = len(self.replicas)
+                index = min(((start + offset) % count for offset in range(count)), key=lambda i: self._in_use[i])
+            else:
+                index = next(self._next) % len(self.replicas)
+            self._in_use[index] += 1
+            self._reads[index] += 1
+            return self.replicas[index]
+
+    # Opciones de la sesión de lectura enlazada a `bind` (marca las de réplicas)
+    def session_options(self, bind: Any) -> Dict[str, Any]:
+        return {"bind": bind, "info": {REPLICA_SESSION_INFO: bind is not self.primary}}
+
+    def release(self, engine: Any) -> None:
+        with self._lock:
+            for index, replica in enumerate(self.replicas):
+                if replica is engine:
+                    self._in_use[index] -= 1
+                    return
+
+    # El cliente escribió hace menos de read_your_writes_seconds (cookie puesta por ReadYourWritesMiddleware)
+    def in_read_your_writes_window(self, cookies: Dict[str, str]) -> bool:
+        try:
+            return float(cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "strategy": self.strategy,
+                "read_your_writes_seconds": self.read_your_writes_seconds,
+                "primary_reads": self._primary_reads,
+                "replicas": [
+                    {"url": replica.url.render_as_string(hide_password=True), "in_use": in_use, "reads": reads}
+                    for replica, in_use, reads in zip(self.replicas, self._in_use, self._reads)
+                ],
+            }
+
+_router: Optional[ReplicaRouter] = None
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    return _router
+
+# Permite reemplazar el router (p. ej. en pruebas con varias bases SQLite)
+def set_replica_router(router: Optional[ReplicaRouter]) -> None:
+    global _router
+    _router = router
+
+# Middleware ASGI: tras una escritura correcta marca al cliente con una cookie para que sus
+# lecturas vayan al primario durante read_your_writes_seconds (evita leer de una réplica atrasada).
+# Solo actúa si hay réplicas configuradas
+class ReadYourWritesMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        router = get_replica_router()
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or router is None or not router.replicas or router.read_your_writes_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                seconds = router.read_your_writes_seconds
+                cookie = f"{READ_PRIMARY_COOKIE}={time.time() + seconds:.3f}; Max-Age={int(seconds + 0.999)}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
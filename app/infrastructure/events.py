@@ -0,0 +1,204 @@
+# app/infrastructure/events.py
+import asyncio
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from app.infrastructure.config import get_settings
+
+# Evento publicado en un canal. id crece en todo el proceso (y entre reinicios: parte del reloj),
+# así un cliente puede reanudar con el último id recibido (Last-Event-ID).
+# type "reset": se perdieron eventos y el cliente debe volver a leer el estado completo
+@dataclass
+class Event:
+    id: int
+    type: str
+    data: Any
+
+RESET_EVENT = "reset"
+
+# Interfaz de los brokers de eventos (pub/sub por canal).
+# Los datos son estructuras compatibles con JSON, de modo que un backend compartido entre
+# workers (Redis pub/sub, NATS) puede transportarlos sin conocer los schemas
+class EventBroker(ABC):
+    enabled = True
+
+    # Publica un evento; se llama desde el código síncrono de los servicios (threadpool o run_sync)
+    @abstractmethod
+    def publish(self, channel: str, event_type: str, data: Any) -> None:
+        ...
+
+    # Suscribe al canal desde el event loop actual. Con last_event_id entrega antes los eventos
+    # posteriores que el broker conserve (o un "reset" si ya no los tiene)
+    @abstractmethod
+    def subscribe(self, channel: str, last_event_id: Optional[int] = None) -> "Subscription":
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, subscription: "Subscription") -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+# Suscripción de un cliente: cola acotada en su event loop. Si el cliente no consume a tiempo y la
+# cola se llena, los eventos siguientes se descartan y el próximo get() devuelve un "reset"
+class Subscription:
+    def __init__(self, broker: "EventBroker", channel: str, backlog: List[Event], max_queue: int):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.last_id = 0
+        self._lost = False
+        for event in backlog:
+            self._deliver(event)
+
+    # Se ejecuta en el event loop de la suscripción
+    def _deliver(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._lost = True
+            self.last_id = max(self.last_id, event.id)
+
+    # Siguiente evento, o None si no llega ninguno en `timeout` segundos
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        if self._lost:
+            # Se descartan los eventos encolados: el cliente vuelve a leer el estado completo
+            while not self.queue.empty():
+                self.last_id = max(self.last_id, self.queue.get_nowait().id)
+            self._lost = False
+            return Event(self.last_id, RESET_EVENT, None)
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.last_id = max(self.last_id, event.id)
+        return event
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+# Canal del broker en memoria: últimos eventos (para reanudar) y suscriptores
+class _Channel:
+    def __init__(self, buffer_size: int, dropped_through: int):
+        self.events: "deque[Event]" = deque(maxlen=buffer_size)
+        self.subscribers: set = set()
+        # Id más alto que el canal ya no conserva: reanudar desde antes requiere un "reset"
+        self.dropped_through = dropped_through
+
+# Broker en memoria del proceso: un búfer circular de buffer_size eventos por canal y, como
+# mucho, max_channels canales (se descartan los menos recientes sin suscriptores)
+class InMemoryEventBroker(EventBroker):
+    def __init__(self, buffer_size: int = 1000, max_channels: int = 10000):
+        self.buffer_size = buffer_size
+        self.max_channels = max_channels
+        self._channels: "OrderedDict[str, _Channel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(time.time_ns() // 1000)
+        self._last_id = next(self._ids)
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def _channel(self, name: str) -> _Channel:
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _Channel(self.buffer_size, self._last_id)
+            for old_name in list(self._channels):
+                if len(self._channels) <= self.max_channels:
+                    break
+                if not self._channels[old_name].subscribers:
+                    del self._channels[old_name]
+        self._channels.move_to_end(name)
+        return channel
+
+    def publish(self, channel: str, event_type: str, data: Any) -> None:
+        with self._lock:
+            target = self._channel(channel)
+            event = Event(next(self._ids), event_type, data)
+            self._last_id = event.id
+            if len(target.events) == target.events.maxlen:
+                target.dropped_through = target.events[0].id
+            target.events.append(event)
+            subscribers = list(target.subscribers)
+            self.published += 1
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError: # event loop cerrado: el cliente ya no existe
+                self.unsubscribe(subscription)
+                with self._lock:
+                    self.dropped_subscribers += 1
+
+    def subscribe(self, channel: str, last_event_id: Optional[int] = None) -> Subscription:
+        with self._lock:
+            target = self._channel(channel)
+            if last_event_id is None:
+                backlog = []
+            elif last_event_id < target.dropped_through or last_event_id > self._last_id:
+                # Eventos ya descartados (o de otro proceso/arranque): no se puede reanudar sin huecos
+                backlog = [Event(self._last_id, RESET_EVENT, None)]
+            else:
+                backlog = [event for event in target.events if event.id > last_event_id]
+            subscription = Subscription(self, channel, backlog, max_queue=self.buffer_size + 1)
+            target.subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            channel = self._channels.get(subscription.channel)
+            if channel is not None:
+                channel.subscribers.discard(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "enabled": True,
+                "channels": len(self._channels),
+                "subscribers": sum(len(channel.subscribers) for channel in self._channels.values()),
+                "buffer_size": self.buffer_size,
+                "published": self.published,
+                "dropped_subscribers": self.dropped_subscribers,
+            }
+
+# Eventos deshabilitados: no publica nada y las suscripciones nunca reciben eventos
+class NullEventBroker(EventBroker):
+    enabled = False
+
+    def publish(self, channel: str, event_type: str, data: Any) -> None:
+        pass
+
+    def subscribe(self, channel: str, last_event_id: Optional[int] = None) -> Subscription:
+        return Subscription(self, channel, [], max_queue=1)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "null", "enabled": False}
+
+# Configuración por despliegue:
+# EVENTS_ENABLED=false desactiva la publicación; EVENTS_BUFFER_SIZE dimensiona el búfer por canal.
+# Con varios workers cada proceso tiene su propio broker: un cliente solo recibe los eventos de las
+# escrituras atendidas por su worker, así que se reemplaza por un backend compartido (set_event_broker)
+def build_event_broker_from_env() -> EventBroker:
+    settings = get_settings()
+    if not settings.events_enabled:
+        return NullEventBroker()
+    return InMemoryEventBroker(buffer_size=settings.events_buffer_size)
+
+_broker: EventBroker = build_event_broker_from_env()
+
+def get_event_broker() -> EventBroker:
+    return _broker
+
+# Reemplaza el backend (p. ej. por uno compartido entre workers)
+def set_event_broker(broker: EventBroker) -> None:
+    global _broker
+    _broker = broker
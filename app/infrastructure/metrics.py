@@ -0,0 +1,177 @@
+# app/infrastructure/metrics.py
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Límites de los histogramas (formato Prometheus: cada bucket acumula los valores <= le)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Ruta usada cuando la petición no coincide con ningún endpoint (evita una serie por URL)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Consultas SQL y tiempo en base de datos de la petición en curso.
+# Es un objeto mutable: el threadpool y run_sync copian el contexto, pero comparten esta instancia
+class RequestDBStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+def current_request_db_stats() -> Optional[RequestDBStats]:
+    return _request_db_stats.get()
+
+# Registra en el motor los eventos que cuentan sentencias y tiempo de base de datos por petición.
+# Para un motor asíncrono se registra sobre su sync_engine
+def instrument_engine(engine: Engine) -> None:
+    if getattr(engine, "_request_metrics_instrumented", False):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+
+    # Una sentencia fallida no llega a after_cursor_execute
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
+
+    engine._request_metrics_instrumented = True
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+# Métricas HTTP del proceso: latencia, estados y consultas SQL por ruta.
+# Las etiquetas usan la plantilla de la ruta (/tasks/{task_id}), no la URL concreta
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._latency: Dict[Tuple[str, str], _Histogram] = {}
+        self._queries: Dict[Tuple[str, str], _Histogram] = {}
+        self._db_time: Dict[Tuple[str, str], float] = {}
+
+    def observe(self, method: str, route: str, status_code: int, duration: float, db_stats: RequestDBStats) -> None:
+        key = (method, route)
+        with self._lock:
+            status_key = (method, route, str(status_code))
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            self._latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(duration)
+            self._queries.setdefault(key, _Histogram(QUERY_COUNT_BUCKETS)).observe(db_stats.queries)
+            self._db_time[key] = self._db_time.get(key, 0.0) + db_stats.db_time
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._latency.clear()
+            self._queries.clear()
+            self._db_time.clear()
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        escaped = (
+            f'{name}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+            for name, value in labels.items()
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    def _render_histogram(self, lines: List[str], name: str, histograms: Dict[Tuple[str, str], _Histogram]) -> None:
+        for (method, route), histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bucket, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{self._labels(method=method, route=route, le=str(bucket))} {cumulative}")
+            lines.append(f"{name}_bucket{self._labels(method=method, route=route, le='+Inf')} {histogram.count}")
+            lines.append(f"{name}_sum{self._labels(method=method, route=route)} {histogram.total}")
+            lines.append(f"{name}_count{self._labels(method=method, route=route)} {histogram.count}")
+
+    # Exposición en formato de texto de Prometheus (versión 0.0.4)
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# HELP http_requests_total Peticiones HTTP atendidas por ruta y código de estado.")
+            lines.append("# TYPE http_requests_total counter")
+            for (method, route, status_code), count in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{self._labels(method=method, route=route, status=status_code)} {count}")
+            lines.append("# HELP http_request_duration_seconds Latencia de las peticiones HTTP por ruta.")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            self._render_histogram(lines, "http_request_duration_seconds", self._latency)
+            lines.append("# HELP http_request_db_queries Sentencias SQL ejecutadas por petición.")
+            lines.append("# TYPE http_request_db_queries histogram")
+            self._render_histogram(lines, "http_request_db_queries", self._queries)
+            lines.append("# HELP http_request_db_seconds_total Tiempo acumulado en la base de datos por ruta.")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (method, route), db_time in sorted(self._db_time.items()):
+                lines.append(f"http_request_db_seconds_total{self._labels(method=method, route=route)} {db_time}")
+        return "\n".join(lines) + "\n"
+
+_registry = MetricsRegistry()
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _registry
+
+# Middleware ASGI: mide cada petición HTTP, cuenta sus sentencias SQL y añade la cabecera
+# Server-Timing (consultas y tiempo de base de datos hasta el inicio de la respuesta)
+class MetricsMiddleware:
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry if registry is not None else get_metrics_registry()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = RequestDBStats()
+        token = _request_db_stats.set(db_stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                server_timing = (
+                    f'db;dur={db_stats.db_time * 1000:.3f};desc="{db_stats.queries} queries", '
+                    f"app;dur={(time.perf_counter() - start) * 1000:.3f}"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", server_timing.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_db_stats.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.observe(scope["method"], route_path, status_code, time.perf_counter() - start, db_stats)
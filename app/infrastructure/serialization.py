@@ -0,0 +1,22 @@
+# app/infrastructure/serialization.py
+import json
+from datetime import date, datetime
+from typing import Any
+
+# Codificador JSON de las respuestas rápidas (FAST_JSON_RESPONSES) y de la exportación NDJSON.
+# Usa orjson si está instalado (serializa datetime en C, sin default en Python); si no, la
+# biblioteca estándar con el mismo formato compacto y las fechas en ISO 8601
+try:
+    import orjson
+except ImportError: # dependencia opcional
+    orjson = None
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+def json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode()
@@ -1,22 +1,69 @@
 # app/main.py
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
-from app.infrastructure.database.connection import engine, Base, get_db
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.infrastructure.config import get_settings
+from app.infrastructure.database.connection import DB_ASYNC, AsyncSessionLocal, SessionLocal, engine, get_db
+from app.infrastructure.database.migrations import migrate
 from app.api.task_list_router import router as task_list_router_instance
 from app.api.task_router import router as task_router_instance # Importa el router de tareas
+from app.api.internal_router import router as internal_router_instance
+from app.infrastructure.metrics import MetricsMiddleware, get_metrics_registry
+from app.infrastructure.database.replicas import ReadYourWritesMiddleware
+from app.application.services.task_service import task_write_buffer_writer
+from app.application.services.task_list_purge_service import resume_purge_jobs
+from app.application.services.task_write_buffer import TaskWriteBuffer, get_task_write_buffer, set_task_write_buffer
 
-# Asegura que las tablas existen si se levanta la app sin ejecutar el script externo
-Base.metadata.create_all(bind=engine)
+# Asegura que las tablas e índices existen si se levanta la app sin ejecutar el script externo
+migrate(engine)
+
+# WRITE_BEHIND_ENABLED=true: toggles y actualizaciones de tareas por el buffer write-behind
+# (se vacía con el motor síncrono también en modo asíncrono, desde su propio hilo)
+settings = get_settings()
+if settings.write_behind_enabled:
+    set_task_write_buffer(TaskWriteBuffer(
+        task_write_buffer_writer(SessionLocal),
+        flush_interval_seconds=settings.write_behind_flush_interval_seconds,
+        max_pending=settings.write_behind_max_pending,
+    ))
+
+# Al arrancar, reanuda las purgas de listas sin terminar; al apagar, las detiene (se reanudan en
+# el siguiente arranque) y escribe los cambios pendientes del buffer write-behind
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    purges = await resume_purge_jobs(AsyncSessionLocal if DB_ASYNC else SessionLocal, settings.purge_chunk_size)
+    yield
+    for purge in purges:
+        purge.cancel()
+    await asyncio.gather(*purges, return_exceptions=True)
+    write_buffer = get_task_write_buffer()
+    if write_buffer is not None:
+        await run_in_threadpool(write_buffer.close)
 
 app = FastAPI(
     title="Tasks API Crehana",
     description="API para gestionar listas de tareas",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Latencia, códigos de estado y consultas SQL por ruta; cabecera Server-Timing en cada respuesta
+app.add_middleware(MetricsMiddleware)
+# Tras una escritura, las lecturas del cliente van al primario durante unos segundos (si hay réplicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Incluye routers
 app.include_router(task_list_router_instance, prefix="/task-lists")
 app.include_router(task_router_instance, prefix="/tasks")
+app.include_router(internal_router_instance, prefix="/internal")
 
 @app.get("/")
 async def root():
-    return {"message": "Hello, FastAPI! Application is running."}
\ No newline at end of file
+    return {"message": "Hello, FastAPI! Application is running."}
+
+# Métricas del proceso en formato de texto de Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(get_metrics_registry().render(), media_type="text/plain; version=0.0.4; charset=utf-8")
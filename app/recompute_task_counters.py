@@ -0,0 +1,19 @@
+# app/recompute_task_counters.py
+# Repara los contadores task_count/completed_count de las listas a partir de la tabla de tareas.
+# Uso: python app/recompute_task_counters.py [task_list_id ...]
+import sys
+from app.infrastructure.database.connection import SessionLocal
+from app.application.services.task_list_service import TaskListService
+
+task_list_ids = [int(arg) for arg in sys.argv[1:]] or None
+
+print("Recalculando los contadores de las listas de tareas...")
+
+db = SessionLocal()
+try:
+    total = TaskListService(db).recompute_counters(task_list_ids)
+    print(f"¡Contadores recalculados para {total} listas!")
+except Exception as e:
+    print(f"Error al recalcular los contadores: {e}")
+finally:
+    db.close()
@@ -36,11 +36,29 @@ class TaskListResponse(TaskListBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    task_count: int = Field(0, description="Número de tareas de la lista.")
+    completed_count: int = Field(0, description="Número de tareas completadas de la lista.")
     completion_percentage: float = Field(0.0, description="Porcentaje de tareas completadas en la lista.")
 
     class Config:
         from_attributes = True # Permite que Pydantic lea de instancias ORM
 
 # Schema para incluir tareas dentro de TaskListResponse (para relaciones)
+# Las tareas son una página: tasks_total y tasks_next_cursor permiten recorrer el resto
 class TaskListResponseWithTasks(TaskListResponse):
-    tasks: List[TaskResponseForList] = [] # Una lista de TaskResponse
\ No newline at end of file
+    tasks: List[TaskResponseForList] = [] # Una lista de TaskResponse
+    tasks_total: int = Field(0, description="Tareas de la lista que cumplen los filtros.")
+    tasks_next_cursor: Optional[str] = Field(None, description="Cursor (tasks_cursor) de la siguiente página de tareas.")
+# Schema del trabajo de purga de una lista borrada (DELETE /task-lists/{id} y su endpoint de estado)
+class TaskListPurgeJobResponse(BaseModel):
+    id: int
+    task_list_id: int
+    status: str = Field(..., description="pending, running, done o failed.")
+    tasks_deleted: int = Field(0, description="Tareas eliminadas hasta el momento.")
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
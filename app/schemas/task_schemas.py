@@ -1,7 +1,16 @@
 # app/schemas/task_schemas.py
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+# Máximo de tareas aceptadas en una sola petición de creación masiva
+BULK_CREATE_MAX_ITEMS = 10000
+
+# Importación en streaming: tareas insertadas (y confirmadas) por bloque y errores detallados en la respuesta
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 1000
+# Caracteres máximos de una línea (o de un registro CSV de varias líneas) de la importación
+IMPORT_MAX_LINE_LENGTH = 65536
 
 # Schema base para Task (atributos básicos para creación y actualización)
 class TaskBase(BaseModel):
@@ -35,4 +44,61 @@ class TaskResponse(TaskBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True # Pydantic lea de instancias ORM
\ No newline at end of file
+        from_attributes = True # Pydantic lea de instancias ORM
+
+# Schema para la creación masiva de tareas
+# Cada elemento se valida por separado contra TaskCreate para reportar errores por item
+# (Any: un item que no es un objeto también es un error de su posición, no un 422 de toda la petición)
+class TaskBulkCreate(BaseModel):
+    items: List[Any] = Field(..., min_length=1, max_length=BULK_CREATE_MAX_ITEMS, description="Tareas a crear, con el formato de TaskCreate.")
+
+# Error de un elemento de una operación masiva (index = posición en items)
+class TaskBulkItemError(BaseModel):
+    index: int
+    detail: str
+
+# Schema de respuesta de la creación masiva
+class TaskBulkCreateResponse(BaseModel):
+    created_ids: List[int] = Field([], description="IDs creados, en el orden de los items válidos.")
+    errors: List[TaskBulkItemError] = Field([], description="Items que no se crearon y el motivo.")
+
+# Selección de tareas para operaciones masivas: por ids, por filtro o ambos (se combinan con AND)
+class TaskSelection(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=BULK_CREATE_MAX_ITEMS, description="IDs de las tareas.")
+    task_list_id: Optional[int] = Field(None, description="Filtra por lista de tareas.")
+    completed: Optional[bool] = Field(None, description="Filtra por estado de completitud.")
+    priority: Optional[int] = Field(None, ge=0, le=2, description="Filtra por prioridad.")
+
+    # Evita operaciones sobre la tabla completa por omisión
+    @model_validator(mode="after")
+    def check_scope(self):
+        if self.ids is None and self.task_list_id is None:
+            raise ValueError("Debe indicar ids o task_list_id")
+        return self
+
+# Schema para la actualización masiva: selección + cambios a aplicar
+class TaskBulkUpdate(TaskSelection):
+    changes: TaskUpdate
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if not self.changes.model_dump(exclude_unset=True):
+            raise ValueError("Debe indicar al menos un cambio")
+        return self
+
+# Schema de respuesta de las operaciones masivas de actualización/eliminación
+class TaskBulkResult(BaseModel):
+    affected: int = Field(..., description="Número de tareas afectadas.")
+# Error de una línea de una importación (line = número de línea del archivo, desde 1)
+class TaskImportLineError(BaseModel):
+    line: int
+    detail: str
+
+# Schema de respuesta de la importación en streaming
+class TaskImportResponse(BaseModel):
+    processed: int = Field(0, description="Registros leídos del archivo.")
+    created: int = Field(0, description="Tareas creadas.")
+    failed: int = Field(0, description="Registros rechazados.")
+    chunks_committed: int = Field(0, description="Bloques insertados y confirmados.")
+    errors: List[TaskImportLineError] = Field([], description=f"Primeros {IMPORT_MAX_REPORTED_ERRORS} registros rechazados y el motivo.")
+    errors_truncated: bool = Field(False, description="Indica si hubo más errores que los reportados.")
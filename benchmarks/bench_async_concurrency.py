@@ -0,0 +1,83 @@
+# benchmarks/bench_async_concurrency.py
+"""
+Compara el throughput de la API en modo síncrono (threadpool + pymysql) y asíncrono
+(DB_ASYNC=true, AsyncSession) con muchas peticiones concurrentes.
+
+Cada modo corre en un subproceso porque el modo se elige al importar la aplicación.
+Por defecto usa un archivo SQLite temporal; con --database-url se puede apuntar a MySQL.
+
+Uso: python -m benchmarks.bench_async_concurrency [--concurrency 200] [--requests 2000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+def run_worker(args) -> None:
+    import httpx
+    from sqlalchemy import insert
+    from app.main import app
+    from app.domain import models
+    from app.infrastructure.database import connection
+
+    # El log de SQL en stdout distorsiona la medición
+    connection.engine.echo = False
+    if connection.async_engine is not None:
+        connection.async_engine.echo = False
+
+    with connection.engine.begin() as conn:
+        conn.execute(models.Task.__table__.delete())
+        conn.execute(models.TaskList.__table__.delete())
+        conn.execute(insert(models.TaskList), [{"id": i, "title": f"Lista {i}"} for i in range(1, 11)])
+        conn.execute(insert(models.Task), [
+            {"title": f"Tarea {j}", "completed": j % 2 == 0, "task_list_id": 1 + j % 10} for j in range(500)
+        ])
+
+    async def main() -> dict:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def one(i: int) -> None:
+                async with semaphore:
+                    path = f"/task-lists/{1 + i % 10}" if i % 2 else f"/tasks/by-list/{1 + i % 10}?limit=20"
+                    response = await client.get(path)
+                    response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.requests)))
+            elapsed = time.perf_counter() - start
+        return {"requests": args.requests, "seconds": elapsed, "rps": args.requests / elapsed}
+
+    print(json.dumps(asyncio.run(main())))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"concurrencia={args.concurrency} peticiones={args.requests}")
+        for mode, db_async in (("síncrono", "false"), ("asíncrono", "true")):
+            env = dict(os.environ, DATABASE_URL=database_url, DB_ASYNC=db_async)
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_async_concurrency", "--worker",
+                 "--concurrency", str(args.concurrency), "--requests", str(args.requests)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>10}: {result['rps']:8.1f} req/s ({result['seconds']:.2f} s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_completion_percentage.py
+"""
+Compara la latencia de GET /task-lists/ (TaskListService.get_all_task_lists) a medida que
+crece el número de tareas por lista: contadores en task_lists frente a la carga con joinedload.
+
+Uso: python -m benchmarks.bench_completion_percentage [--sizes 10 100 1000 5000]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import joinedload, sessionmaker
+from app.infrastructure.database.connection import Base
+from app.domain import models
+from app.application.services.task_list_service import TaskListService
+
+LISTS = 20
+
+def seed(engine, tasks_per_list: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.TaskList), [{"title": f"Lista {i}"} for i in range(LISTS)])
+        rows = [
+            {"title": f"Tarea {j}", "completed": j % 3 == 0, "priority": j % 3, "task_list_id": i + 1}
+            for i in range(LISTS)
+            for j in range(tasks_per_list)
+        ]
+        for start in range(0, len(rows), 10_000):
+            conn.execute(insert(models.Task), rows[start:start + 10_000])
+    with sessionmaker(bind=engine)() as db:
+        TaskListService(db).recompute_counters()
+
+# Ruta anterior: hidrata todas las tareas de cada lista y cuenta en Python
+def legacy_get_all_task_lists(db):
+    task_lists = db.query(models.TaskList).options(joinedload(models.TaskList.tasks)).limit(LISTS).all()
+    for task_list in task_lists:
+        total = len(task_list.tasks)
+        completed = sum(1 for task in task_list.tasks if task.completed)
+        task_list.completion_percentage = (completed / total) * 100.0 if total else 0.0
+    return task_lists
+
+def bench(engine, repeat: int, fn) -> float:
+    SessionTest = sessionmaker(bind=engine)
+    timings = []
+    for _ in range(repeat):
+        with SessionTest() as db:
+            start = time.perf_counter()
+            fn(db)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        print(f"{'tareas/lista':>14} {'tareas totales':>16} {'contadores (ms)':>20} {'joinedload (ms)':>18}")
+        for size in args.sizes:
+            seed(engine, size)
+            counters = bench(engine, args.repeat, lambda db: TaskListService(db).get_all_task_lists(skip=0, limit=LISTS))
+            legacy = bench(engine, args.repeat, legacy_get_all_task_lists)
+            print(f"{size:>14} {size * LISTS:>16} {counters * 1000:>20.2f} {legacy * 1000:>18.2f}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/compare.py
+"""
+Compara dos archivos de resultados de la suite de benchmarks (pytest benchmarks --bench-json ...).
+
+Marca como regresión cualquier aumento de consultas SQL y las operaciones cuya mediana crece
+más que --threshold (proporción) y más que --min-delta-ms (para ignorar el ruido de las
+operaciones de pocos milisegundos). Termina con código 1 si hay regresiones.
+
+Uso: python -m benchmarks.compare base.json nuevo.json [--threshold 1.25] [--min-delta-ms 1.0]
+"""
+import argparse
+import json
+import sys
+
+def load_cases(path: str) -> dict:
+    with open(path) as file:
+        results = json.load(file)
+    return {(case["name"], case["size"]): case for case in results["cases"]}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    base, new = load_cases(args.base), load_cases(args.new)
+    regressions = 0
+    print(f"{'operación':<55} {'tareas':>7} {'base ms':>9} {'nuevo ms':>9} {'ratio':>6} {'consultas':>10}")
+    for key in sorted(base.keys() | new.keys()):
+        name, size = key
+        if key not in base or key not in new:
+            print(f"{name:<55} {size:>7} {'(solo en ' + ('nuevo' if key in new else 'base') + ')':>26}")
+            continue
+        before, after = base[key], new[key]
+        ratio = after["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        slower = ratio > args.threshold and after["median_ms"] - before["median_ms"] > args.min_delta_ms
+        more_queries = after["queries"] > before["queries"]
+        mark = "  <-- regresión" if slower or more_queries else ""
+        regressions += bool(mark)
+        queries = f"{before['queries']}->{after['queries']}"
+        print(f"{name:<55} {size:>7} {before['median_ms']:>9.2f} {after['median_ms']:>9.2f} {ratio:>6.2f} {queries:>10}{mark}")
+    print(f"\n{regressions} regresiones")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
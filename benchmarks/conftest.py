@@ -0,0 +1,194 @@
+# benchmarks/conftest.py
+"""
+Suite de benchmarks reproducible de los endpoints y servicios.
+
+Cada prueba corre sobre datasets sembrados en SQLite (archivo temporal), uno por tamaño de la
+lista principal, mide la mediana y el p95 de varias repeticiones y verifica un presupuesto de
+sentencias SQL por operación: un N+1 o una consulta que crece con los datos falla aunque el
+tiempo siga siendo aceptable. Los resultados se guardan en JSON para compararlos entre commits
+con `python -m benchmarks.compare`.
+
+Uso: pytest benchmarks -p no:cacheprovider [--bench-sizes 10,1000,10000,100000] [--bench-json ruta]
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# La aplicación crea su motor al importarse: se apunta a una base desechable, nunca a la configurada
+_APP_DB_DIR = tempfile.mkdtemp(prefix="bench-app-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_APP_DB_DIR, 'app.db')}"
+os.environ["SQL_ECHO"] = "false"
+
+import pytest
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from app.domain import models
+from app.main import app
+from app.infrastructure.cache import NullCache, get_cache, set_cache
+from app.infrastructure.database.connection import Base, get_read_session, get_session
+from app.application.services.task_list_service import TaskListService
+
+DEFAULT_SIZES = "10,1000,10000"
+DEFAULT_REPEAT = 7
+# Listas adicionales del dataset (para que los filtros por lista descarten filas)
+OTHER_LISTS = 5
+OTHER_LIST_TASKS = 200
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-sizes", default=DEFAULT_SIZES, help="Tareas de la lista principal de cada dataset, separadas por comas.")
+    group.addoption("--bench-repeat", type=int, default=DEFAULT_REPEAT, help="Repeticiones medidas de cada operación.")
+    group.addoption("--bench-json", default="benchmark-results.json", help="Archivo JSON de resultados.")
+
+def pytest_generate_tests(metafunc):
+    if "dataset" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--bench-sizes").split(",")]
+        metafunc.parametrize("dataset", sizes, indirect=True, scope="session", ids=[f"{size}tasks" for size in sizes])
+
+# Dataset sembrado: la lista principal (id 1) con `size` tareas, OTHER_LISTS listas menores y una
+# lista auxiliar (vacía) donde las pruebas crean tareas, para que la principal conserve su tamaño
+class Dataset:
+    def __init__(self, size: int, engine):
+        self.size = size
+        self.engine = engine
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+        self.task_list_id = 1
+        self.scratch_list_id = OTHER_LISTS + 2
+        self.queries = 0
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def count_query(*args):
+            self.queries += 1
+
+    def seed(self) -> None:
+        Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(insert(models.TaskList), [{"title": f"Lista {index}"} for index in range(OTHER_LISTS + 2)])
+            rows = [
+                {"title": f"Tarea {index}", "completed": index % 2 == 0, "priority": index % 3, "task_list_id": 1}
+                for index in range(self.size)
+            ] + [
+                {"title": f"Otra {index}", "completed": False, "priority": index % 3, "task_list_id": list_id}
+                for list_id in range(2, OTHER_LISTS + 2)
+                for index in range(OTHER_LIST_TASKS)
+            ]
+            for start in range(0, len(rows), 10_000):
+                conn.execute(insert(models.Task), rows[start:start + 10_000])
+        with self.SessionLocal() as db:
+            TaskListService(db).recompute_counters()
+
+    def task_ids(self, limit: int):
+        with self.engine.connect() as conn:
+            table = models.Task.__table__
+            query = sqlalchemy.select(table.c.id).where(table.c.task_list_id == self.task_list_id).order_by(table.c.id).limit(limit)
+            return conn.execute(query).scalars().all()
+
+@pytest.fixture(scope="session")
+def dataset(request, tmp_path_factory):
+    size = request.param
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('bench') / f'bench_{size}.db'}")
+    data = Dataset(size, engine)
+    data.seed()
+    yield data
+    engine.dispose()
+
+# Sin caché de lecturas: se mide el coste real de cada consulta
+@pytest.fixture(scope="session", autouse=True)
+def disable_read_cache():
+    previous = get_cache()
+    set_cache(NullCache())
+    yield
+    set_cache(previous)
+
+@pytest.fixture
+def client(dataset: Dataset):
+    # Una sesión por petición, como en producción
+    def override_get_session():
+        db = dataset.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides = {}
+
+class BenchmarkResults:
+    def __init__(self):
+        self.cases = []
+
+    def add(self, case: dict) -> None:
+        self.cases.append(case)
+
+_results = BenchmarkResults()
+
+# Mide `call` (tras una ejecución de calentamiento) y verifica el presupuesto de consultas.
+# `setup` prepara cada repetición fuera de la medición y su resultado se pasa a `call`
+class Bench:
+    def __init__(self, dataset: Dataset, repeat: int, results: BenchmarkResults):
+        self.dataset = dataset
+        self.repeat = repeat
+        self.results = results
+
+    def __call__(self, name: str, call, max_queries: int, setup=None, repeat: int = None):
+        timings, queries = [], []
+        for iteration in range((repeat or self.repeat) + 1):
+            argument = setup() if setup is not None else None
+            queries_before = self.dataset.queries
+            start = time.perf_counter()
+            result = call(argument) if setup is not None else call()
+            elapsed = time.perf_counter() - start
+            if hasattr(result, "status_code"):
+                assert result.status_code < 400, f"{name}: {result.status_code} {result.text[:200]}"
+            if iteration:
+                timings.append(elapsed)
+                queries.append(self.dataset.queries - queries_before)
+        timings.sort()
+        case = {
+            "name": name,
+            "size": self.dataset.size,
+            "repeat": len(timings),
+            "median_ms": round(statistics.median(timings) * 1000, 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+            "min_ms": round(timings[0] * 1000, 3),
+            "queries": max(queries),
+            "max_queries": max_queries,
+        }
+        self.results.add(case)
+        assert case["queries"] <= max_queries, f"{name}: {case['queries']} consultas, presupuesto {max_queries}"
+        return case
+
+@pytest.fixture
+def bench(dataset: Dataset, request) -> Bench:
+    return Bench(dataset, request.config.getoption("--bench-repeat"), _results)
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results.cases:
+        return
+    output = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "cases": sorted(_results.cases, key=lambda case: (case["name"], case["size"])),
+    }
+    path = session.config.getoption("--bench-json")
+    with open(path, "w") as file:
+        json.dump(output, file, indent=2)
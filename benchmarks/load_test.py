@@ -0,0 +1,201 @@
+# benchmarks/load_test.py
+"""
+Generador de carga asíncrono: reproduce una mezcla configurable de peticiones contra la API y
+reporta throughput y latencias p50/p95/p99 por endpoint.
+
+Por defecto ataca una instancia en marcha (--base-url); con --in-process llama a la aplicación
+directamente por ASGI (sin red, con la base de datos de DATABASE_URL). Antes de empezar descubre
+listas y tareas existentes (p. ej. creadas con `python -m benchmarks.seed`).
+
+Mezcla (--mix, pesos relativos):
+  lists   GET /task-lists/?limit=50 (con cursor aleatorio)
+  by_list GET /tasks/by-list/{id}?limit=50
+  toggle  PATCH /tasks/{id}/toggle-completion
+  create  POST /tasks/
+
+Uso: python -m benchmarks.load_test --base-url http://localhost:8000 --duration 60 --concurrency 64 \\
+         --mix lists=20,by_list=60,toggle=10,create=10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List
+import httpx
+
+ENDPOINTS = {
+    "lists": "GET /task-lists/",
+    "by_list": "GET /tasks/by-list/{id}",
+    "toggle": "PATCH /tasks/{id}/toggle-completion",
+    "create": "POST /tasks/",
+}
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Operación desconocida: {name} (válidas: {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight)
+    if not sum(mix.values()):
+        raise argparse.ArgumentTypeError("La suma de los pesos debe ser positiva")
+    return mix
+
+# Percentil por rango más cercano sobre latencias ordenadas
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.task_list_ids: List[int] = []
+        self.task_ids: List[int] = []
+        self.list_cursors: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    # Recorre las listas por cursor y toma una muestra de tareas de cada una
+    async def discover(self) -> None:
+        cursor = None
+        while len(self.task_list_ids) < self.args.sample_lists:
+            params = {"limit": 100}
+            if cursor:
+                params["after"] = cursor
+                self.list_cursors.append(cursor)
+            response = await self.client.get("/task-lists/", params=params)
+            response.raise_for_status()
+            self.task_list_ids.extend(task_list["id"] for task_list in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        if not self.task_list_ids:
+            raise SystemExit("No hay listas de tareas: siembre datos con `python -m benchmarks.seed`.")
+        for task_list_id in self.rng.sample(self.task_list_ids, min(len(self.task_list_ids), 50)):
+            response = await self.client.get(f"/tasks/by-list/{task_list_id}", params={"limit": 100})
+            response.raise_for_status()
+            self.task_ids.extend(task["id"] for task in response.json())
+
+    async def request(self, operation: str) -> None:
+        if operation == "lists":
+            params = {"limit": 50}
+            if self.list_cursors and self.rng.random() < 0.5:
+                params["after"] = self.rng.choice(self.list_cursors)
+            call = self.client.get("/task-lists/", params=params)
+        elif operation == "by_list":
+            call = self.client.get(f"/tasks/by-list/{self.rng.choice(self.task_list_ids)}", params={"limit": 50})
+        elif operation == "toggle" and self.task_ids:
+            call = self.client.patch(f"/tasks/{self.rng.choice(self.task_ids)}/toggle-completion")
+        else:
+            operation = "create"
+            call = self.client.post("/tasks/", json={"title": "Tarea de carga", "task_list_id": self.rng.choice(self.task_list_ids)})
+
+        start = time.perf_counter()
+        try:
+            response = await call
+            failed = response.status_code >= 400
+            if operation == "create" and not failed:
+                self.task_ids.append(response.json()["id"])
+        except httpx.HTTPError:
+            failed = True
+        self.latencies[operation].append(time.perf_counter() - start)
+        if failed:
+            self.errors[operation] += 1
+
+    async def worker(self, deadline: float, remaining: List[int]) -> None:
+        operations, weights = zip(*self.args.mix.items())
+        while time.perf_counter() < deadline:
+            if remaining[0] is not None:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            await self.request(self.rng.choices(operations, weights=weights)[0])
+
+    async def run(self) -> dict:
+        await self.discover()
+        if self.args.warmup:
+            warmup_deadline = time.perf_counter() + self.args.warmup
+            await asyncio.gather(*(self.worker(warmup_deadline, [None]) for _ in range(self.args.concurrency)))
+            self.latencies.clear()
+            self.errors.clear()
+
+        remaining = [self.args.requests]
+        start = time.perf_counter()
+        deadline = start + self.args.duration if self.args.duration else float("inf")
+        await asyncio.gather(*(self.worker(deadline, remaining) for _ in range(self.args.concurrency)))
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        all_latencies = []
+        for operation, latencies in sorted(self.latencies.items()):
+            latencies.sort()
+            all_latencies.extend(latencies)
+            endpoints[ENDPOINTS[operation]] = self._summary(latencies, self.errors[operation], elapsed)
+        all_latencies.sort()
+        return {
+            "seconds": round(elapsed, 3),
+            "concurrency": self.args.concurrency,
+            "total": self._summary(all_latencies, sum(self.errors.values()), elapsed),
+            "endpoints": endpoints,
+        }
+
+    @staticmethod
+    def _summary(latencies: List[float], errors: int, elapsed: float) -> dict:
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+
+def print_report(result: dict) -> None:
+    print(f"{result['seconds']} s, concurrencia {result['concurrency']}")
+    print(f"{'endpoint':<40} {'peticiones':>10} {'errores':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    rows = list(result["endpoints"].items()) + [("total", result["total"])]
+    for name, stats in rows:
+        print(f"{name:<40} {stats['requests']:>10} {stats['errors']:>8} {stats['rps']:>8} {stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}")
+
+async def main_async(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.in_process:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout)
+    async with client:
+        return await LoadTest(client, args).run()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="Llama a la aplicación por ASGI, sin servidor.")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("lists=20,by_list=60,toggle=10,create=10"))
+    parser.add_argument("--concurrency", type=int, default=32, help="Peticiones simultáneas.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Segundos de medición (0 = hasta --requests).")
+    parser.add_argument("--requests", type=int, default=None, help="Detiene la prueba tras N peticiones.")
+    parser.add_argument("--warmup", type=float, default=0.0, help="Segundos de calentamiento no medidos.")
+    parser.add_argument("--sample-lists", type=int, default=1000, help="Listas a descubrir antes de empezar.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", default=None, help="Guarda el reporte en este archivo JSON.")
+    args = parser.parse_args()
+    if not args.duration and not args.requests:
+        parser.error("Indique --duration o --requests")
+
+    result = asyncio.run(main_async(args))
+    print_report(result)
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(result, file, indent=2)
+
+if __name__ == "__main__":
+    main()
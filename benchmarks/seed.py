@@ -0,0 +1,117 @@
+# benchmarks/seed.py
+"""
+Genera datos sintéticos en la base de datos configurada (DATABASE_URL) para pruebas de carga.
+
+Las tareas por lista siguen una distribución configurable: fija, uniforme entre --min-tasks y
+--max-tasks, o "pareto" (pocas listas concentran muchas tareas, como en producción). Cada lista
+recibe su propio porcentaje de completitud alrededor de --completion-ratio y las prioridades se
+sortean con los pesos de --priority-weights. Las filas se insertan por bloques con INSERT
+multi-fila y los contadores de cada lista se escriben ya calculados, sin recorrer las tareas.
+
+Uso: python -m benchmarks.seed --lists 10000 --tasks-per-list 200 --distribution pareto
+"""
+import argparse
+import random
+import time
+from typing import Iterator, List
+from sqlalchemy import func, insert, select
+from app.domain import models
+from app.infrastructure.database.connection import engine
+from app.infrastructure.database.migrations import migrate
+
+def tasks_per_list(args, rng: random.Random) -> Iterator[int]:
+    for _ in range(args.lists):
+        if args.distribution == "fixed":
+            count = args.tasks_per_list
+        elif args.distribution == "uniform":
+            count = rng.randint(args.min_tasks, args.max_tasks)
+        else:
+            # Pareto con media tasks_per_list: (alpha - 1) / alpha * media es el mínimo de la cola
+            alpha = args.pareto_alpha
+            count = int(rng.paretovariate(alpha) * args.tasks_per_list * (alpha - 1) / alpha)
+        yield max(args.min_tasks, min(args.max_tasks, count))
+
+def parse_weights(value: str) -> List[float]:
+    weights = [float(weight) for weight in value.split(",")]
+    if len(weights) != 3 or any(weight < 0 for weight in weights) or not sum(weights):
+        raise argparse.ArgumentTypeError("Se esperan tres pesos no negativos: baja,media,alta")
+    return weights
+
+def seed(args) -> None:
+    rng = random.Random(args.seed)
+    tasks_table = models.Task.__table__
+    lists_table = models.TaskList.__table__
+    migrate(engine)
+    with engine.begin() as conn:
+        if args.truncate:
+            conn.execute(tasks_table.delete())
+            conn.execute(lists_table.delete())
+        next_list_id = (conn.execute(select(func.max(lists_table.c.id))).scalar() or 0) + 1
+
+    start = time.perf_counter()
+    total_tasks = 0
+    list_rows, task_rows = [], []
+
+    # Inserta las listas pendientes antes que sus tareas (clave foránea)
+    def flush(force: bool = False) -> None:
+        nonlocal list_rows, task_rows
+        if not force and len(task_rows) < args.batch_size:
+            return
+        with engine.begin() as conn:
+            if list_rows:
+                conn.execute(insert(lists_table), list_rows)
+            if task_rows:
+                conn.execute(insert(tasks_table), task_rows)
+        list_rows, task_rows = [], []
+
+    for index, count in enumerate(tasks_per_list(args, rng)):
+        task_list_id = next_list_id + index
+        ratio = min(1.0, max(0.0, rng.gauss(args.completion_ratio, args.completion_spread)))
+        completed_count = 0
+        for position in range(count):
+            completed = rng.random() < ratio
+            completed_count += completed
+            task_rows.append({
+                "title": f"Tarea {position} de la lista {task_list_id}",
+                "completed": completed,
+                "status": "done" if completed else "pending",
+                "priority": rng.choices((0, 1, 2), weights=args.priority_weights)[0],
+                "task_list_id": task_list_id,
+            })
+        list_rows.append({
+            "id": task_list_id,
+            "title": f"Lista {task_list_id}",
+            "task_count": count,
+            "completed_count": completed_count,
+        })
+        total_tasks += count
+        flush()
+        if args.progress and (index + 1) % args.progress == 0:
+            print(f"{index + 1} listas, {total_tasks} tareas ({time.perf_counter() - start:.1f} s)")
+    flush(force=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"Creadas {args.lists} listas y {total_tasks} tareas en {elapsed:.1f} s ({total_tasks / elapsed if elapsed else 0:.0f} tareas/s)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lists", type=int, default=1000, help="Listas a crear.")
+    parser.add_argument("--distribution", choices=("fixed", "uniform", "pareto"), default="pareto", help="Distribución de tareas por lista.")
+    parser.add_argument("--tasks-per-list", type=int, default=100, help="Tareas por lista (fija) o media (pareto).")
+    parser.add_argument("--min-tasks", type=int, default=0)
+    parser.add_argument("--max-tasks", type=int, default=100_000)
+    parser.add_argument("--pareto-alpha", type=float, default=1.5, help="Forma de la cola (menor = más sesgada, > 1).")
+    parser.add_argument("--completion-ratio", type=float, default=0.4, help="Proporción media de tareas completadas.")
+    parser.add_argument("--completion-spread", type=float, default=0.25, help="Desviación de la proporción entre listas.")
+    parser.add_argument("--priority-weights", type=parse_weights, default=[0.6, 0.3, 0.1], help="Pesos de prioridad baja,media,alta.")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Tareas por transacción.")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (mismos argumentos = mismos datos).")
+    parser.add_argument("--truncate", action="store_true", help="Vacía las tablas antes de sembrar.")
+    parser.add_argument("--progress", type=int, default=1000, help="Informa cada N listas (0 = nunca).")
+    args = parser.parse_args()
+    if args.distribution == "pareto" and args.pareto_alpha <= 1:
+        parser.error("--pareto-alpha debe ser mayor que 1")
+    seed(args)
+
+if __name__ == "__main__":
+    main()
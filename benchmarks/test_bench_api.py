@@ -0,0 +1,179 @@
+# benchmarks/test_bench_api.py
+# Latencia y consultas SQL de cada endpoint (a través de la aplicación completa)
+import itertools
+import json
+import pytest
+
+_counter = itertools.count()
+
+def test_create_task_list(client, bench):
+    bench("POST /task-lists/", lambda: client.post("/task-lists/", json={"title": f"Nueva {next(_counter)}"}), max_queries=2)
+
+def test_read_all_task_lists(client, bench):
+    bench("GET /task-lists/", lambda: client.get("/task-lists/", params={"limit": 100}), max_queries=1)
+
+def test_read_task_list(client, bench, dataset):
+    # ETag, fila de la lista y primera página de tareas (acotada: no crece con la lista)
+    bench("GET /task-lists/{id}", lambda: client.get(f"/task-lists/{dataset.task_list_id}"), max_queries=3)
+
+def test_read_task_list_not_modified(client, bench, dataset):
+    etag = client.get(f"/task-lists/{dataset.task_list_id}").headers["ETag"]
+    bench(
+        "GET /task-lists/{id} (If-None-Match)",
+        lambda: client.get(f"/task-lists/{dataset.task_list_id}", headers={"If-None-Match": etag}),
+        max_queries=1,
+    )
+
+def test_update_task_list(client, bench, dataset):
+    bench("PUT /task-lists/{id}", lambda: client.put(f"/task-lists/{dataset.task_list_id}", json={"title": "Lista 0"}), max_queries=2)
+
+def test_delete_task_list(client, bench):
+    # Marca y trabajo de purga; la purga (en segundo plano, que TestClient ejecuta antes de
+    # devolver la respuesta) lee el trabajo y las tareas y elimina la lista
+    bench(
+        "DELETE /task-lists/{id}",
+        lambda task_list_id: client.delete(f"/task-lists/{task_list_id}"),
+        setup=lambda: client.post("/task-lists/", json={"title": "Borrable"}).json()["id"],
+        max_queries=7,
+    )
+
+def _list_with_tasks(client, count):
+    task_list_id = client.post("/task-lists/", json={"title": "Borrable grande"}).json()["id"]
+    client.post("/tasks/bulk", json={"items": [{"title": f"Tarea {index}", "task_list_id": task_list_id} for index in range(count)]})
+    return task_list_id
+
+def test_delete_large_task_list(client, bench):
+    # Un bloque de PURGE_CHUNK_SIZE (1000) tareas más el bloque final que elimina la lista
+    bench(
+        "DELETE /task-lists/{id} (1000 tareas)",
+        lambda task_list_id: client.delete(f"/task-lists/{task_list_id}"),
+        setup=lambda: _list_with_tasks(client, 1000),
+        max_queries=11,
+        repeat=3,
+    )
+
+def test_export_task_list(client, bench, dataset):
+    bench("GET /task-lists/{id}/export", lambda: client.get(f"/task-lists/{dataset.task_list_id}/export"), max_queries=2, repeat=3)
+
+def test_import_task_list(client, bench):
+    body = "\n".join(json.dumps({"title": f"Importada {index}", "priority": index % 3}) for index in range(100)).encode()
+    bench(
+        "POST /task-lists/{id}/import (100 líneas)",
+        lambda task_list_id: client.post(f"/task-lists/{task_list_id}/import", content=body),
+        setup=lambda: client.post("/task-lists/", json={"title": "Importación"}).json()["id"],
+        max_queries=3,
+    )
+
+def test_create_task(client, bench, dataset):
+    bench("POST /tasks/", lambda: client.post("/tasks/", json={"title": "Nueva", "task_list_id": dataset.scratch_list_id}), max_queries=4)
+
+def test_create_tasks_bulk(client, bench, dataset):
+    items = [{"title": f"Masiva {index}", "task_list_id": dataset.scratch_list_id} for index in range(100)]
+    bench("POST /tasks/bulk (100 tareas)", lambda: client.post("/tasks/bulk", json={"items": items}), max_queries=3)
+
+def test_read_task(client, bench, dataset):
+    task_id = dataset.task_ids(1)[0]
+    bench("GET /tasks/{id}", lambda: client.get(f"/tasks/{task_id}"), max_queries=1)
+
+def test_read_tasks_by_list(client, bench, dataset):
+    bench("GET /tasks/by-list/{id}", lambda: client.get(f"/tasks/by-list/{dataset.task_list_id}", params={"limit": 100}), max_queries=1)
+
+def test_read_tasks_by_list_filtered(client, bench, dataset):
+    bench(
+        "GET /tasks/by-list/{id}?completed&priority",
+        lambda: client.get(f"/tasks/by-list/{dataset.task_list_id}", params={"completed": True, "priority": 2, "limit": 100}),
+        max_queries=1,
+    )
+
+def test_read_tasks_by_list_sparse(client, bench, dataset):
+    bench(
+        "GET /tasks/by-list/{id}?fields=title,completed",
+        lambda: client.get(f"/tasks/by-list/{dataset.task_list_id}", params={"fields": "title,completed", "limit": 100}),
+        max_queries=1,
+    )
+
+def test_read_tasks_by_list_deep_cursor(client, bench, dataset):
+    # Página cercana al final de la lista: con keyset no depende de la posición
+    ids = dataset.task_ids(dataset.size)
+    from app.application.pagination import encode_id_cursor
+    cursor = encode_id_cursor(ids[max(0, len(ids) - 101)])
+    bench(
+        "GET /tasks/by-list/{id}?after (última página)",
+        lambda: client.get(f"/tasks/by-list/{dataset.task_list_id}", params={"after": cursor, "limit": 100}),
+        max_queries=1,
+    )
+
+def test_update_task(client, bench, dataset):
+    task_id = dataset.task_ids(1)[0]
+    bench("PUT /tasks/{id}", lambda: client.put(f"/tasks/{task_id}", json={"title": "Editada", "completed": True}), max_queries=2)
+
+def test_toggle_task_completion(client, bench, dataset):
+    task_id = dataset.task_ids(1)[0]
+    bench("PATCH /tasks/{id}/toggle-completion", lambda: client.patch(f"/tasks/{task_id}/toggle-completion"), max_queries=2)
+
+def test_delete_task(client, bench, dataset):
+    bench(
+        "DELETE /tasks/{id}",
+        lambda task_id: client.delete(f"/tasks/{task_id}"),
+        setup=lambda: client.post("/tasks/", json={"title": "Borrable", "task_list_id": dataset.scratch_list_id}).json()["id"],
+        max_queries=2,
+    )
+
+def test_bulk_toggle_by_list(client, bench, dataset):
+    bench(
+        "PATCH /tasks/bulk/toggle-completion (lista completa)",
+        lambda: client.patch("/tasks/bulk/toggle-completion", json={"task_list_id": dataset.task_list_id}),
+        max_queries=3,
+        repeat=2,
+    )
+
+def test_bulk_update_by_ids(client, bench, dataset):
+    ids = dataset.task_ids(100)
+    bench("PATCH /tasks/bulk (100 ids)", lambda: client.patch("/tasks/bulk", json={"ids": ids, "changes": {"priority": 1}}), max_queries=2)
+
+def test_bulk_delete_by_ids(client, bench, dataset):
+    items = [{"title": f"Borrable {index}", "task_list_id": dataset.scratch_list_id} for index in range(100)]
+    bench(
+        "DELETE /tasks/bulk (100 ids)",
+        lambda ids: client.request("DELETE", "/tasks/bulk", json={"ids": ids}),
+        setup=lambda: client.post("/tasks/bulk", json={"items": items}).json()["created_ids"],
+        max_queries=3,
+    )
+
+def test_search_tasks(client, bench, dataset):
+    bench("GET /tasks/search?q", lambda: client.get("/tasks/search", params={"q": "tarea 7", "limit": 20}), max_queries=1)
+
+# Ruta rápida (FAST_JSON_RESPONSES): mismas respuestas serializadas desde filas Core sin Pydantic
+@pytest.fixture
+def fast_json(monkeypatch):
+    from app.infrastructure.config import get_settings
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+
+def test_read_task_list_fast_json(client, bench, dataset, fast_json):
+    bench("GET /task-lists/{id} (FAST_JSON)", lambda: client.get(f"/task-lists/{dataset.task_list_id}"), max_queries=3)
+
+def test_read_tasks_by_list_fast_json(client, bench, dataset, fast_json):
+    bench(
+        "GET /tasks/by-list/{id} (FAST_JSON)",
+        lambda: client.get(f"/tasks/by-list/{dataset.task_list_id}", params={"limit": 100}),
+        max_queries=1,
+    )
+
+def test_export_task_list_fast_json(client, bench, dataset, fast_json):
+    bench("GET /task-lists/{id}/export (FAST_JSON)", lambda: client.get(f"/task-lists/{dataset.task_list_id}/export"), max_queries=2, repeat=3)
+
+# Buffer write-behind (WRITE_BEHIND_ENABLED): el toggle se fusiona en memoria y solo la primera
+# vez lee la tarea; el lote se escribe fuera de la petición (aquí, al terminar la prueba)
+@pytest.fixture
+def write_behind(dataset):
+    from app.application.services.task_service import task_write_buffer_writer
+    from app.application.services.task_write_buffer import TaskWriteBuffer, set_task_write_buffer
+    write_buffer = TaskWriteBuffer(task_write_buffer_writer(dataset.SessionLocal), flush_interval_seconds=60)
+    set_task_write_buffer(write_buffer)
+    yield write_buffer
+    write_buffer.close()
+    set_task_write_buffer(None)
+
+def test_toggle_task_completion_write_behind(client, bench, dataset, write_behind):
+    task_id = dataset.task_ids(1)[0]
+    bench("PATCH /tasks/{id}/toggle-completion (WRITE_BEHIND)", lambda: client.patch(f"/tasks/{task_id}/toggle-completion"), max_queries=1)
@@ -0,0 +1,51 @@
+# benchmarks/test_bench_services.py
+# Latencia y consultas SQL de los métodos de los servicios (sin la capa HTTP)
+import pytest
+from app.application.services.task_list_service import TaskListService
+from app.application.services.task_service import TaskService
+from app.schemas import task_schemas
+
+@pytest.fixture
+def db(dataset):
+    session = dataset.SessionLocal()
+    yield session
+    session.close()
+
+def test_task_service_get_task(db, bench, dataset):
+    task_id = dataset.task_ids(1)[0]
+    bench("TaskService.get_task", lambda: TaskService(db).get_task(task_id), max_queries=1)
+
+def test_task_service_get_tasks_by_list_id(db, bench, dataset):
+    bench("TaskService.get_tasks_by_list_id", lambda: TaskService(db).get_tasks_by_list_id(dataset.task_list_id, limit=100), max_queries=1)
+
+def test_task_service_get_tasks_by_list_etag(db, bench, dataset):
+    bench("TaskService.get_tasks_by_list_etag", lambda: TaskService(db).get_tasks_by_list_etag(dataset.task_list_id, limit=100), max_queries=1)
+
+def test_task_service_create_task(db, bench, dataset):
+    task = task_schemas.TaskCreate(title="Nueva", task_list_id=dataset.scratch_list_id)
+    bench("TaskService.create_task", lambda: TaskService(db).create_task(task), max_queries=3)
+
+def test_task_service_create_tasks(db, bench, dataset):
+    tasks = [task_schemas.TaskCreate(title=f"Masiva {index}", task_list_id=dataset.scratch_list_id) for index in range(1000)]
+    bench("TaskService.create_tasks (1000 tareas)", lambda: TaskService(db).create_tasks(tasks), max_queries=2)
+
+def test_task_service_toggle_task_completion(db, bench, dataset):
+    task_id = dataset.task_ids(1)[0]
+    bench("TaskService.toggle_task_completion", lambda: TaskService(db).toggle_task_completion(task_id), max_queries=2)
+
+def test_task_service_update_task(db, bench, dataset):
+    task_id = dataset.task_ids(1)[0]
+    update = task_schemas.TaskUpdate(priority=2)
+    bench("TaskService.update_task", lambda: TaskService(db).update_task(task_id, update), max_queries=1)
+
+def test_task_list_service_get_task_list(db, bench, dataset):
+    bench("TaskListService.get_task_list", lambda: TaskListService(db).get_task_list(dataset.task_list_id), max_queries=2)
+
+def test_task_list_service_get_all_task_lists(db, bench):
+    bench("TaskListService.get_all_task_lists", lambda: TaskListService(db).get_all_task_lists(limit=100), max_queries=1)
+
+def test_task_list_service_get_task_list_etag(db, bench, dataset):
+    bench("TaskListService.get_task_list_etag", lambda: TaskListService(db).get_task_list_etag(dataset.task_list_id), max_queries=1)
+
+def test_task_list_service_recompute_counters(db, bench, dataset):
+    bench("TaskListService.recompute_counters", lambda: TaskListService(db).recompute_counters([dataset.task_list_id]), max_queries=1)
@@ -4,7 +4,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.main import app
-from app.infrastructure.database.connection import Base, get_db
+from app.infrastructure.database.connection import Base, get_db, get_read_session, get_session
+from app.infrastructure.cache import get_cache
+from app.infrastructure.metrics import instrument_engine
 import os
 from dotenv import load_dotenv
 
@@ -18,9 +20,11 @@ SQLALCHEMY_DATABASE_URL_TEST = os.getenv("DATABASE_URL")
 engine_test = create_engine(
     SQLALCHEMY_DATABASE_URL_TEST
 )
+# Las consultas de las pruebas también cuentan para /metrics y Server-Timing
+instrument_engine(engine_test)
 
 # Sesión local para las pruebas
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine_test)
 
 @pytest.fixture(name="db_session")
 def db_session_fixture():
@@ -29,6 +33,8 @@ def db_session_fixture():
     # base de datos de PRUEBA!!!!!!
     Base.metadata.drop_all(bind=engine_test)
     Base.metadata.create_all(bind=engine_test)
+    # La caché de lecturas no debe conservar datos de la prueba anterior
+    get_cache().clear()
 
     db = TestingSessionLocal()
     try:
@@ -47,6 +53,8 @@ def client_fixture(db_session: Session):
             db_session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     # Limpia las sobrescrituras después de la prueba
@@ -0,0 +1,80 @@
+# tests/test_async_mode.py
+# Ejecuta los endpoints con una AsyncSession (modo DB_ASYNC) sobre la base de datos de prueba
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.main import app
+from app.infrastructure.database.connection import get_read_session, get_session, to_async_url
+from tests.conftest import SQLALCHEMY_DATABASE_URL_TEST
+
+@pytest.fixture(name="async_client")
+def async_client_fixture(db_session: Session):
+    # db_session deja las tablas recreadas; NullPool evita compartir conexiones entre event loops
+    async_engine_test = create_async_engine(to_async_url(SQLALCHEMY_DATABASE_URL_TEST), poolclass=NullPool)
+
+    async def override_get_async_db():
+        async with AsyncSession(async_engine_test, autoflush=False, expire_on_commit=False) as db:
+            yield db
+
+    app.dependency_overrides[get_session] = override_get_async_db
+    app.dependency_overrides[get_read_session] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides = {}
+
+def test_to_async_url():
+    assert to_async_url("mysql+pymysql://user:secret@db:3306/crehana_db") == "mysql+aiomysql://user:secret@db:3306/crehana_db"
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+def test_async_task_flow(async_client: TestClient):
+    """
+    Prueba el ciclo completo de listas y tareas atendido con AsyncSession.
+    """
+    list_response = async_client.post("/task-lists/", json={"title": "Lista asíncrona"})
+    assert list_response.status_code == 201
+    list_id = list_response.json()["id"]
+
+    task_response = async_client.post("/tasks/", json={"title": "Tarea asíncrona", "task_list_id": list_id})
+    assert task_response.status_code == 201
+    task_id = task_response.json()["id"]
+
+    toggle_response = async_client.patch(f"/tasks/{task_id}/toggle-completion")
+    assert toggle_response.status_code == 200
+    assert toggle_response.json()["completed"] is True
+
+    detail_response = async_client.get(f"/task-lists/{list_id}")
+    assert detail_response.status_code == 200
+    assert detail_response.json()["completion_percentage"] == 100.0
+    assert [task["id"] for task in detail_response.json()["tasks"]] == [task_id]
+
+    by_list_response = async_client.get(f"/tasks/by-list/{list_id}", params={"completed": True})
+    assert [task["id"] for task in by_list_response.json()] == [task_id]
+
+    assert async_client.delete(f"/tasks/{task_id}").status_code == 204
+    assert async_client.get(f"/tasks/{task_id}").status_code == 404
+
+def test_async_export_streams_tasks(async_client: TestClient):
+    """
+    Prueba la exportación NDJSON sobre el cursor del driver asíncrono.
+    """
+    list_id = async_client.post("/task-lists/", json={"title": "Lista asíncrona"}).json()["id"]
+    async_client.post("/tasks/bulk", json={"items": [{"title": f"Tarea {index}", "task_list_id": list_id} for index in range(3)]})
+
+    response = async_client.get(f"/task-lists/{list_id}/export")
+    assert response.status_code == 200
+    assert [line.count('"title"') for line in response.text.splitlines()] == [1, 1, 1]
+
+def test_async_task_list_purge(async_client: TestClient):
+    """
+    Prueba el borrado de una lista con su purga en segundo plano sobre AsyncSession.
+    """
+    list_id = async_client.post("/task-lists/", json={"title": "Lista asíncrona"}).json()["id"]
+    async_client.post("/tasks/bulk", json={"items": [{"title": f"Tarea {index}", "task_list_id": list_id} for index in range(3)]})
+
+    response = async_client.delete(f"/task-lists/{list_id}")
+    assert response.status_code == 202
+    job = async_client.get(f"/task-lists/purge-jobs/{response.json()['id']}").json()
+    assert (job["status"], job["tasks_deleted"]) == ("done", 3)
+    assert async_client.get(f"/task-lists/{list_id}").status_code == 404
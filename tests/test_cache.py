@@ -0,0 +1,63 @@
+# tests/test_cache.py
+import time
+from fastapi.testclient import TestClient
+from app.infrastructure.cache import InMemoryLRUCache, NullCache, get_cache
+
+def test_lru_evicts_least_recently_used():
+    cache = InMemoryLRUCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1 # "a" pasa a ser la más reciente
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (3, 1, 1, 2)
+
+def test_entries_expire_after_ttl():
+    cache = InMemoryLRUCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("a", {"id": 1})
+    assert cache.get("a") == {"id": 1}
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_null_cache_never_stores():
+    cache = NullCache()
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["enabled"] is False
+
+def test_reads_are_cached_and_writes_invalidate(client: TestClient):
+    list_id = client.post("/task-lists/", json={"title": "Lista cacheada"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea cacheada", "task_list_id": list_id}).json()["id"]
+
+    # Segunda lectura servida desde la caché
+    client.get(f"/tasks/{task_id}")
+    hits = get_cache().stats()["hits"]
+    assert client.get(f"/tasks/{task_id}").json()["completed"] is False
+    assert get_cache().stats()["hits"] == hits + 1
+
+    # Cada escritura invalida la tarea y la lista que la embebe
+    client.get(f"/task-lists/{list_id}")
+    client.patch(f"/tasks/{task_id}/toggle-completion")
+    assert client.get(f"/tasks/{task_id}").json()["completed"] is True
+    assert client.get(f"/task-lists/{list_id}").json()["tasks"][0]["completed"] is True
+
+    client.patch("/tasks/bulk", json={"ids": [task_id], "changes": {"title": "Renombrada"}})
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Renombrada"
+    assert client.get(f"/task-lists/{list_id}").json()["tasks"][0]["title"] == "Renombrada"
+
+    client.put(f"/task-lists/{list_id}", json={"title": "Lista renombrada"})
+    assert client.get(f"/task-lists/{list_id}").json()["title"] == "Lista renombrada"
+
+    client.delete(f"/tasks/{task_id}")
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+    assert client.get(f"/task-lists/{list_id}").json()["tasks"] == []
+
+def test_cache_stats_endpoint(client: TestClient):
+    response = client.get("/internal/cache")
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions"} <= set(response.json())
@@ -0,0 +1,45 @@
+# tests/test_db_pool.py
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+from app.infrastructure.config import Settings
+from app.infrastructure.database.pool import InstrumentedQueuePool, pool_stats
+
+def test_settings_read_pool_options_from_env(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("SQL_ECHO", "true")
+    settings = Settings(_env_file=None)
+    assert settings.db_pool_size == 3
+    assert settings.db_pool_pre_ping is False
+    assert settings.sql_echo is True
+    assert settings.db_max_overflow == 10
+
+def test_instrumented_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    with engine.connect():
+        stats = pool_stats(engine.pool)
+        assert (stats["size"], stats["checked_out"], stats["checkouts"]) == (1, 1, 1)
+        # Sin conexiones libres la segunda petición agota el timeout
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_max_ms"] >= 0
+    engine.dispose()
+
+def test_db_pool_endpoint(client: TestClient):
+    response = client.get("/internal/db-pool")
+    assert response.status_code == 200
+    stats = response.json()["sync"]
+    assert {"pool_class", "checked_out", "overflow", "checkouts", "wait_avg_ms", "wait_max_ms", "timeouts"} <= set(stats)
+
+def test_settings_read_replica_options_from_env(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("DB_REPLICA_URLS", "sqlite:///r1.db, sqlite:///r2.db,")
+    monkeypatch.setenv("DB_REPLICA_STRATEGY", "least_connections")
+    settings = Settings(_env_file=None)
+    assert settings.replica_urls == ["sqlite:///r1.db", "sqlite:///r2.db"]
+    assert settings.db_replica_strategy == "least_connections"
+    assert Settings(_env_file=None, db_replica_urls=None).replica_urls == []
@@ -0,0 +1,110 @@
+# tests/test_events.py
+# TestClient devuelve la respuesta cuando el stream termina: las pruebas acotan su duración
+# (EVENTS_MAX_STREAM_SECONDS) y escriben desde otro hilo mientras el stream está abierto
+import asyncio
+import json
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.infrastructure.config import get_settings
+from app.infrastructure.events import RESET_EVENT, InMemoryEventBroker, get_event_broker, set_event_broker
+
+@pytest.fixture(name="broker")
+def broker_fixture(monkeypatch: pytest.MonkeyPatch):
+    previous = get_event_broker()
+    broker = InMemoryEventBroker(buffer_size=3)
+    set_event_broker(broker)
+    monkeypatch.setattr(get_settings(), "events_keepalive_seconds", 0.05)
+    monkeypatch.setattr(get_settings(), "events_max_stream_seconds", 0.5)
+    yield broker
+    set_event_broker(previous)
+
+# (id, tipo, datos) de cada evento del cuerpo SSE
+def parse_events(text: str) -> list:
+    events = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+# Ejecuta `writes` en otro hilo en cuanto el stream está suscrito
+def write_while_streaming(broker: InMemoryEventBroker, writes) -> threading.Thread:
+    def run():
+        while broker.stats()["subscribers"] == 0:
+            time.sleep(0.01)
+        writes()
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+def test_events_stream_task_changes(client: TestClient, broker: InMemoryEventBroker):
+    """
+    Prueba que el stream SSE entrega en vivo los cambios de las tareas de la lista (y no los de
+    otras listas) y que termina cuando la lista se elimina.
+    """
+    list_id = client.post("/task-lists/", json={"title": "En vivo"}).json()["id"]
+    other_id = client.post("/task-lists/", json={"title": "Otra"}).json()["id"]
+
+    def writes():
+        task_id = client.post("/tasks/", json={"title": "Nueva", "task_list_id": list_id}).json()["id"]
+        client.post("/tasks/", json={"title": "De otra lista", "task_list_id": other_id})
+        client.patch(f"/tasks/{task_id}/toggle-completion")
+        client.delete(f"/tasks/{task_id}")
+        client.delete(f"/task-lists/{list_id}") # cierra el stream
+
+    thread = write_while_streaming(broker, writes)
+    response = client.get(f"/task-lists/{list_id}/events")
+    thread.join()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [event_type for _, event_type, _ in events] == ["task.created", "task.toggled", "task.deleted", "task_list.deleted"]
+    assert events[1][2]["completed"] is True and events[1][2]["task_list_id"] == list_id
+    assert [event_id for event_id, _, _ in events] == sorted(event_id for event_id, _, _ in events)
+    assert broker.stats()["subscribers"] == 0
+
+def test_events_resume_with_last_event_id(client: TestClient, broker: InMemoryEventBroker):
+    list_id = client.post("/task-lists/", json={"title": "Reanudable"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id}).json()["id"]
+    # Un id que el broker no conserva da un "reset" con el id desde el que reanudar tras releer
+    reset = parse_events(client.get(f"/task-lists/{list_id}/events", params={"last_event_id": 0}).text)
+    assert [event_type for _, event_type, _ in reset] == [RESET_EVENT]
+    first_id = reset[0][0]
+    client.put(f"/tasks/{task_id}", json={"title": "Editada"})
+    client.patch(f"/tasks/{task_id}/toggle-completion")
+
+    # Sin desconexión: Last-Event-ID entrega lo ocurrido después de ese evento
+    response = client.get(f"/task-lists/{list_id}/events", headers={"Last-Event-ID": str(first_id)})
+    events = parse_events(response.text)
+    assert [event_type for _, event_type, _ in events] == ["task.updated", "task.toggled"]
+    assert events[0][2]["title"] == "Editada"
+
+    # El búfer (3 eventos) ya no conserva lo posterior a first_id: "reset" para releer la lista
+    for _ in range(3):
+        client.patch(f"/tasks/{task_id}/toggle-completion")
+    events = parse_events(client.get(f"/task-lists/{list_id}/events", headers={"Last-Event-ID": str(first_id)}).text)
+    assert [event_type for _, event_type, _ in events] == [RESET_EVENT]
+
+    assert client.get(f"/task-lists/{list_id}/events", headers={"Last-Event-ID": "x"}).status_code == 400
+    assert client.get("/task-lists/999/events").status_code == 404
+
+def test_subscriber_that_falls_behind_gets_a_reset():
+    async def scenario():
+        broker = InMemoryEventBroker(buffer_size=2)
+        subscription = broker.subscribe("canal")
+        for index in range(5):
+            broker.publish("canal", "task.updated", {"id": index})
+        await asyncio.sleep(0) # entrega los eventos en el event loop
+        # La cola (3) se llenó: se descartan los pendientes y se pide releer el estado
+        event = await subscription.get(timeout=0.1)
+        assert event.type == RESET_EVENT
+        broker.publish("canal", "task.updated", {"id": 5})
+        event = await subscription.get(timeout=0.1)
+        assert event.data == {"id": 5}
+        assert await subscription.get(timeout=0.01) is None
+        subscription.close()
+        assert broker.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+# tests/test_metrics.py
+import re
+from fastapi.testclient import TestClient
+from app.infrastructure.metrics import get_metrics_registry
+
+def server_timing_queries(response) -> int:
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+def test_server_timing_reports_request_queries(client: TestClient):
+    list_id = client.post("/task-lists/", json={"title": "Lista"}).json()["id"]
+    response = client.get(f"/tasks/by-list/{list_id}")
+    assert response.status_code == 200
+    assert re.match(r"db;dur=[\d.]+;desc=\"\d+ queries\", app;dur=[\d.]+", response.headers["server-timing"])
+    # Leer la página de tareas (vacía) y comprobar que la lista existe
+    assert server_timing_queries(response) == 2
+    assert server_timing_queries(client.get("/")) == 0
+
+def test_metrics_endpoint_exposes_route_metrics(client: TestClient):
+    get_metrics_registry().clear()
+    client.post("/task-lists/", json={"title": "Lista"})
+    client.get("/tasks/99999")
+    client.get("/tasks/99999")
+    client.get("/no-existe")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/tasks/{task_id}",status="404"} 2' in body
+    assert 'http_requests_total{method="POST",route="/task-lists/",status="201"} 1' in body
+    assert 'http_requests_total{method="GET",route="<unmatched>",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/tasks/{task_id}"} 2' in body
+    assert 'http_request_db_queries_bucket{method="GET",route="/tasks/{task_id}",le="+Inf"} 2' in body
+    assert 'http_request_db_seconds_total{method="POST",route="/task-lists/"}' in body
@@ -0,0 +1,142 @@
+# tests/test_query_plans.py
+# Verifica con EXPLAIN QUERY PLAN (SQLite como sustituto local) que las consultas calientes
+# sobre tareas usan un índice y nunca recorren la tabla completa.
+import re
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.domain import models
+from app.infrastructure.database.migrations import migrate
+from app.application.services.task_service import TaskService
+from app.application.services.task_list_service import TaskListService
+
+@pytest.fixture(name="plan_engine")
+def plan_engine_fixture():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    migrate(engine)
+    with engine.begin() as conn:
+        conn.execute(models.TaskList.__table__.insert(), [{"title": "Lista A"}, {"title": "Lista B"}])
+        conn.execute(models.Task.__table__.insert(), [
+            {"title": f"Tarea {i}", "completed": i % 2 == 0, "priority": i % 3, "task_list_id": 1 + i % 2}
+            for i in range(20)
+        ])
+    yield engine
+    engine.dispose()
+
+# Ejecuta la llamada y devuelve las sentencias SELECT/UPDATE que emitió leyendo la tabla tasks
+def capture_task_selects(engine, call):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")) and re.search(r"\btasks\b", statement):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert statements, "La llamada no emitió consultas sobre tasks"
+    return statements
+
+def explain(engine, statement, parameters):
+    with engine.connect() as conn:
+        return [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+
+def assert_uses_index(engine, statements):
+    for statement, parameters in statements:
+        plan = explain(engine, statement, parameters)
+        task_steps = [step for step in plan if " tasks" in f" {step}"]
+        assert task_steps, plan
+        for step in task_steps:
+            # SEARCH = acceso por índice; SCAN (aun sobre un índice cubriente) = recorrido completo
+            assert step.startswith("SEARCH tasks USING"), f"Recorrido completo en: {statement}\n{plan}"
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"completed": True},
+    {"priority": 1},
+    {"completed": False, "priority": 2},
+])
+def test_tasks_by_list_uses_index(plan_engine, filters):
+    statements = capture_task_selects(
+        plan_engine, lambda db: TaskService(db).get_tasks_by_list_id(1, limit=5, **filters)
+    )
+    assert_uses_index(plan_engine, statements)
+
+def test_tasks_by_list_cursor_uses_index(plan_engine):
+    statements = capture_task_selects(
+        plan_engine, lambda db: TaskService(db).get_tasks_by_list_id(1, completed=True, limit=5, after_id=4)
+    )
+    assert_uses_index(plan_engine, statements)
+
+def test_recompute_counters_uses_index(plan_engine):
+    statements = capture_task_selects(
+        plan_engine, lambda db: TaskListService(db).recompute_counters()
+    )
+    assert_uses_index(plan_engine, statements)
+
+def test_get_task_uses_primary_key(plan_engine):
+    statements = capture_task_selects(plan_engine, lambda db: TaskService(db).get_task(3))
+    assert_uses_index(plan_engine, statements)
+
+def test_task_list_etag_uses_updated_at_index(plan_engine):
+    # MAX(tasks.updated_at) de la lista se lee del índice (task_list_id, updated_at), sin recorrer sus tareas
+    statements = capture_task_selects(plan_engine, lambda db: TaskListService(db).get_task_list_etag(1))
+    assert_uses_index(plan_engine, statements)
+    plan = [step for statement, parameters in statements for step in explain(plan_engine, statement, parameters)]
+    assert any("ix_tasks_list_updated_at" in step for step in plan), plan
+
+def test_task_list_priority_count_uses_index(plan_engine):
+    statements = capture_task_selects(plan_engine, lambda db: TaskListService(db).get_task_list_data(1, priority=1))
+    assert_uses_index(plan_engine, statements)
+    counts = [(statement, parameters) for statement, parameters in statements if "count(" in statement.lower()]
+    assert counts, statements
+    for statement, parameters in counts:
+        plan = explain(plan_engine, statement, parameters)
+        assert any("ix_tasks_list_priority" in step for step in plan), plan
+
+def test_search_keyset_reads_tasks_by_primary_key(plan_engine):
+    # El orden por (score, id) y el cursor se aplican sobre las coincidencias del índice de texto:
+    # tasks y task_lists se leen por clave primaria, nunca se recorren completas
+    statements = capture_task_selects(
+        plan_engine, lambda db: TaskService(db).search_tasks("tarea", limit=5, after=(-1.0, 3))
+    )
+    for statement, parameters in statements:
+        plan = explain(plan_engine, statement, parameters)
+        assert any(step.startswith("SCAN tasks_fts VIRTUAL TABLE") for step in plan), plan
+        assert "SEARCH tasks USING INTEGER PRIMARY KEY (rowid=?)" in plan, plan
+        assert not any(re.match(r"SCAN (tasks|task_lists)\b", step) for step in plan), plan
+
+def test_migrate_adds_missing_indexes(plan_engine):
+    # Simula una base de datos existente creada antes de declarar los índices
+    with plan_engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_tasks_list_completed_priority"))
+    migrate(plan_engine)
+    with plan_engine.connect() as conn:
+        names = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list('tasks')")}
+    assert {"ix_tasks_list_id", "ix_tasks_list_completed_priority", "ix_tasks_list_priority"} <= names
+
+
+def test_migrate_adds_counter_columns(plan_engine):
+    # Simula una base de datos anterior a los contadores: se agregan y se calculan
+    with plan_engine.begin() as conn:
+        conn.execute(text("ALTER TABLE task_lists DROP COLUMN task_count"))
+        conn.execute(text("ALTER TABLE task_lists DROP COLUMN completed_count"))
+    migrate(plan_engine)
+    with plan_engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, task_count, completed_count FROM task_lists ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [(1, 10, 10), (2, 10, 0)]
+
+def test_migrate_builds_full_text_index_for_existing_tasks(plan_engine):
+    # Simula una base de datos anterior a la búsqueda: el índice se crea y se llena
+    with plan_engine.begin() as conn:
+        for name in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            conn.execute(text(f"DROP TRIGGER {name}"))
+        conn.execute(text("DROP TABLE tasks_fts"))
+    migrate(plan_engine)
+    with sessionmaker(bind=plan_engine)() as db:
+        results = TaskService(db).search_tasks("tarea", limit=100)
+    assert len(results) == 20
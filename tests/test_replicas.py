@@ -0,0 +1,112 @@
+# tests/test_replicas.py
+# Varias bases SQLite hacen de primario y réplicas: cada una tiene la lista 1 con un título
+# distinto, así la respuesta indica de qué base se leyó
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.main import app
+from app.domain import models
+from app.infrastructure.cache import InMemoryLRUCache, get_cache, set_cache
+from app.infrastructure.database.connection import get_db, get_session
+from app.infrastructure.database.migrations import migrate
+from app.infrastructure.database.replicas import READ_PRIMARY_COOKIE, ReplicaRouter, get_replica_router, set_replica_router
+
+@pytest.fixture(name="databases")
+def databases_fixture(tmp_path):
+    engines = {}
+    for name in ("primario", "réplica 1", "réplica 2"):
+        engine = create_engine(f"sqlite:///{tmp_path / (name.replace(' ', '') + '.db')}")
+        migrate(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(models.TaskList), [{"id": 1, "title": name}])
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+@pytest.fixture(name="replica_client")
+def replica_client_fixture(databases):
+    previous_router, previous_cache = get_replica_router(), get_cache()
+    primary = databases["primario"]
+    set_replica_router(ReplicaRouter(primary, [databases["réplica 1"], databases["réplica 2"]], read_your_writes_seconds=30))
+    set_cache(InMemoryLRUCache())
+    PrimarySession = sessionmaker(bind=primary, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = PrimarySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides = {}
+    set_replica_router(previous_router)
+    set_cache(previous_cache)
+
+def read_source(client: TestClient) -> str:
+    response = client.get("/task-lists/1")
+    assert response.status_code == 200
+    return response.json()["title"]
+
+def test_reads_round_robin_across_replicas(replica_client: TestClient):
+    assert [read_source(replica_client) for _ in range(4)] == ["réplica 1", "réplica 2", "réplica 1", "réplica 2"]
+    stats = replica_client.get("/internal/db-replicas").json()
+    assert [replica["reads"] for replica in stats["replicas"]] == [2, 2]
+    assert stats["primary_reads"] == 0
+
+def test_client_reads_its_writes_from_primary(replica_client: TestClient):
+    response = replica_client.post("/task-lists/", json={"title": "Nueva"})
+    assert response.status_code == 201
+    assert READ_PRIMARY_COOKIE in response.cookies
+    # Durante la ventana el cliente lee del primario, donde está su escritura
+    assert read_source(replica_client) == "primario"
+    assert replica_client.get(f"/task-lists/{response.json()['id']}").status_code == 200
+    # Otros clientes (sin la cookie) siguen leyendo de las réplicas
+    replica_client.cookies.clear()
+    assert read_source(replica_client).startswith("réplica")
+
+def test_replica_reads_do_not_fill_the_cache(replica_client: TestClient):
+    """
+    Prueba que lo leído de una réplica atrasada no queda en caché: el cliente que acaba de
+    escribir lee su cambio del primario aunque otro cliente haya leído antes de una réplica.
+    """
+    response = replica_client.put("/task-lists/1", json={"title": "Editada"})
+    assert response.status_code == 200
+    writer_cookies = dict(replica_client.cookies)
+    replica_client.cookies.clear()
+    assert read_source(replica_client).startswith("réplica")
+    replica_client.cookies.update(writer_cookies)
+    assert read_source(replica_client) == "Editada"
+    # La lectura del primario sí se guarda en caché
+    assert read_source(replica_client) == "Editada"
+    assert get_cache().stats()["hits"] == 1
+
+def test_failed_writes_and_reads_do_not_pin_to_primary(replica_client: TestClient):
+    assert replica_client.put("/task-lists/999", json={"title": "No existe"}).status_code == 404
+    assert READ_PRIMARY_COOKIE not in replica_client.cookies
+    replica_client.get("/task-lists/1")
+    assert READ_PRIMARY_COOKIE not in replica_client.cookies
+
+def test_least_connections_prefers_idle_replicas():
+    router = ReplicaRouter("primario", ["r1", "r2", "r3"], strategy="least_connections")
+    first, second, third = router.acquire(), router.acquire(), router.acquire()
+    assert sorted([first, second, third]) == ["r1", "r2", "r3"]
+    router.release(second)
+    # La única réplica sin sesiones abiertas es la que se acaba de liberar
+    assert router.acquire() == second
+    assert router.acquire(prefer_primary=True) == "primario"
+    assert ReplicaRouter("primario").acquire() == "primario"
+    with pytest.raises(ValueError):
+        ReplicaRouter("primario", ["r1"], strategy="random")
+
+def test_read_your_writes_window_ignores_expired_or_invalid_cookies():
+    router = ReplicaRouter("primario", ["r1"])
+    assert router.in_read_your_writes_window({READ_PRIMARY_COOKIE: "9999999999"})
+    assert not router.in_read_your_writes_window({READ_PRIMARY_COOKIE: "1"})
+    assert not router.in_read_your_writes_window({READ_PRIMARY_COOKIE: "x"})
+    assert not router.in_read_your_writes_window({})
@@ -1,10 +1,14 @@
 # tests/test_task_list_router.py
+import csv
+import io
+import json
 import time
 from datetime import datetime
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 import pytest
 from app.domain.models import TaskList
+from app.schemas import task_schemas
 
 def test_create_task_list(client: TestClient, db_session: Session):
     # Datos para crear una lista de tareas
@@ -151,9 +155,11 @@ def test_delete_task_list(client: TestClient, db_session: Session):
     delete_response = client.delete(f"/task-lists/{created_task_list_id}")
 
     # 3. Afirmaciones para verificar la respuesta de la eliminación
-    assert delete_response.status_code == 204 # Código de estado esperado para eliminación exitosa (No Content)
+    assert delete_response.status_code == 202 # Aceptada: las tareas se purgan en segundo plano
+    assert delete_response.json()["task_list_id"] == created_task_list_id
 
-    # 4. Verificar que la lista de tareas ya no exista en la DB
+    # 4. Verificar que la lista de tareas ya no exista en la DB (la purga corre tras la respuesta)
+    db_session.expire_all()
     from app.domain.models import TaskList
     db_task_list = db_session.query(TaskList).filter(TaskList.id == created_task_list_id).first()
     assert db_task_list is None # La lista no debería estar en la base de datos
@@ -219,4 +225,323 @@ def test_get_all_task_lists(client: TestClient):
         assert "description" in item
         assert "created_at" in item
         assert "updated_at" in item
-        assert "completion_percentage" in item
\ No newline at end of file
+        assert "completion_percentage" in item
+
+def test_completion_percentage_with_tasks(client: TestClient):
+    # 1. Crear una lista con cuatro tareas, una de ellas completada
+    list_id = client.post("/task-lists/", json={"title": "Lista con progreso"}).json()["id"]
+    for index in range(4):
+        client.post("/tasks/", json={"title": f"Tarea {index}", "task_list_id": list_id, "completed": index == 0})
+
+    # 2. El porcentaje se calcula igual en el detalle y en el listado
+    get_response = client.get(f"/task-lists/{list_id}")
+    assert get_response.status_code == 200
+    assert get_response.json()["completion_percentage"] == 25.0
+    assert len(get_response.json()["tasks"]) == 4
+
+    list_response = client.get("/task-lists/")
+    assert list_response.json()[0]["completion_percentage"] == 25.0
+
+def test_get_all_task_lists_limit_counts_lists_not_tasks(client: TestClient):
+    # Cada lista tiene varias tareas: el limit debe aplicarse sobre listas
+    for index in range(3):
+        list_id = client.post("/task-lists/", json={"title": f"Lista {index}"}).json()["id"]
+        for task_index in range(3):
+            client.post("/tasks/", json={"title": f"Tarea {task_index}", "task_list_id": list_id})
+
+    response = client.get("/task-lists/", params={"skip": 1, "limit": 2})
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()] == ["Lista 1", "Lista 2"]
+
+def test_get_all_task_lists_cursor_pagination(client: TestClient):
+    # Crear cinco listas y recorrerlas de dos en dos siguiendo el cursor
+    for index in range(5):
+        client.post("/task-lists/", json={"title": f"Lista {index}"})
+
+    titles = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/task-lists/", params=params)
+        assert response.status_code == 200
+        titles.extend(item["title"] for item in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 2, "after": response.headers["X-Next-Cursor"]}
+
+    assert titles == [f"Lista {index}" for index in range(5)]
+
+def test_task_counters_follow_every_write(client: TestClient, db_session: Session):
+    list_id = client.post("/task-lists/", json={"title": "Lista con contadores"}).json()["id"]
+
+    def counters():
+        data = client.get(f"/task-lists/{list_id}").json()
+        return data["task_count"], data["completed_count"], data["completion_percentage"]
+
+    # Creación individual y masiva
+    first_id = client.post("/tasks/", json={"title": "Tarea 1", "task_list_id": list_id}).json()["id"]
+    bulk_ids = client.post("/tasks/bulk", json={"items": [
+        {"title": f"Tarea {index}", "task_list_id": list_id, "completed": index % 2 == 0} for index in range(2, 6)
+    ]}).json()["created_ids"]
+    assert counters() == (5, 2, 40.0)
+
+    # Toggle, actualización y eliminación individuales
+    client.patch(f"/tasks/{first_id}/toggle-completion")
+    assert counters() == (5, 3, 60.0)
+    client.put(f"/tasks/{first_id}", json={"completed": False})
+    assert counters() == (5, 2, 40.0)
+    client.delete(f"/tasks/{bulk_ids[0]}")
+    assert counters() == (4, 1, 25.0)
+
+    # Operaciones masivas
+    client.patch("/tasks/bulk", json={"task_list_id": list_id, "changes": {"completed": True}})
+    assert counters() == (4, 4, 100.0)
+    client.patch("/tasks/bulk/toggle-completion", json={"ids": [first_id, bulk_ids[1]]})
+    assert counters() == (4, 2, 50.0)
+    client.request("DELETE", "/tasks/bulk", json={"task_list_id": list_id, "completed": True})
+    assert counters() == (2, 0, 0.0)
+
+def test_recompute_counters_repairs_drift(client: TestClient, db_session: Session):
+    from app.application.services.task_list_service import TaskListService
+    list_id = client.post("/task-lists/", json={"title": "Lista desviada"}).json()["id"]
+    client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id, "completed": True})
+
+    # Desvío simulado de los contadores
+    db_task_list = db_session.query(TaskList).filter(TaskList.id == list_id).first()
+    db_task_list.task_count, db_task_list.completed_count = 7, 0
+    db_session.commit()
+
+    assert TaskListService(db_session).recompute_counters([list_id]) == 1
+    data = client.get(f"/task-lists/{list_id}").json()
+    assert (data["task_count"], data["completed_count"]) == (1, 1)
+
+def test_get_task_list_conditional_get_and_if_match(client: TestClient):
+    """
+    Prueba el ETag de una lista: 304 con If-None-Match vigente, cambio al modificar sus tareas y 412 con If-Match obsoleto.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista ETag"}).json()["id"]
+    etag = client.get(f"/task-lists/{list_id}").headers["ETag"]
+    assert client.get(f"/task-lists/{list_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    # Crear una tarea cambia los contadores y, con ellos, el ETag de la lista
+    client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id})
+    response = client.get(f"/task-lists/{list_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    assert client.put(f"/task-lists/{list_id}", json={"title": "Otra"}, headers={"If-Match": etag}).status_code == 412
+    current = response.headers["ETag"]
+    assert client.get(f"/task-lists/{list_id}", headers={"If-None-Match": current}).status_code == 304
+    assert client.put(f"/task-lists/{list_id}", json={"title": "Otra"}, headers={"If-Match": current}).status_code == 200
+
+def test_export_task_list_ndjson_and_csv(client: TestClient):
+    """
+    Prueba la exportación en streaming de las tareas de una lista en NDJSON y CSV.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista exportable"}).json()["id"]
+    other_list_id = client.post("/task-lists/", json={"title": "Otra lista"}).json()["id"]
+    client.post("/tasks/bulk", json={"items": [
+        {"title": f"Tarea, {index}", "task_list_id": list_id, "priority": index % 3} for index in range(5)
+    ] + [{"title": "Ajena", "task_list_id": other_list_id}]})
+
+    response = client.get(f"/task-lists/{list_id}/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == [f"Tarea, {index}" for index in range(5)]
+    assert rows[0]["completed"] is False
+    assert rows == sorted(rows, key=lambda row: row["id"])
+    expected = client.get(f"/tasks/{rows[0]['id']}").json()
+    assert rows[0] == expected
+
+    response = client.get(f"/task-lists/{list_id}/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(records) == 5
+    assert records[1]["title"] == "Tarea, 1"
+    assert records[1]["priority"] == "1"
+
+def test_export_task_list_errors(client: TestClient):
+    assert client.get("/task-lists/99999/export").status_code == 404
+    list_id = client.post("/task-lists/", json={"title": "Lista"}).json()["id"]
+    assert client.get(f"/task-lists/{list_id}/export", params={"format": "xml"}).status_code == 422
+    # Una lista vacía exporta un cuerpo vacío (o solo la cabecera del CSV)
+    assert client.get(f"/task-lists/{list_id}/export").text == ""
+    assert client.get(f"/task-lists/{list_id}/export", params={"format": "csv"}).text.strip() == "id,task_list_id,title,description,completed,status,priority,created_at,updated_at"
+
+def test_import_task_list_ndjson(client: TestClient):
+    """
+    Prueba la importación NDJSON por bloques con errores por línea.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista importada"}).json()["id"]
+    lines = [json.dumps({"title": f"Tarea {index}", "priority": index % 3, "completed": index % 2 == 0}) for index in range(7)]
+    lines.insert(2, "{no es json")
+    lines.insert(5, json.dumps({"priority": 1}))
+    lines.insert(6, "")
+    body = "\n".join(lines).encode()
+
+    # El cuerpo llega en trozos que cortan líneas por la mitad
+    def body_chunks():
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    response = client.post(f"/task-lists/{list_id}/import", params={"chunk_size": 3}, content=body_chunks())
+    assert response.status_code == 200
+    result = response.json()
+    assert result["processed"] == 9
+    assert result["created"] == 7
+    assert result["failed"] == 2
+    assert result["chunks_committed"] == 3
+    assert [error["line"] for error in result["errors"]] == [3, 6]
+    assert result["errors_truncated"] is False
+
+    task_list = client.get(f"/task-lists/{list_id}").json()
+    assert task_list["task_count"] == 7
+    assert task_list["completed_count"] == 4
+    assert [task["title"] for task in task_list["tasks"]] == [f"Tarea {index}" for index in range(7)]
+
+def test_import_task_list_csv_roundtrip(client: TestClient):
+    """
+    Prueba que una exportación CSV se puede importar en otra lista.
+    """
+    source_id = client.post("/task-lists/", json={"title": "Origen"}).json()["id"]
+    target_id = client.post("/task-lists/", json={"title": "Destino"}).json()["id"]
+    client.post("/tasks/bulk", json={"items": [
+        {"title": "Simple", "task_list_id": source_id},
+        {"title": "Con, coma", "description": "Línea 1\nLínea \"2\"", "task_list_id": source_id, "completed": True, "priority": 2},
+    ]})
+    exported = client.get(f"/task-lists/{source_id}/export", params={"format": "csv"}).content
+
+    response = client.post(f"/task-lists/{target_id}/import", params={"format": "csv"}, content=exported + b"1,2,sin columnas\n")
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert response.json()["failed"] == 1
+
+    imported = client.get(f"/tasks/by-list/{target_id}").json()
+    assert [(task["title"], task["description"], task["completed"], task["priority"]) for task in imported] == [
+        ("Simple", None, False, 0),
+        ("Con, coma", "Línea 1\nLínea \"2\"", True, 2),
+    ]
+
+def test_import_rejects_overlong_lines(client: TestClient):
+    """
+    Prueba que una línea (o un registro CSV con comillas sin cerrar) de más de
+    IMPORT_MAX_LINE_LENGTH caracteres detiene la importación con 413, conservando lo confirmado.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Líneas largas"}).json()["id"]
+    body = json.dumps({"title": "Cabe"}).encode() + b"\n" + b"x" * (task_schemas.IMPORT_MAX_LINE_LENGTH + 1)
+    response = client.post(f"/task-lists/{list_id}/import", params={"chunk_size": 1}, content=body)
+    assert response.status_code == 413
+    assert "línea 2" in response.json()["detail"] and "se importaron 1 tareas" in response.json()["detail"]
+    assert client.get(f"/task-lists/{list_id}").json()["task_count"] == 1
+
+    csv_body = b'title\n"abierta\n' + b"y\n" * task_schemas.IMPORT_MAX_LINE_LENGTH
+    response = client.post(f"/task-lists/{list_id}/import", params={"format": "csv"}, content=csv_body)
+    assert response.status_code == 413 and "línea 2" in response.json()["detail"]
+
+def test_import_task_list_not_found(client: TestClient):
+    assert client.post("/task-lists/99999/import", content=b'{"title": "x"}').status_code == 404
+
+def test_sparse_fieldsets_on_task_list_reads(client: TestClient):
+    """
+    Prueba ?fields= en las lecturas de listas: el detalle solo incluye las tareas si se piden.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista", "description": "Detalle"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id, "completed": True}).json()["id"]
+    client.post("/tasks/", json={"title": "Otra", "task_list_id": list_id})
+
+    response = client.get("/task-lists/", params={"fields": "title,completion_percentage"})
+    assert response.json() == [{"id": list_id, "title": "Lista", "completion_percentage": 50.0}]
+
+    response = client.get(f"/task-lists/{list_id}", params={"fields": "title,task_count"})
+    assert response.json() == {"id": list_id, "title": "Lista", "task_count": 2}
+    etag = response.headers["ETag"]
+    assert etag == client.get(f"/task-lists/{list_id}").headers["ETag"]
+
+    response = client.get(f"/task-lists/{list_id}", params={"fields": "tasks"})
+    assert [task["id"] for task in response.json()["tasks"]] == [task_id, task_id + 1]
+    assert set(response.json()) == {"id", "tasks"}
+
+    assert client.get(f"/task-lists/{list_id}", params={"fields": "tareas"}).status_code == 400
+    assert client.get("/task-lists/", params={"fields": "tasks"}).status_code == 400
+
+def test_fast_json_responses_match_validated_path(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    from app.infrastructure.cache import get_cache
+    from app.infrastructure.config import get_settings
+    task_list_id = client.post("/task-lists/", json={"title": "Rápida", "description": "ñandú"}).json()["id"]
+    items = [{"title": f"Tarea {i}", "description": None if i % 2 else "con acentos: áé", "priority": i % 3, "task_list_id": task_list_id} for i in range(5)]
+    client.post("/tasks/bulk", json={"items": items})
+    client.patch("/tasks/bulk/toggle-completion", json={"task_list_id": task_list_id, "priority": 1})
+
+    urls = [f"/task-lists/{task_list_id}", f"/tasks/by-list/{task_list_id}?limit=3", f"/task-lists/{task_list_id}/export"]
+    def read_all():
+        get_cache().clear()
+        responses = [client.get(url) for url in urls]
+        assert all(response.status_code == 200 for response in responses)
+        return responses
+
+    validated = read_all()
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+    fast = read_all()
+
+    for before, after in zip(validated[:2], fast[:2]):
+        assert after.json() == before.json()
+        assert after.headers["ETag"] == before.headers["ETag"]
+    assert fast[1].headers["X-Next-Cursor"] == validated[1].headers["X-Next-Cursor"]
+    parse = lambda response: [json.loads(line) for line in response.text.splitlines()]
+    assert parse(fast[2]) == parse(validated[2])
+    assert fast[0].json()["completion_percentage"] == 40.0
+    # Con la entrada en caché (la guarda la ruta normal) la ruta rápida responde lo mismo
+    monkeypatch.setattr(get_settings(), "fast_json_responses", False)
+    client.get(f"/task-lists/{task_list_id}")
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+    cached = client.get(f"/task-lists/{task_list_id}")
+    assert cached.json() == validated[0].json()
+    assert cached.headers["ETag"] == validated[0].headers["ETag"]
+
+def test_read_task_list_embeds_a_page_of_tasks(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    task_list_id = client.post("/task-lists/", json={"title": "Paginada"}).json()["id"]
+    items = [{"title": f"Tarea {index}", "priority": index % 3, "completed": index % 2 == 0, "task_list_id": task_list_id} for index in range(7)]
+    ids = client.post("/tasks/bulk", json={"items": items}).json()["created_ids"]
+
+    # Recorre las tareas embebidas por cursor
+    pages, cursor = [], None
+    while True:
+        params = {"tasks_limit": 3}
+        if cursor:
+            params["tasks_cursor"] = cursor
+        body = client.get(f"/task-lists/{task_list_id}", params=params).json()
+        assert body["tasks_total"] == 7 and body["task_count"] == 7
+        pages.append([task["id"] for task in body["tasks"]])
+        cursor = body["tasks_next_cursor"]
+        if not cursor:
+            break
+    assert pages == [ids[0:3], ids[3:6], ids[6:7]]
+
+    # Mismos filtros que /tasks/by-list; el total corresponde al filtro
+    body = client.get(f"/task-lists/{task_list_id}", params={"completed": True, "tasks_limit": 2}).json()
+    assert [task["id"] for task in body["tasks"]] == [ids[0], ids[2]]
+    assert body["tasks_total"] == 4 and body["tasks_next_cursor"]
+    body = client.get(f"/task-lists/{task_list_id}", params={"priority": 1, "completed": False}).json()
+    assert [task["id"] for task in body["tasks"]] == [ids[1]]
+    assert body["tasks_total"] == 1 and body["tasks_next_cursor"] is None
+
+    # Ventana por defecto, campos parciales y ruta rápida
+    assert len(client.get(f"/task-lists/{task_list_id}").json()["tasks"]) == 7
+    sparse = client.get(f"/task-lists/{task_list_id}", params={"fields": "tasks_total", "priority": 0}).json()
+    assert sparse == {"id": task_list_id, "tasks_total": 3}
+    validated = client.get(f"/task-lists/{task_list_id}", params={"tasks_limit": 2, "priority": 2})
+    from app.infrastructure.config import get_settings
+    monkeypatch.setattr(get_settings(), "fast_json_responses", True)
+    fast = client.get(f"/task-lists/{task_list_id}", params={"tasks_limit": 2, "priority": 2})
+    assert fast.json() == validated.json()
+
+    # El ETag cubre todas las tareas de la lista, no solo la página
+    etag = validated.headers["ETag"]
+    assert client.get(f"/task-lists/{task_list_id}", params={"tasks_limit": 2}, headers={"If-None-Match": etag}).status_code == 304
+    client.patch(f"/tasks/{ids[6]}/toggle-completion")
+    assert client.get(f"/task-lists/{task_list_id}", params={"tasks_limit": 2}, headers={"If-None-Match": etag}).status_code == 200
+
+    assert client.get(f"/task-lists/{task_list_id}", params={"tasks_cursor": "x"}).status_code == 400
+    assert client.get(f"/task-lists/{task_list_id}", params={"tasks_limit": 0}).status_code == 422
+    assert client.get("/task-lists/9999", params={"tasks_limit": 2}).status_code == 404
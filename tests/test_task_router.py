@@ -1,5 +1,8 @@
 # tests/test_task_router.py
+import re
+import time
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 import pytest
 from datetime import datetime
@@ -157,4 +160,498 @@ def test_read_tasks_by_list_id_with_filters(client: TestClient):
     client.post("/tasks/", json={"title": "Tarea C1", "task_list_id": list_id, "status": "completed", "priority": 1})
     client.post("/tasks/", json={"title": "Tarea C3", "task_list_id": list_id, "status": "completed", "priority": 3})
 
-    # Filtrar por complet (pendiente)
\ No newline at end of file
+    # Filtrar por complet (pendiente)
+def test_read_tasks_by_list_cursor_pagination(client: TestClient):
+    """
+    Prueba la paginación por cursor (keyset) de las tareas de una lista, manteniendo los filtros.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista paginada"}).json()["id"]
+    for index in range(5):
+        client.post("/tasks/", json={"title": f"Tarea {index}", "task_list_id": list_id, "priority": index % 2})
+
+    # Primera página: trae el cursor siguiente en la cabecera
+    first_page = client.get(f"/tasks/by-list/{list_id}", params={"priority": 0, "limit": 2})
+    assert first_page.status_code == 200
+    assert [t["title"] for t in first_page.json()] == ["Tarea 0", "Tarea 2"]
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    # Segunda página a partir del cursor: última página, sin cursor siguiente
+    second_page = client.get(f"/tasks/by-list/{list_id}", params={"priority": 0, "limit": 2, "after": cursor})
+    assert second_page.status_code == 200
+    assert [t["title"] for t in second_page.json()] == ["Tarea 4"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+def test_read_tasks_by_list_empty_page_etag_needs_the_list(client: TestClient):
+    list_id = client.post("/task-lists/", json={"title": "Vacía"}).json()["id"]
+    response = client.get(f"/tasks/by-list/{list_id}")
+    assert response.json() == []
+    etag = response.headers["ETag"]
+    assert client.get(f"/tasks/by-list/{list_id}", headers={"If-None-Match": etag}).status_code == 304
+    # El ETag de una página vacía coincide para cualquier lista: la inexistente da 404
+    assert client.get("/tasks/by-list/9999", headers={"If-None-Match": etag}).status_code == 404
+
+def test_read_tasks_by_list_invalid_cursor(client: TestClient):
+    """
+    Prueba que un cursor mal formado devuelve 400.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista cursor inválido"}).json()["id"]
+    response = client.get(f"/tasks/by-list/{list_id}", params={"after": "no-es-un-cursor"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+def test_create_tasks_bulk(client: TestClient):
+    """
+    Prueba la creación masiva con errores reportados por item.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista masiva"}).json()["id"]
+    items = [{"title": f"Tarea {index}", "task_list_id": list_id, "priority": index % 3} for index in range(5)]
+    items.insert(2, {"title": "Sin lista", "task_list_id": 99999})
+    items.insert(4, {"title": "Prioridad inválida", "task_list_id": list_id, "priority": 7})
+
+    response = client.post("/tasks/bulk", json={"items": items})
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["created_ids"]) == 5
+    assert [error["index"] for error in data["errors"]] == [2, 4]
+    assert data["errors"][0]["detail"] == "Lista de tareas no encontrada"
+
+    # Los ids devueltos corresponden a las tareas creadas, en orden
+    tasks = client.get(f"/tasks/by-list/{list_id}").json()
+    assert [task["id"] for task in tasks] == data["created_ids"]
+    assert [task["title"] for task in tasks] == [f"Tarea {index}" for index in range(5)]
+    assert all(task["status"] == "pending" and task["created_at"] for task in tasks)
+
+def test_create_tasks_bulk_reports_non_object_items(client: TestClient):
+    """
+    Prueba que los items que no son objetos se reportan por posición sin rechazar la petición.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista masiva"}).json()["id"]
+    items = ["Tarea suelta", {"title": "Tarea válida", "task_list_id": list_id}, 7, None, [list_id]]
+
+    response = client.post("/tasks/bulk", json={"items": items})
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data["created_ids"]) == 1
+    assert [error["index"] for error in data["errors"]] == [0, 2, 3, 4]
+    assert [task["title"] for task in client.get(f"/tasks/by-list/{list_id}").json()] == ["Tarea válida"]
+
+def test_create_tasks_bulk_uses_few_statements(client: TestClient, db_session: Session):
+    """
+    Prueba que crear miles de tareas emite un puñado de sentencias y no una por tarea.
+    """
+    from sqlalchemy import event
+    list_id = client.post("/task-lists/", json={"title": "Lista grande"}).json()["id"]
+    items = [{"title": f"Tarea {index}", "task_list_id": list_id} for index in range(2500)]
+
+    statements = []
+    engine = db_session.get_bind()
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.post("/tasks/bulk", json={"items": items})
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert response.status_code == 201
+    assert len(response.json()["created_ids"]) == 2500
+    assert len(set(response.json()["created_ids"])) == 2500
+    assert len(statements) <= 6
+
+def test_bulk_update_toggle_and_delete_tasks(client: TestClient):
+    """
+    Prueba las operaciones masivas por filtro y por ids.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista masiva"}).json()["id"]
+    other_list_id = client.post("/task-lists/", json={"title": "Otra lista"}).json()["id"]
+    created = client.post("/tasks/bulk", json={"items": [
+        {"title": f"Tarea {index}", "task_list_id": list_id, "priority": index % 2} for index in range(4)
+    ] + [{"title": "Otra", "task_list_id": other_list_id}]}).json()["created_ids"]
+
+    # Marcar como completadas las tareas de prioridad 1 de la lista
+    response = client.patch("/tasks/bulk", json={"task_list_id": list_id, "priority": 1, "changes": {"completed": True}})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 2}
+    assert len(client.get(f"/tasks/by-list/{list_id}", params={"completed": True}).json()) == 2
+
+    # Invertir el estado de toda la lista
+    response = client.patch("/tasks/bulk/toggle-completion", json={"task_list_id": list_id})
+    assert response.json() == {"affected": 4}
+    completed = client.get(f"/tasks/by-list/{list_id}", params={"completed": True}).json()
+    assert [task["priority"] for task in completed] == [0, 0]
+
+    # Eliminar por ids: solo afecta a las que existen
+    response = client.request("DELETE", "/tasks/bulk", json={"ids": created[:2] + [99999]})
+    assert response.json() == {"affected": 2}
+    assert len(client.get(f"/tasks/by-list/{list_id}").json()) == 2
+    # La otra lista no se ve afectada
+    assert client.get(f"/tasks/{created[-1]}").json()["completed"] is False
+
+def test_bulk_operations_require_scope(client: TestClient):
+    """
+    Prueba que las operaciones masivas exigen ids o task_list_id y al menos un cambio.
+    """
+    assert client.patch("/tasks/bulk/toggle-completion", json={"completed": True}).status_code == 422
+    assert client.request("DELETE", "/tasks/bulk", json={}).status_code == 422
+    assert client.patch("/tasks/bulk", json={"ids": [1], "changes": {}}).status_code == 422
+
+def test_read_task_conditional_get_and_if_match(client: TestClient):
+    """
+    Prueba el ETag de una tarea: 304 con If-None-Match vigente, cambio tras escribir y 412 con If-Match obsoleto.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista ETag"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea ETag", "task_list_id": list_id}).json()["id"]
+
+    response = client.get(f"/tasks/{task_id}")
+    etag = response.headers["ETag"]
+    not_modified = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    updated = client.put(f"/tasks/{task_id}", json={"title": "Cambiada"}, headers={"If-Match": etag})
+    assert updated.status_code == 200
+    new_etag = updated.headers["ETag"]
+    assert new_etag != etag
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag}).status_code == 200
+
+    # Escritura con la versión antigua: rechazada sin modificar la tarea
+    assert client.patch(f"/tasks/{task_id}/toggle-completion", headers={"If-Match": etag}).status_code == 412
+    assert client.get(f"/tasks/{task_id}").json()["completed"] is False
+
+    # Escrituras seguidas (en el mismo segundo) también cambian la versión
+    again = client.put(f"/tasks/{task_id}", json={"title": "Otra vez"}, headers={"If-Match": new_etag})
+    assert again.status_code == 200 and again.headers["ETag"] != new_etag
+    assert client.put(f"/tasks/{task_id}", json={"title": "Obsoleta"}, headers={"If-Match": new_etag}).status_code == 412
+
+def test_read_tasks_by_list_conditional_get(client: TestClient):
+    """
+    Prueba el ETag de una página de tareas: cambia al añadir una tarea a la página.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista ETag"}).json()["id"]
+    client.post("/tasks/", json={"title": "Primera", "task_list_id": list_id})
+
+    etag = client.get(f"/tasks/by-list/{list_id}").headers["ETag"]
+    assert client.get(f"/tasks/by-list/{list_id}", headers={"If-None-Match": etag}).status_code == 304
+    # Otros filtros forman otra página con otro ETag
+    assert client.get(f"/tasks/by-list/{list_id}", params={"completed": True}, headers={"If-None-Match": etag}).status_code == 200
+
+    client.post("/tasks/", json={"title": "Segunda", "task_list_id": list_id})
+    assert client.get(f"/tasks/by-list/{list_id}", headers={"If-None-Match": etag}).status_code == 200
+
+def test_sparse_fieldsets_on_task_reads(client: TestClient, db_session: Session):
+    """
+    Prueba ?fields= en las lecturas de tareas: solo se leen y devuelven los campos pedidos (y el id).
+    """
+    list_id = client.post("/task-lists/", json={"title": "Lista"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "description": "Larga", "task_list_id": list_id}).json()["id"]
+    client.post("/tasks/", json={"title": "Otra", "task_list_id": list_id})
+
+    response = client.get(f"/tasks/by-list/{list_id}", params={"fields": "title,completed", "limit": 1})
+    assert response.status_code == 200
+    assert response.json() == [{"id": task_id, "title": "Tarea", "completed": False}]
+    assert "ETag" in response.headers
+    assert "X-Next-Cursor" in response.headers
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", capture)
+    try:
+        response = client.get(f"/tasks/{task_id}", params={"fields": "title"})
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", capture)
+    assert response.json() == {"id": task_id, "title": "Tarea"}
+    assert client.get(f"/tasks/{task_id}", params={"fields": "title"}, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    # La consulta no lee la descripción
+    assert statements and all("description" not in statement for statement in statements)
+
+    response = client.get(f"/tasks/{task_id}", params={"fields": "title,secreto"})
+    assert response.status_code == 400
+    assert "secreto" in response.json()["detail"]
+
+def test_search_tasks_ranked_filtered_and_paginated(client: TestClient):
+    list_id = client.post("/task-lists/", json={"title": "Búsqueda"}).json()["id"]
+    other_id = client.post("/task-lists/", json={"title": "Otra"}).json()["id"]
+    items = [
+        {"title": "Comprar leche", "description": "leche leche desnatada", "task_list_id": list_id},
+        {"title": "Llamar al banco", "description": "Preguntar por la leche", "task_list_id": list_id, "priority": 2},
+        {"title": "Leer informe", "description": None, "task_list_id": list_id},
+        {"title": "Leche para la oficina", "task_list_id": other_id},
+    ]
+    ids = client.post("/tasks/bulk", json={"items": items}).json()["created_ids"]
+
+    response = client.get("/tasks/search", params={"q": "leche"})
+    assert response.status_code == 200
+    found = [task["id"] for task in response.json()]
+    assert set(found) == {ids[0], ids[1], ids[3]}
+    assert found[0] == ids[0] # más apariciones del término: más relevante
+
+    # Filtros y prefijo de la última palabra
+    assert [t["id"] for t in client.get("/tasks/search", params={"q": "lech", "task_list_id": list_id, "priority": 2}).json()] == [ids[1]]
+    assert client.get("/tasks/search", params={"q": "leche", "completed": True}).json() == []
+
+    # Paginación por cursor: mismas tareas, en el mismo orden, sin repetir
+    pages, cursor = [], None
+    while True:
+        params = {"q": "leche", "limit": 2}
+        if cursor:
+            params["after"] = cursor
+        page = client.get("/tasks/search", params=params)
+        pages.extend(task["id"] for task in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert pages == found
+
+    # Texto sin palabras, cursor inválido y parámetro obligatorio
+    assert client.get("/tasks/search", params={"q": "\"*("}).json() == []
+    assert client.get("/tasks/search", params={"q": "leche", "after": "x"}).status_code == 400
+    assert client.get("/tasks/search").status_code == 422
+
+def test_search_index_follows_every_write_path(client: TestClient):
+    list_id = client.post("/task-lists/", json={"title": "Índice"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Revisar contrato", "task_list_id": list_id}).json()["id"]
+    search = lambda q: [task["id"] for task in client.get("/tasks/search", params={"q": q}).json()]
+    assert search("contrato") == [task_id]
+
+    client.put(f"/tasks/{task_id}", json={"title": "Firmar acuerdo"})
+    assert search("contrato") == []
+    assert search("acuerdo") == [task_id]
+
+    client.patch("/tasks/bulk", json={"ids": [task_id], "changes": {"description": "Versión final del anexo"}})
+    assert search("anexo") == [task_id]
+
+    client.delete(f"/tasks/{task_id}")
+    assert search("acuerdo") == []
+
+    ndjson = b'{"title": "Importada con presupuesto"}\n'
+    client.post(f"/task-lists/{list_id}/import", content=ndjson)
+    assert len(search("presupuesto")) == 1
+
+def test_search_statement_uses_mysql_fulltext_index():
+    from sqlalchemy.dialects import mysql
+    from sqlalchemy.schema import CreateIndex
+    from unittest.mock import MagicMock
+    from app.domain import models
+    from app.application.services.task_service import TaskService
+
+    index = next(index for index in models.Task.__table__.indexes if index.name == "ft_tasks_title_description")
+    assert str(CreateIndex(index).compile(dialect=mysql.dialect())).startswith("CREATE FULLTEXT INDEX")
+
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = "mysql"
+    matches = TaskService(db, cache=MagicMock())._search_matches("leche")
+    sql = str(matches.element.compile(dialect=mysql.dialect()))
+    assert "MATCH (tasks.title, tasks.description) AGAINST" in sql
+    assert "IN NATURAL LANGUAGE MODE" in sql
+
+def _capture_statements(engine, call):
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        result = call()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    return result, statements
+
+@pytest.mark.parametrize("returning", [True, False], ids=["returning", "sin-returning"])
+def test_single_task_writes_are_single_statements(client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch, returning: bool):
+    """
+    Prueba que toggle, update y delete escriben con una sentencia (más el ajuste de contadores),
+    con RETURNING o releyendo la fila si el motor no lo soporta (MySQL).
+    """
+    engine = db_session.get_bind()
+    if not returning:
+        monkeypatch.setattr(engine.dialect, "update_returning", False)
+        monkeypatch.setattr(engine.dialect, "delete_returning", False)
+    list_id = client.post("/task-lists/", json={"title": "Atómica"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id}).json()["id"]
+    extra = 0 if returning else 1 # relectura (o bloqueo previo al DELETE) sin RETURNING
+
+    response, statements = _capture_statements(engine, lambda: client.patch(f"/tasks/{task_id}/toggle-completion"))
+    assert response.json()["completed"] is True
+    assert len(statements) == 2 + extra # UPDATE ... SET completed = NOT completed + contadores
+
+    response, statements = _capture_statements(engine, lambda: client.put(f"/tasks/{task_id}", json={"title": "Editada"}))
+    assert response.json()["title"] == "Editada" and response.json()["completed"] is True
+    assert len(statements) == 1 + extra
+
+    # completed sin cambios: el UPDATE condicionado no afecta filas y no se tocan los contadores
+    response, statements = _capture_statements(engine, lambda: client.put(f"/tasks/{task_id}", json={"completed": True}))
+    assert response.status_code == 200
+    assert len(statements) == 2 + extra
+    response, statements = _capture_statements(engine, lambda: client.put(f"/tasks/{task_id}", json={"completed": False}))
+    assert response.json()["completed"] is False
+    assert len(statements) == 2 + extra
+
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 0
+    response, statements = _capture_statements(engine, lambda: client.delete(f"/tasks/{task_id}"))
+    assert response.status_code == 204
+    assert len(statements) == 2 + extra
+    assert client.get(f"/task-lists/{list_id}").json()["task_count"] == 0
+
+    # Inexistentes: se detectan por las filas afectadas, sin lecturas previas
+    for call in (
+        lambda: client.patch(f"/tasks/{task_id}/toggle-completion"),
+        lambda: client.put(f"/tasks/{task_id}", json={"title": "x"}),
+        lambda: client.delete(f"/tasks/{task_id}"),
+    ):
+        response, statements = _capture_statements(engine, call)
+        assert response.status_code == 404
+        assert len(statements) == 1
+
+
+def test_concurrent_toggles_do_not_lose_updates(client: TestClient, db_session: Session):
+    """
+    Prueba que los toggles simultáneos de la misma tarea se aplican todos (sin lost updates).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from sqlalchemy.orm import sessionmaker
+    from app.application.services.task_service import TaskService
+    from app.infrastructure.cache import NullCache
+    list_id = client.post("/task-lists/", json={"title": "Concurrente"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id}).json()["id"]
+    SessionLocal = sessionmaker(bind=db_session.get_bind(), expire_on_commit=False)
+
+    def toggle(_):
+        with SessionLocal() as db:
+            return TaskService(db, cache=NullCache()).toggle_task_completion(task_id).completed
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(toggle, range(21)))
+    # Cada toggle ve el estado del anterior: 11 veces completada y 10 pendiente
+    assert sorted(results) == [False] * 10 + [True] * 11
+    assert client.get(f"/tasks/{task_id}").json()["completed"] is True
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 1
+
+def test_delete_task_list_purges_tasks_in_chunks(client: TestClient, db_session: Session, monkeypatch: pytest.MonkeyPatch):
+    """
+    Prueba que DELETE /task-lists/{id} oculta la lista al instante (202) y que la purga elimina
+    sus tareas por bloques de PURGE_CHUNK_SIZE, con una transacción por bloque.
+    """
+    from app.domain import models
+    from app.infrastructure.config import get_settings
+    monkeypatch.setattr(get_settings(), "purge_chunk_size", 2)
+    engine = db_session.get_bind()
+    list_id = client.post("/task-lists/", json={"title": "Grande"}).json()["id"]
+    other_id = client.post("/task-lists/", json={"title": "Otra"}).json()["id"]
+    client.post("/tasks/bulk", json={"items": [{"title": f"T{i}", "task_list_id": list_id} for i in range(5)]})
+    kept_id = client.post("/tasks/", json={"title": "Se conserva", "task_list_id": other_id}).json()["id"]
+
+    response, statements = _capture_statements(engine, lambda: client.delete(f"/task-lists/{list_id}"))
+    assert response.status_code == 202
+    job = response.json()
+    assert response.headers["Location"].endswith(f"/task-lists/purge-jobs/{job['id']}")
+    # 3 bloques (2, 2 y 1 tareas); el último elimina también la lista
+    assert len([s for s in statements if s.startswith("DELETE FROM tasks")]) == 3
+    assert len([s for s in statements if s.startswith("DELETE FROM task_lists")]) == 1
+
+    status_response = client.get(f"/task-lists/purge-jobs/{job['id']}")
+    assert status_response.status_code == 200
+    assert status_response.json()["status"] == "done"
+    assert status_response.json()["tasks_deleted"] == 5
+    assert status_response.json()["finished_at"] is not None
+    db_session.expire_all()
+    assert db_session.query(models.Task).filter(models.Task.task_list_id == list_id).count() == 0
+    assert db_session.get(models.TaskList, list_id) is None
+    assert client.get(f"/tasks/{kept_id}").status_code == 200
+    assert client.delete(f"/task-lists/{list_id}").status_code == 404
+    assert client.get("/task-lists/purge-jobs/999").status_code == 404
+
+def test_deleted_task_list_is_hidden_before_purge(client: TestClient, db_session: Session):
+    """
+    Prueba que una lista marcada como borrada (purga pendiente) no se ve en las lecturas, que
+    repetir el DELETE responde 409 mientras la purga sigue pendiente y que reanuda una fallida.
+    """
+    from app.application.services.task_list_service import TaskListService
+    list_id = client.post("/task-lists/", json={"title": "Borrada"}).json()["id"]
+    client.post("/tasks/", json={"title": "Pendiente de purga", "task_list_id": list_id})
+    job = TaskListService(db_session).delete_task_list(list_id)
+    assert job.status == "pending"
+
+    assert client.get(f"/task-lists/{list_id}").status_code == 404
+    assert client.get(f"/task-lists/{list_id}/export").status_code == 404
+    assert client.get(f"/tasks/by-list/{list_id}").status_code == 404
+    assert list_id not in [task_list["id"] for task_list in client.get("/task-lists/").json()]
+    assert client.get("/tasks/search", params={"q": "purga"}).json() == []
+    assert client.put(f"/task-lists/{list_id}", json={"title": "x"}).status_code == 404
+    assert client.post("/tasks/", json={"title": "Nueva", "task_list_id": list_id}).status_code == 404
+    # Con la purga pendiente un nuevo DELETE no lanza otra: conflicto
+    response = client.delete(f"/task-lists/{list_id}")
+    assert response.status_code == 409 and "eliminando" in response.json()["detail"]
+
+    TaskListService(db_session).fail_purge_job(job.id, "conexión perdida")
+    assert client.get(f"/task-lists/purge-jobs/{job.id}").json()["status"] == "failed"
+    response = client.delete(f"/task-lists/{list_id}")
+    assert response.status_code == 202 and response.json()["id"] == job.id
+    assert client.get(f"/task-lists/purge-jobs/{job.id}").json()["status"] == "done"
+
+def test_unfinished_purges_resume_on_startup(client: TestClient, db_session: Session):
+    from app.main import app
+    from app.application.services.task_list_service import TaskListService
+    list_id = client.post("/task-lists/", json={"title": "Interrumpida"}).json()["id"]
+    client.post("/tasks/bulk", json={"items": [{"title": f"T{i}", "task_list_id": list_id} for i in range(5)]})
+    # Borrado sin ejecutar la purga, como si el proceso se hubiera detenido antes
+    job = TaskListService(db_session).delete_task_list(list_id)
+
+    with TestClient(app) as restarted:
+        deadline = time.monotonic() + 5
+        while restarted.get(f"/task-lists/purge-jobs/{job.id}").json()["status"] != "done" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        response = restarted.get(f"/task-lists/purge-jobs/{job.id}")
+    assert response.json()["status"] == "done" and response.json()["tasks_deleted"] == 5
+
+def test_tasks_of_deleted_task_list_are_not_readable_or_writable(client: TestClient, db_session: Session):
+    from app.domain import models
+    from app.application.services.task_list_service import TaskListService
+    list_id = client.post("/task-lists/", json={"title": "Borrada"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Pendiente de purga", "task_list_id": list_id}).json()["id"]
+    assert client.get(f"/tasks/{task_id}").status_code == 200 # queda en caché
+    TaskListService(db_session).delete_task_list(list_id)
+
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+    assert client.get(f"/tasks/{task_id}", params={"fields": "title"}).status_code == 404
+    assert client.put(f"/tasks/{task_id}", json={"title": "x"}).status_code == 404
+    assert client.put(f"/tasks/{task_id}", json={"completed": True}).status_code == 404
+    assert client.patch(f"/tasks/{task_id}/toggle-completion").status_code == 404
+    assert client.delete(f"/tasks/{task_id}").status_code == 404
+    assert client.patch("/tasks/bulk", json={"ids": [task_id], "changes": {"title": "x"}}).json()["affected"] == 0
+    assert client.patch("/tasks/bulk/toggle-completion", json={"task_list_id": list_id}).json()["affected"] == 0
+    assert client.request("DELETE", "/tasks/bulk", json={"ids": [task_id]}).json()["affected"] == 0
+    db_session.expire_all()
+    task = db_session.get(models.Task, task_id)
+    assert (task.title, task.completed) == ("Pendiente de purga", False)
+
+def test_list_validation_uses_one_small_query(client: TestClient, db_session: Session):
+    """
+    Prueba que validar la lista en POST /tasks/ y GET /tasks/by-list/{id} no carga sus tareas:
+    una consulta por clave primaria, o ninguna si la página ya trae tareas.
+    """
+    engine = db_session.get_bind()
+    list_id = client.post("/task-lists/", json={"title": "Validación"}).json()["id"]
+    client.post("/tasks/bulk", json={"items": [{"title": f"Tarea {i}", "task_list_id": list_id} for i in range(50)]})
+    list_queries = lambda statements: [s for s in statements if re.search(r"\bFROM task_lists\b", s)]
+    task_reads = lambda statements: [s for s in statements if s.lstrip().startswith("SELECT") and re.search(r"\bFROM tasks\b", s)]
+
+    response, statements = _capture_statements(engine, lambda: client.post("/tasks/", json={"title": "Nueva", "task_list_id": list_id}))
+    assert response.status_code == 201
+    assert len(list_queries(statements)) == 1
+    assert "EXISTS" in list_queries(statements)[0]
+    assert not [s for s in task_reads(statements) if "task_list_id = " in s]
+
+    response, statements = _capture_statements(engine, lambda: client.get(f"/tasks/by-list/{list_id}", params={"limit": 10}))
+    assert len(response.json()) == 10
+    # La comprobación de la lista (no borrada) va dentro de la consulta de la página, por clave primaria
+    assert len(statements) == 1 and "EXISTS" in statements[0]
+
+    # Página vacía: una consulta mínima distingue la lista vacía (200) de la inexistente (404)
+    response, statements = _capture_statements(engine, lambda: client.get(f"/tasks/by-list/{list_id}", params={"priority": 2}))
+    assert response.json() == []
+    assert len(statements) == 2 and not [s for s in task_reads(statements[1:]) if "task_list_id = " in s]
+    response, statements = _capture_statements(engine, lambda: client.get("/tasks/by-list/9999"))
+    assert response.status_code == 404
+    assert len(statements) == 2
+    assert client.post("/tasks/", json={"title": "Huérfana", "task_list_id": 9999}).status_code == 404
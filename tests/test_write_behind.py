@@ -0,0 +1,136 @@
+# tests/test_write_behind.py
+# Buffer write-behind con un intervalo largo: las pruebas deciden cuándo se vacía
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.main import app
+from app.domain import models
+from app.application.services.task_service import TaskService, task_write_buffer_writer
+from app.application.services.task_write_buffer import TaskWriteBuffer, set_task_write_buffer
+from tests.conftest import TestingSessionLocal, engine_test
+
+@pytest.fixture(name="write_buffer")
+def write_buffer_fixture(client: TestClient):
+    write_buffer = TaskWriteBuffer(task_write_buffer_writer(TestingSessionLocal), flush_interval_seconds=60, max_pending=3)
+    set_task_write_buffer(write_buffer)
+    yield write_buffer
+    write_buffer.close()
+    set_task_write_buffer(None)
+
+def task_updates(call) -> list:
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE tasks"):
+            statements.append(statement)
+    event.listen(engine_test, "before_cursor_execute", count_statement)
+    try:
+        call()
+    finally:
+        event.remove(engine_test, "before_cursor_execute", count_statement)
+    return statements
+
+def stored_task(db_session: Session, task_id: int) -> models.Task:
+    db_session.expire_all()
+    return db_session.get(models.Task, task_id)
+
+def test_changes_are_merged_and_flushed_in_one_batch(client: TestClient, db_session: Session, write_buffer: TaskWriteBuffer):
+    """
+    Prueba que los toggles y PUT de la misma tarea se fusionan en memoria, que las lecturas de la
+    tarea los ven antes de escribirse y que el vaciado los escribe con un UPDATE.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Write-behind"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id}).json()["id"]
+    etag = client.get(f"/tasks/{task_id}").headers["ETag"]
+
+    def writes():
+        for _ in range(3):
+            assert client.patch(f"/tasks/{task_id}/toggle-completion").status_code == 200
+        response = client.put(f"/tasks/{task_id}", json={"title": "Editada"})
+        assert response.json()["completed"] is True and response.json()["title"] == "Editada"
+
+    assert task_updates(writes) == []
+    assert stored_task(db_session, task_id).completed is False
+    response = client.get(f"/tasks/{task_id}")
+    assert (response.json()["completed"], response.json()["title"]) == (True, "Editada")
+    assert response.headers["ETag"] != etag
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+    assert write_buffer.stats()["merged"] == 3
+
+    assert len(task_updates(write_buffer.flush)) == 1
+    task = stored_task(db_session, task_id)
+    assert (task.completed, task.title) == (True, "Editada")
+    assert client.get(f"/tasks/{task_id}").headers["ETag"] == response.headers["ETag"]
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 1
+
+def test_full_buffer_wakes_the_flusher_and_writes_directly(client: TestClient, db_session: Session, write_buffer: TaskWriteBuffer):
+    """
+    Prueba que al llenarse el buffer lo vacía su hilo (no la petición) y que, mientras tanto, las
+    tareas nuevas se escriben directamente en la petición.
+    """
+    gate = threading.Event()
+    writer = write_buffer.writer
+    write_buffer.writer = lambda entries: gate.wait(5) and writer(entries)
+    list_id = client.post("/task-lists/", json={"title": "Contrapresión"}).json()["id"]
+    task_ids = [client.post("/tasks/", json={"title": f"T{index}", "task_list_id": list_id}).json()["id"] for index in range(7)]
+    # La tercera tarea llena el buffer (max_pending=3): el hilo toma el lote y espera a `gate`
+    for task_id in task_ids[:3]:
+        client.patch(f"/tasks/{task_id}/toggle-completion")
+    deadline = time.monotonic() + 5
+    while write_buffer.stats()["flushing"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for task_id in task_ids[3:6]:
+        client.patch(f"/tasks/{task_id}/toggle-completion")
+    assert (write_buffer.stats()["pending"], write_buffer.stats()["flushing"]) == (3, 3)
+    # Lleno otra vez con un vaciado en curso: la séptima tarea se escribe en la petición
+    assert client.patch(f"/tasks/{task_ids[6]}/toggle-completion").json()["completed"] is True
+    assert stored_task(db_session, task_ids[6]).completed is True
+    assert write_buffer.stats()["backpressure_writes"] == 1
+
+    gate.set()
+    while write_buffer.stats()["flushes"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert write_buffer.stats()["pending"] == 0
+    assert all(stored_task(db_session, task_id).completed for task_id in task_ids)
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 7
+
+def test_direct_writes_and_shutdown_flush_pending_changes(client: TestClient, db_session: Session, write_buffer: TaskWriteBuffer):
+    """
+    Prueba que las escrituras fuera del buffer (borrado, If-Match) escriben antes lo pendiente y
+    que al apagar la aplicación se escribe lo que quede.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Vaciado"}).json()["id"]
+    deleted_id = client.post("/tasks/", json={"title": "Se borra", "task_list_id": list_id}).json()["id"]
+    kept_id = client.post("/tasks/", json={"title": "Se conserva", "task_list_id": list_id}).json()["id"]
+    client.patch(f"/tasks/{deleted_id}/toggle-completion")
+    assert client.delete(f"/tasks/{deleted_id}").status_code == 204
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 0
+
+    etag = client.patch(f"/tasks/{kept_id}/toggle-completion").headers["ETag"]
+    response = client.put(f"/tasks/{kept_id}", json={"priority": 2}, headers={"If-Match": etag})
+    assert response.status_code == 200 and response.json()["completed"] is True
+
+    client.patch(f"/tasks/{kept_id}/toggle-completion")
+    with TestClient(app):
+        pass # el cierre (lifespan) vacía el buffer
+    assert stored_task(db_session, kept_id).completed is False
+    assert write_buffer.stats()["pending"] == 0
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 0
+
+def test_toggles_from_several_workers_are_not_lost(client: TestClient, db_session: Session, write_buffer: TaskWriteBuffer):
+    """
+    Prueba que dos workers, cada uno con su buffer, que aceptan un toggle de la misma tarea a
+    partir del mismo estado escriben dos inversiones (NOT completed) y no el mismo valor.
+    """
+    list_id = client.post("/task-lists/", json={"title": "Varios workers"}).json()["id"]
+    task_id = client.post("/tasks/", json={"title": "Tarea", "task_list_id": list_id}).json()["id"]
+    other_worker = TaskWriteBuffer(task_write_buffer_writer(TestingSessionLocal), flush_interval_seconds=60)
+    assert client.patch(f"/tasks/{task_id}/toggle-completion").json()["completed"] is True
+    with TestingSessionLocal() as db:
+        assert TaskService(db, write_buffer=other_worker).toggle_task_completion(task_id).completed is True
+    write_buffer.flush()
+    other_worker.close()
+    assert stored_task(db_session, task_id).completed is False
+    assert client.get(f"/task-lists/{list_id}").json()["completed_count"] == 0